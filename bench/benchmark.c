@@ -7,6 +7,7 @@
 #include <CSB/bm_params.h>
 #include <CSB/bm_error.h>
 #include <CSB/bm_stats.h>
+#include <CSB/bm_stats_json.h>
 #include <CSB/bm_helper.h>
 #include <CSB/bm_target.h>
 #include <unistd.h>
@@ -26,6 +27,8 @@
  */
 
 atomic_bool g_stop = false;
+/* operations are only recorded within the measurement window */
+atomic_bool g_measure = false;
 pthread_barrier_t g_start_barrier;
 pthread_barrier_t g_stop_barrier;
 bm_stat_t g_stats;
@@ -37,6 +40,7 @@ void bm_phase_warmup(void);
 void bm_phase_run(void);
 void bm_phase_conclude(void);
 void bm_phase_cooldown(void);
+void bm_wait_window(uint32_t duration);
 
 int
 main(int argc, char *argv[])
@@ -61,6 +65,12 @@ stop(void)
     return atomic_load_explicit(&g_stop, memory_order_relaxed);
 }
 
+bool
+measure(void)
+{
+    return atomic_load_explicit(&g_measure, memory_order_relaxed);
+}
+
 void *
 run(void *args)
 {
@@ -87,6 +97,8 @@ run(void *args)
         /* pick an operation to perform */
         op = g_ops[i % DISTRIBUTION_BOUND];
 
+        /* operations of the warm-up and cool-down are not recorded */
+        bool measured      = measure();
         op_start_time      = read_time_stamp_counter();
         bm_op_res_t result = bm_dispatch_operation(&ctx, op);
         op_end_time        = read_time_stamp_counter();
@@ -95,7 +107,9 @@ run(void *args)
 
         // skip this stat if the thread was preempted mid operation
         skip = false;
-        bm_stat_add_op(&g_stats, tid, op, result, op_time, skip);
+        if (measured) {
+            bm_stat_add_op(&g_stats, tid, op, result, op_time, skip);
+        }
 
         // TODO: add to the params if noise should be random
         bm_generate_noise(g_params.max_noise, false);
@@ -173,25 +187,49 @@ bm_phase_run(void)
     }
 
     usleep(1000);
-    duration_max_start_clk = read_time_stamp_counter();
-    record_time(&duration_max_start_ms);
+    if (g_params.warmup == 0) {
+        duration_max_start_clk = read_time_stamp_counter();
+        record_time(&duration_max_start_ms);
+        atomic_store_explicit(&g_measure, true, memory_order_relaxed);
+    }
 
     pthread_barrier_wait(&g_start_barrier); /* barrier start */
 
+    if (g_params.warmup > 0) {
+        sleep(g_params.warmup);
+        /* all threads are running, the window starts at once for all */
+        duration_max_start_clk = read_time_stamp_counter();
+        record_time(&duration_max_start_ms);
+        atomic_store_explicit(&g_measure, true, memory_order_relaxed);
+    }
+
     duration_min_start_clk = read_time_stamp_counter();
     record_time(&duration_min_start_ms);
 
-    sleep(g_params.duration);
+    bm_wait_window(g_params.duration);
+    if (g_params.cooldown > 0) {
+        /* end of the measurement window */
+        atomic_store_explicit(&g_measure, false, memory_order_relaxed);
+        duration_min_stop_clk = read_time_stamp_counter();
+        record_time(&duration_min_stop_ms);
+        duration_max_stop_clk = duration_min_stop_clk;
+        duration_max_stop_ms  = duration_min_stop_ms;
+        sleep(g_params.cooldown);
+    }
     /* signal stop */
     atomic_store_explicit(&g_stop, true, memory_order_relaxed);
 
-    duration_min_stop_clk = read_time_stamp_counter();
-    record_time(&duration_min_stop_ms);
+    if (g_params.cooldown == 0) {
+        duration_min_stop_clk = read_time_stamp_counter();
+        record_time(&duration_min_stop_ms);
+    }
 
     pthread_barrier_wait(&g_stop_barrier); /* barrier stop */
 
-    duration_max_stop_clk = read_time_stamp_counter();
-    record_time(&duration_max_stop_ms);
+    if (g_params.cooldown == 0) {
+        duration_max_stop_clk = read_time_stamp_counter();
+        record_time(&duration_max_stop_ms);
+    }
 
     for (size_t i = 0; i < g_params.num_threads; i++) {
         pthread_join(threads[i], NULL);
@@ -213,10 +251,57 @@ bm_phase_run(void)
                            duration_min_ms, duration_max_ms);
 }
 
+/**
+ * Waits for the end of the measurement window. With an interval, the stats
+ * recorded during every interval are printed on the way.
+ */
+void
+bm_wait_window(uint32_t duration)
+{
+    bm_stat_snapshot_t prev = {0};
+    bm_stat_snapshot_t cur  = {0};
+    cpu_time_t start        = {0};
+    cpu_time_t now          = {0};
+    uint64_t window_us      = (uint64_t)duration * VTIME_MICROSEC_IN_SEC;
+    uint64_t interval_us    = (uint64_t)g_params.interval * 1000U;
+    uint64_t next_us        = 0;
+    uint64_t last_us        = 0;
+    uint64_t now_us         = 0;
+
+    if (interval_us == 0) {
+        sleep(duration);
+        return;
+    }
+
+    record_time(&start);
+    bm_stat_snapshot(&g_stats, &prev);
+    while (now_us < window_us) {
+        next_us = VMIN(next_us + interval_us, window_us);
+        if (next_us > now_us)
+            usleep(next_us - now_us);
+        record_time(&now);
+        now_us = calc_spent_time(start, now);
+        bm_stat_snapshot(&g_stats, &cur);
+        if (g_params.format == PARAM_FORMAT_JSONL)
+            bm_print_interval_json(&prev, &cur, now_us / 1000U,
+                                   now_us - last_us);
+        else
+            bm_print_interval(&prev, &cur, now_us / 1000U, now_us - last_us,
+                              BM_PRINT_DELIMITER);
+        prev    = cur;
+        last_us = now_us;
+    }
+}
+
 void
 bm_phase_conclude(void)
 {
     bm_target_destroy(g_params.num_threads);
+    if (g_params.format == PARAM_FORMAT_JSONL) {
+        bm_print_params_json(&g_params);
+        bm_print_stats_json(&g_stats, bm_target_op_count());
+        return;
+    }
     bm_print_params(&g_params, BM_PRINT_DELIMITER);
     bm_print_stats(&g_stats, BM_PRINT_DELIMITER, bm_target_op_count());
     printf("\n");
@@ -21,14 +21,30 @@
 #define PARAM_DURATION  "-d=([0-9]+)"
 #define PARAM_INIT_SIZE "-s=([0-9]+)"
 #define PARAM_OP_DIST   "-op([0-9]+)=([0-9]+)"
+#define PARAM_WARMUP    "-w=([0-9]+)"
+#define PARAM_COOLDOWN  "-c=([0-9]+)"
+#define PARAM_INTERVAL  "-i=([0-9]+)"
+#define PARAM_FORMAT    "-f=([0-9]+)"
 
-#define PARAM_FIXED_LEN 5
+#define PARAM_FIXED_LEN    5
+#define PARAM_OPTIONAL_LEN 4
+
+/* formats of the output, see bm_stats_json.h for the structured one */
+#define PARAM_FORMAT_TEXT  0
+#define PARAM_FORMAT_JSONL 1
 
 typedef struct bm_params_s {
     uint32_t num_threads;
     uint32_t init_sz;
     uint32_t max_noise;
     uint32_t duration;
+    /* seconds before and after the measurement window, optional */
+    uint32_t warmup;
+    uint32_t cooldown;
+    /* milliseconds between two snapshots of the stats, 0 disables them */
+    uint32_t interval;
+    /* PARAM_FORMAT_TEXT or PARAM_FORMAT_JSONL, optional */
+    uint32_t format;
     uint32_t *op_dist;
     uint32_t op_dist_len;
 } bm_params_t;
@@ -108,6 +124,18 @@ _bm_params_match_field(bm_params_t *out_params, char *param)
     if (_bm_param_check_match(param, PARAM_INIT_SIZE, &out_params->init_sz))
         return true;
 
+    if (_bm_param_check_match(param, PARAM_WARMUP, &out_params->warmup))
+        return true;
+
+    if (_bm_param_check_match(param, PARAM_COOLDOWN, &out_params->cooldown))
+        return true;
+
+    if (_bm_param_check_match(param, PARAM_INTERVAL, &out_params->interval))
+        return true;
+
+    if (_bm_param_check_match(param, PARAM_FORMAT, &out_params->format))
+        return true;
+
     if (_bm_param_check_match_op(param, PARAM_OP_DIST, out_params->op_dist,
                                  out_params->op_dist_len))
         return true;
@@ -122,6 +150,9 @@ bm_print_params(bm_params_t *out_params, char delimiter)
     printf("init_sz=%u%c", out_params->init_sz, delimiter);
     printf("max_noise=%u%c", out_params->max_noise, delimiter);
     printf("duration=%u%c", out_params->duration, delimiter);
+    printf("warmup=%u%c", out_params->warmup, delimiter);
+    printf("cooldown=%u%c", out_params->cooldown, delimiter);
+    printf("interval=%u%c", out_params->interval, delimiter);
 
     for (size_t i = 0; i < out_params->op_dist_len; i++) {
         printf("op%zu_dist=%u%c", i, out_params->op_dist[i], delimiter);
@@ -135,6 +166,10 @@ _bm_params_init(bm_params_t *out_params)
     out_params->init_sz     = PARAM_VAL_NONE;
     out_params->max_noise   = PARAM_VAL_NONE;
     out_params->duration    = PARAM_VAL_NONE;
+    out_params->warmup      = 0;
+    out_params->cooldown    = 0;
+    out_params->interval    = 0;
+    out_params->format      = PARAM_FORMAT_TEXT;
 
     for (size_t i = 0; i < out_params->op_dist_len; i++) {
         out_params->op_dist[i] = PARAM_VAL_NONE;
@@ -167,7 +202,8 @@ bm_params_extract(int argc, char *argv[], bm_params_t *out_params,
     assert(out_params);
 
     int expected_num_params = PARAM_FIXED_LEN + num_ops;
-    if (argc != expected_num_params) {
+    if (argc < expected_num_params ||
+        argc > expected_num_params + PARAM_OPTIONAL_LEN) {
         return BM_ERR_PARAMS_INCORRECT_COUNT;
     }
 
@@ -18,6 +18,9 @@
     (((x) % CACHELINE_SIZE) == 0 ?                                             \
          (x) :                                                                 \
          ((((x) / CACHELINE_SIZE) + 1) * CACHELINE_SIZE))
+/* stores a counter that has a single writer and concurrent readers */
+#define BM_STAT_STORE(_var_, _val_)                                            \
+    __atomic_store_n(&(_var_), (_val_), __ATOMIC_RELAXED)
 
 typedef struct bm_op_stat_s {
     uint64_t succ_count;
@@ -47,6 +50,13 @@ typedef struct bm_stat_s {
     uint64_t op_time_ranges[STAT_MAX_NUM_BUCKETS];
 } bm_stat_t;
 
+/* totals of all threads and operations at a point in time */
+typedef struct bm_stat_snapshot_s {
+    uint64_t count;
+    uint64_t sum;
+    uint64_t histogram_data[STAT_MAX_NUM_BUCKETS];
+} bm_stat_snapshot_t;
+
 #define BM_PRINT_OP_STAT(_op_name_, _idx_, _fmt_, _stat_, _deli_)              \
     printf(                                                                    \
         "%s_%s="_fmt_                                                          \
@@ -114,15 +124,19 @@ bm_stat_add_op(bm_stat_t *stats, size_t tid, size_t op, bm_op_res_t result,
     assert(op < stats->threads[tid].len);
 
     op_stat = &stats->threads[tid].ops[op];
+    /* The stats of a thread are only written by the thread itself, but they
+     * are read concurrently by `bm_stat_snapshot`. Relaxed atomic stores make
+     * that race free without the cost of a locked read-modify-write. */
     if (skipped) {
-        op_stat->skipped_count++;
+        BM_STAT_STORE(op_stat->skipped_count, op_stat->skipped_count + 1);
     } else {
-        op_stat->succ_count += result.succ_count;
-        op_stat->sum += duration;
-        op_stat->count += result.op_count;
+        BM_STAT_STORE(op_stat->succ_count,
+                      op_stat->succ_count + result.succ_count);
+        BM_STAT_STORE(op_stat->sum, op_stat->sum + duration);
+        BM_STAT_STORE(op_stat->count, op_stat->count + result.op_count);
 
-        op_stat->max = VMAX(op_stat->max, duration);
-        op_stat->min = VMIN(op_stat->min, duration);
+        BM_STAT_STORE(op_stat->max, VMAX(op_stat->max, duration));
+        BM_STAT_STORE(op_stat->min, VMIN(op_stat->min, duration));
 
         for (idx = 0; idx < STAT_MAX_NUM_BUCKETS; idx++) {
             if (duration <= stats->op_time_ranges[idx]) {
@@ -131,7 +145,8 @@ bm_stat_add_op(bm_stat_t *stats, size_t tid, size_t op, bm_op_res_t result,
         }
         if (idx == STAT_MAX_NUM_BUCKETS)
             idx--;
-        op_stat->histogram_data[idx]++;
+        BM_STAT_STORE(op_stat->histogram_data[idx],
+                      op_stat->histogram_data[idx] + 1);
     }
 }
 
@@ -146,6 +161,70 @@ bm_stat_add_spent_time(bm_stat_t *stats, uint64_t min_duration_clk,
     stats->max_duration_ms  = max_duration_ms;
 }
 
+/**
+ * Sums the stats of all threads while they are running. The counters are
+ * read with relaxed atomic loads, a snapshot may miss the operations that are
+ * being recorded.
+ */
+static inline void
+bm_stat_snapshot(bm_stat_t *stats, bm_stat_snapshot_t *snapshot)
+{
+    bm_op_stat_t *op_stat = NULL;
+    assert(stats);
+    memset(snapshot, 0, sizeof(*snapshot));
+
+    for (size_t i = 0; i < stats->len; i++) {
+        for (size_t op = 0; op < stats->threads[i].len; op++) {
+            op_stat = &stats->threads[i].ops[op];
+            snapshot->count +=
+                __atomic_load_n(&op_stat->count, __ATOMIC_RELAXED);
+            snapshot->sum += __atomic_load_n(&op_stat->sum, __ATOMIC_RELAXED);
+            for (size_t j = 0; j < STAT_MAX_NUM_BUCKETS; j++) {
+                snapshot->histogram_data[j] += __atomic_load_n(
+                    &op_stat->histogram_data[j], __ATOMIC_RELAXED);
+            }
+        }
+    }
+}
+
+/**
+ * Prints the operations recorded between two snapshots as a line starting
+ * with `ts`, followed by the stats of the interval.
+ *
+ * @param time_ms time since the beginning of the measurement window.
+ * @param elapsed_us time elapsed between the two snapshots in micro seconds.
+ */
+static inline void
+bm_print_interval(const bm_stat_snapshot_t *prev,
+                  const bm_stat_snapshot_t *cur, uint64_t time_ms,
+                  uint64_t elapsed_us, char delimiter)
+{
+    uint64_t count = cur->count - prev->count;
+    double avg     = 0;
+    /* same unit as the throughput of the whole run */
+    double throughput = 0;
+
+    if (count != 0)
+        avg = ((double)(cur->sum - prev->sum)) / ((double)count);
+    if (elapsed_us != 0)
+        throughput = (double)(count * 1000.0f) / (double)elapsed_us;
+
+    printf("ts%c", delimiter);
+    BM_PRINT_UNIV_STAT("%lu", time_ms, delimiter);
+    BM_PRINT_UNIV_STAT("%lu", elapsed_us, delimiter);
+    BM_PRINT_UNIV_STAT("%lu", count, delimiter);
+    BM_PRINT_UNIV_STAT("%.2f", avg, delimiter);
+    BM_PRINT_UNIV_STAT("%.8f", throughput, delimiter);
+
+    printf("histogram=");
+    for (size_t j = 0; j < STAT_MAX_NUM_BUCKETS; j++) {
+        printf("%lu%s", cur->histogram_data[j] - prev->histogram_data[j],
+               j + 1 < STAT_MAX_NUM_BUCKETS ? "," : "");
+    }
+    printf("%c\n", delimiter);
+    fflush(stdout);
+}
+
 static inline void
 bm_print_stats(bm_stat_t *stats, char delimiter, const size_t op_len)
 {
@@ -0,0 +1,206 @@
+/*
+ * Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+ * SPDX-License-Identifier: MIT
+ */
+#ifndef BM_STATS_JSON_H
+#define BM_STATS_JSON_H
+
+/**
+ * Structured output of the stats, one JSON object per line. Every object
+ * has a `type`:
+ *  - params: the parameters of the run.
+ *  - buckets: the upper bound of every bucket of the histograms, in ticks.
+ *  - calibration: the durations of the run and the ticks in a millisecond.
+ *  - op: the stats of an operation merged over all threads.
+ *  - thread_op: the stats of an operation of one thread.
+ *  - summary: the stats of all operations, as printed in the text output.
+ *  - interval: the stats of an interval of the measurement window.
+ */
+#include "bm_params.h"
+#include "bm_stats.h"
+#include "time.h"
+
+#include <stdio.h>
+
+#define STAT_OP_NAME_JSON_MAX_LEN 256
+
+/* JSON has no infinity, ratios over zero are printed as 0 */
+static inline double
+_bm_json_ratio(double num, double den)
+{
+    return den == 0 ? 0.0 : num / den;
+}
+
+static inline void
+_bm_json_print_str(const char *key, const char *value)
+{
+    printf("\"%s\":\"", key);
+    for (const char *c = value; *c != '\0'; c++) {
+        if (*c == '"' || *c == '\\')
+            printf("\\%c", *c);
+        else if ((unsigned char)*c < 0x20)
+            printf("\\u%04x", (unsigned char)*c);
+        else
+            putchar(*c);
+    }
+    printf("\"");
+}
+
+static inline void
+_bm_json_print_array(const char *key, const uint64_t *values, size_t len)
+{
+    printf("\"%s\":[", key);
+    for (size_t i = 0; i < len; i++) {
+        printf("%lu%s", values[i], i + 1 < len ? "," : "");
+    }
+    printf("]");
+}
+
+static inline void
+_bm_json_print_op(const bm_op_stat_t *op_stat)
+{
+    printf(",\"max\":%lu,\"min\":%lu,\"sum\":%lu,\"count\":%lu", op_stat->max,
+           op_stat->min == UINT64_MAX ? 0 : op_stat->min, op_stat->sum,
+           op_stat->count);
+    printf(",\"succ_count\":%lu,\"skipped_count\":%lu,", op_stat->succ_count,
+           op_stat->skipped_count);
+    _bm_json_print_array("histogram", op_stat->histogram_data,
+                         STAT_MAX_NUM_BUCKETS);
+}
+
+static inline void
+_bm_stat_merge_op(bm_stat_t *stats, size_t op, bm_op_stat_t *merged)
+{
+    memset(merged, 0, sizeof(*merged));
+    merged->min = UINT64_MAX;
+    for (size_t i = 0; i < stats->len; i++) {
+        bm_op_stat_t *op_stat = &stats->threads[i].ops[op];
+        merged->max           = VMAX(merged->max, op_stat->max);
+        merged->min           = VMIN(merged->min, op_stat->min);
+        merged->sum += op_stat->sum;
+        merged->count += op_stat->count;
+        merged->succ_count += op_stat->succ_count;
+        merged->skipped_count += op_stat->skipped_count;
+        for (size_t j = 0; j < STAT_MAX_NUM_BUCKETS; j++) {
+            merged->histogram_data[j] += op_stat->histogram_data[j];
+        }
+    }
+}
+
+static inline void
+bm_print_params_json(bm_params_t *params)
+{
+    printf("{\"type\":\"params\",\"num_threads\":%u,\"init_sz\":%u",
+           params->num_threads, params->init_sz);
+    printf(",\"max_noise\":%u,\"duration\":%u,\"warmup\":%u,\"cooldown\":%u",
+           params->max_noise, params->duration, params->warmup,
+           params->cooldown);
+    printf(",\"interval\":%u,\"op_dist\":[", params->interval);
+    for (size_t i = 0; i < params->op_dist_len; i++) {
+        printf("%u%s", params->op_dist[i],
+               i + 1 < params->op_dist_len ? "," : "");
+    }
+    printf("]}\n");
+}
+
+static inline void
+bm_print_interval_json(const bm_stat_snapshot_t *prev,
+                       const bm_stat_snapshot_t *cur, uint64_t time_ms,
+                       uint64_t elapsed_us)
+{
+    uint64_t histogram_data[STAT_MAX_NUM_BUCKETS];
+    uint64_t count    = cur->count - prev->count;
+    double avg        = _bm_json_ratio(cur->sum - prev->sum, count);
+    double throughput = _bm_json_ratio(count * 1000.0f, elapsed_us);
+
+    for (size_t j = 0; j < STAT_MAX_NUM_BUCKETS; j++) {
+        histogram_data[j] = cur->histogram_data[j] - prev->histogram_data[j];
+    }
+
+    printf("{\"type\":\"interval\",\"time_ms\":%lu,\"elapsed_us\":%lu", time_ms,
+           elapsed_us);
+    printf(",\"count\":%lu,\"avg\":%.2f,\"throughput\":%.8f,", count, avg,
+           throughput);
+    _bm_json_print_array("histogram", histogram_data, STAT_MAX_NUM_BUCKETS);
+    printf("}\n");
+    fflush(stdout);
+}
+
+static inline void
+bm_print_stats_json(bm_stat_t *stats, const size_t op_len)
+{
+    char op_name[STAT_OP_NAME_JSON_MAX_LEN] = {0};
+    char info[1000]                         = {0};
+    bm_op_stat_t merged                     = {0};
+    bm_op_stat_t univ                       = {0};
+    uint64_t ticks_to_ms                    = calc_ticks_in_ms();
+    uint64_t sys_time                       = 0;
+    uint64_t usr_time                       = 0;
+    uint64_t max_rss_kb                     = 0;
+
+    assert(stats);
+    univ.min = UINT64_MAX;
+
+    printf("{\"type\":\"buckets\",");
+    _bm_json_print_array("op_time_ranges", stats->op_time_ranges,
+                         STAT_MAX_NUM_BUCKETS);
+    printf("}\n");
+
+    printf("{\"type\":\"calibration\",\"ticks_to_ms\":%lu", ticks_to_ms);
+    printf(",\"duration_max_ms\":%lu,\"duration_max_clk\":%lu",
+           stats->max_duration_ms, stats->max_duration_clk);
+    printf(",\"duration_min_ms\":%lu,\"duration_min_clk\":%lu}\n",
+           stats->min_duration_ms, stats->min_duration_clk);
+
+    for (size_t op = 0; op < op_len; op++) {
+        bm_target_get_op_name(op_name, sizeof(op_name), op);
+
+        for (size_t i = 0; i < stats->len; i++) {
+            assert(stats->threads[i].len == op_len);
+            printf("{\"type\":\"thread_op\",\"thread\":%zu,\"op\":%zu,", i, op);
+            _bm_json_print_str("name", op_name);
+            _bm_json_print_op(&stats->threads[i].ops[op]);
+            printf("}\n");
+        }
+
+        _bm_stat_merge_op(stats, op, &merged);
+        printf("{\"type\":\"op\",\"op\":%zu,", op);
+        _bm_json_print_str("name", op_name);
+        _bm_json_print_op(&merged);
+        printf("}\n");
+
+        univ.max = VMAX(univ.max, merged.max);
+        univ.min = VMIN(univ.min, merged.min);
+        univ.sum += merged.sum;
+        univ.count += merged.count;
+        univ.succ_count += merged.succ_count;
+        univ.skipped_count += merged.skipped_count;
+    }
+
+    printf("{\"type\":\"summary\",");
+    _bm_json_print_str("algo_name", bm_target_get_name());
+    bm_target_extra_info(info, sizeof(info));
+    printf(",");
+    _bm_json_print_str("extra_info", info);
+    printf(",\"univ_max\":%lu,\"univ_min\":%lu", univ.max,
+           univ.min == UINT64_MAX ? 0 : univ.min);
+    printf(",\"univ_sum\":%lu,\"univ_count\":%lu", univ.sum, univ.count);
+    printf(",\"univ_succ_count\":%lu,\"univ_skipped_count\":%lu",
+           univ.succ_count, univ.skipped_count);
+    printf(",\"univ_avg\":%.2f,\"univ_succ_percent\":%.2f",
+           _bm_json_ratio(univ.sum, univ.count),
+           _bm_json_ratio(univ.succ_count * 100U, univ.count));
+    printf(",\"throughput_max\":%.8f,\"throughput_min\":%.8f",
+           _bm_json_ratio(univ.count * 1000.0f, stats->min_duration_ms),
+           _bm_json_ratio(univ.count * 1000.0f, stats->max_duration_ms));
+    printf(",\"throughput_max_ts\":%.8f,\"throughput_min_ts\":%.8f",
+           _bm_json_ratio(univ.count * 1000.0f * ticks_to_ms,
+                          stats->min_duration_clk),
+           _bm_json_ratio(univ.count * 1000.0f * ticks_to_ms,
+                          stats->max_duration_clk));
+    get_usr_sys_time(&sys_time, &usr_time, &max_rss_kb);
+    printf(",\"sys_time\":%lu,\"usr_time\":%lu,\"max_rss_kb\":%lu}\n",
+           sys_time, usr_time, max_rss_kb);
+}
+
+#endif
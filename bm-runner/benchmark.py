@@ -10,16 +10,30 @@ from benchkit.benchmark import (
     CommandAttachment,
     RecordResult,
 )
+import json
+import os
 import sys
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from benchkit.dependencies.packages import PackageDependency
 from typing import Iterable, Optional, Dict, Any, List
 import bm_utils
-from bm_container import Containers
+from bm_container import Containers, g_container_pool
 from bm_process import Processes
 from config.benchmark import ExecutionType
 import bm_config
 from bm_executer import Executer
+from bm_placement import CpuTopology, PlacementPlanner, UnitPlacement
+from bm_adaptive import run_adaptive
+from bm_parser import OutputParser, decode_result_line, tag_result_line
+from bm_scheduler import CampaignScheduler, get_point_key
+from bm_cache import ResultCache
+from config.application import Application
+from config.container import CpuOrder
 from utils.logger import bm_log, LogType
+from utils.docker_client import set_docker_pool_size
+from utils.trace import Tracer, g_tracer
 
 
 class ScalabilityBenchmark(Benchmark):
@@ -30,6 +44,8 @@ class ScalabilityBenchmark(Benchmark):
         shared_libs: Iterable[SharedLib],
         post_run_hooks: Iterable[PostRunHook],
         csb_dir: PathType,
+        scheduler: Optional[CampaignScheduler] = None,
+        cache: Optional[ResultCache] = None,
     ):
         super().__init__(
             command_wrappers=command_wrappers,
@@ -40,6 +56,14 @@ class ScalabilityBenchmark(Benchmark):
         )
         self.csb_dir = csb_dir
         self.multi_app = False
+        self.scheduler = scheduler
+        self.cache = cache
+        # point key -> points run at the same time, when sharding
+        self.shard_plan: Optional[dict[str, list[dict[str, Any]]]] = None
+        # outputs and cost per run of points that ran along with another one
+        self.shard_outputs: dict[str, deque[tuple[str, float]]] = defaultdict(deque)
+        self.shard_group = 0
+        self.output_parser = OutputParser()
 
     def dependencies(self) -> list[PackageDependency]:
         return super().dependencies() + [
@@ -48,13 +72,23 @@ class ScalabilityBenchmark(Benchmark):
         ]
 
     def prebuild_bench(self, **_kwargs):
-        bm_utils.build_bench(self.csb_dir)
-        bm_utils.save_sys_config(self._base_data_dir)
-        bm_utils.save_docker_daemon_config(self._base_data_dir)
+        with g_tracer.span("build bench"):
+            bm_utils.build_bench(self.csb_dir)
+        with g_tracer.span("save sys config"):
+            bm_utils.save_sys_config(self._base_data_dir)
+        with g_tracer.span("save docker daemon config"):
+            bm_utils.save_docker_daemon_config(self._base_data_dir)
         # copy the configuration file and map it to the same name
         # as the csv.
         assert bm_config.g_config is not None
         bm_config.g_config.copy(f"{self._base_data_dir}.json")
+        # the shared docker client is sized once for all points running at the
+        # same time, it is never replaced while containers use it
+        set_docker_pool_size(
+            bm_config.g_config.get_container_config().launch_concurrency
+            * bm_config.g_config.get_benchmark_cfg().shards
+        )
+        g_tracer.save(os.path.join(self._base_data_dir, "prebuild.trace.json"))
 
     def build_bench(self, **_kwargs):
         pass
@@ -75,9 +109,53 @@ class ScalabilityBenchmark(Benchmark):
         record_data_dir: Optional[str] = None,
         **kwargs,
     ):
+        assert bm_config.g_config is not None
+        start = time.monotonic()
+        point = {
+            "nb_threads": nb_threads,
+            "noise": noise,
+            "initial_size": initial_size,
+            "container_cnt": container_cnt,
+            "execution_type": execution_type,
+        }
+        fingerprint = None
+        if self.cache is not None:
+            fingerprint = self.cache.get_fingerprint(point, benchmark_duration_seconds)
+            output = self.cache.load(fingerprint)
+            if output is not None:
+                bm_log(f"Reusing the results of {point} from a previous campaign", LogType.INFO)
+                return output
+        self.__check_apps(container_cnt)
+
+        pending = self.shard_outputs[get_point_key(point)]
+        if pending:
+            # the point already ran along with another one
+            output, seconds = pending.popleft()
+        else:
+            shard = self.__get_shard(point, benchmark_duration_seconds)
+            # pooled containers of shards that do not run anymore hold cpus and ports
+            g_container_pool.release_shards(list(range(len(shard))) if len(shard) > 1 else [None])
+            if bm_config.g_config.get_benchmark_cfg().shards > 1:
+                output, seconds = self.__run_shard(
+                    shard, benchmark_duration_seconds, cpu_order, record_data_dir
+                )
+            else:
+                output = self.__run_point(
+                    point, benchmark_duration_seconds, cpu_order, record_data_dir
+                )
+                seconds = time.monotonic() - start
+        if record_data_dir is not None:
+            # one trace per run, next to the other records of the run
+            g_tracer.save(os.path.join(record_data_dir, "trace.json"))
+        if self.cache is not None and fingerprint is not None:
+            self.cache.store(fingerprint, output)
+        if self.scheduler is not None:
+            self.scheduler.on_run_done(point, seconds)
+        return output
+
+    def __check_apps(self, container_cnt: int):
         assert bm_config.g_config is not None
         applications = bm_config.g_config.get_apps()
-        container_cfg = bm_config.g_config.get_container_config()
         self.multi_app = len(applications) > 1
         if self.multi_app:
             # Determine if the multi-apps are really different,
@@ -97,9 +175,190 @@ class ScalabilityBenchmark(Benchmark):
                 LogType.INFO,
             )
 
-        port_start = container_cfg.port
+    def __reserve_ports(self, container_cnt: int, port_from: Optional[int]) -> Optional[int]:
+        assert bm_config.g_config is not None
+        container_cfg = bm_config.g_config.get_container_config()
+        if port_from is None:
+            return None
+        # reads the socket tables once for the whole range of ports
+        port_start = bm_utils.find_free_port_range(
+            port_from, container_cnt, auto_shift=container_cfg.port_auto_shift
+        )
+        if port_start is None:
+            bm_log(
+                f"No free range of {container_cnt} ports from {port_from}, make sure they are free to use or set `port_auto_shift`.",
+                LogType.FATAL,
+            )
+            sys.exit(1)
+        if port_start != port_from:
+            bm_log(f"Ports are in use, using ports from {port_start} instead", LogType.WARNING)
+        return port_start
+
+    def __get_shard(self, point: dict[str, Any], duration: int) -> list[dict[str, Any]]:
+        """
+        Returns the points to run at the same time as `point`, starting with it.
+        Points that already have results waiting to be collected are left out.
+        """
+        assert bm_config.g_config is not None
+        max_shards = bm_config.g_config.get_benchmark_cfg().shards
+        if max_shards <= 1 or self.scheduler is None:
+            return [point]
+        if self.shard_plan is None:
+            core_count = bm_config.g_config.get_container_config().core_count
+            self.shard_plan = {}
+            for shard in self.scheduler.get_shards(
+                max_shards,
+                capacity=len(CpuTopology().cpus),
+                cpus_of=lambda p: p["container_cnt"] * core_count,
+            ):
+                for p in shard:
+                    self.shard_plan[get_point_key(p)] = shard
+        key = get_point_key(point)
+        others = []
+        for p in self.shard_plan.get(key, []):
+            other_key = get_point_key(p)
+            if other_key == key or self.shard_outputs[other_key]:
+                continue
+            if self.cache is not None:
+                fingerprint = self.cache.get_fingerprint(p, duration, advance=False)
+                if self.cache.load(fingerprint) is not None:
+                    continue
+            others.append(p)
+        return [point] + others
+
+    def __run_shard(
+        self,
+        points: list[dict[str, Any]],
+        duration: int,
+        cpu_order: Optional[str],
+        record_data_dir: Optional[str],
+    ) -> tuple[str, float]:
+        """
+        Runs the points at the same time, each on its own cpus and ports. Returns
+        the output of the first point and the time spent per point. The outputs
+        of the other points are kept until they are requested by the campaign,
+        their records are saved under `shard-<idx>` in the records of the first one.
+        """
+        assert bm_config.g_config is not None
+        container_cfg = bm_config.g_config.get_container_config()
+        topology = CpuTopology()
+        sizes = [p["container_cnt"] * container_cfg.core_count for p in points]
+        topologies = topology.partition(sizes) if len(points) > 1 else [topology]
+        port_starts = []
+        port_from = container_cfg.port
+        for p in points:
+            port_start = self.__reserve_ports(p["container_cnt"], port_from)
+            port_starts.append(port_start)
+            if port_start is not None:
+                port_from = port_start + p["container_cnt"]
+        records = [record_data_dir]
+        for idx in range(1, len(points)):
+            records.append(
+                os.path.join(record_data_dir, f"shard-{idx}") if record_data_dir else None
+            )
+        # the spans of the first point go to the trace of the run, saved by
+        # `single_run`, the other points have their own trace
+        tracers = [g_tracer] + [Tracer() for _ in points[1:]]
+        self.shard_group += 1
+        bm_log(f"Running {len(points)} points at the same time (group {self.shard_group})")
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=len(points)) as pool:
+            futures = [
+                pool.submit(
+                    self.__run_point,
+                    point=p,
+                    duration=duration,
+                    cpu_order=cpu_order,
+                    record_data_dir=records[idx],
+                    topology=topologies[idx],
+                    port_start=port_starts[idx],
+                    shard=idx if len(points) > 1 else None,
+                    tracer=tracers[idx],
+                )
+                for idx, p in enumerate(points)
+            ]
+            outputs = [future.result() for future in futures]
+        for tracer, shard_dir in zip(tracers[1:], records[1:]):
+            tracer.save(os.path.join(shard_dir, "trace.json") if shard_dir else None)
+        seconds = (time.monotonic() - start) / len(points)
+        for idx, output in enumerate(outputs):
+            tags = {"shard_group": self.shard_group, "shard_id": idx, "shard_size": len(points)}
+            outputs[idx] = "".join(
+                f"{tag_result_line(line, tags)}\n" for line in output.splitlines() if line.strip()
+            )
+        for p, output in zip(points[1:], outputs[1:]):
+            self.shard_outputs[get_point_key(p)].append((output, seconds))
+        return outputs[0], seconds
+
+    def __run_point(
+        self,
+        point: dict[str, Any],
+        duration: int,
+        cpu_order: Optional[str],
+        record_data_dir: Optional[str],
+        topology: Optional[CpuTopology] = None,
+        port_start: Optional[int] = None,
+        shard: Optional[int] = None,
+        tracer: Tracer = g_tracer,
+    ) -> str:
+        assert bm_config.g_config is not None
+        applications = bm_config.g_config.get_apps()
+        container_cfg = bm_config.g_config.get_container_config()
+        container_cnt = point["container_cnt"]
+        if topology is None:
+            port_start = self.__reserve_ports(container_cnt, container_cfg.port)
+        if record_data_dir is not None:
+            os.makedirs(record_data_dir, exist_ok=True)
         # assign an app per container, this is relevant when there are multiple apps
         apps = [applications[i % len(applications)] for i in range(container_cnt)]
+        planner = PlacementPlanner(
+            topology or CpuTopology(),
+            order=CpuOrder(cpu_order) if cpu_order is not None else container_cfg.cpu_order,
+        )
+        placements = planner.plan(
+            strategy=container_cfg.placement,
+            count=container_cnt,
+            core_count=container_cfg.core_count,
+            offsets=container_cfg.get_core_affinity_offset_list(),
+        )
+
+        def run(duration: int) -> str:
+            return self.__run_executer(
+                execution_type=point["execution_type"],
+                apps=apps,
+                placements=placements,
+                port_start=port_start,
+                record_data_dir=record_data_dir,
+                duration=duration,
+                nb_threads=point["nb_threads"],
+                noise=point["noise"],
+                initial_size=point["initial_size"],
+                shard=shard,
+                tracer=tracer,
+            )
+
+        adaptive_cfg = bm_config.g_config.get_benchmark_cfg().adaptive
+        if adaptive_cfg is not None:
+            return run_adaptive(adaptive_cfg, duration, run)
+        return run(duration)
+
+    def __run_executer(
+        self,
+        execution_type: ExecutionType,
+        apps: list[Application],
+        placements: list[UnitPlacement],
+        port_start: Optional[int],
+        record_data_dir: Optional[str],
+        duration: int,
+        nb_threads: int,
+        noise: int,
+        initial_size: int,
+        shard: Optional[int] = None,
+        tracer: Tracer = g_tracer,
+    ) -> str:
+        assert bm_config.g_config is not None
+        container_cfg = bm_config.g_config.get_container_config()
+        container_cnt = len(apps)
         executer: Executer
         match execution_type:
             case ExecutionType.CONTAINER:
@@ -109,29 +368,62 @@ class ScalabilityBenchmark(Benchmark):
                     home_dir=f"{self.csb_dir}",
                     apps=apps,
                     record_data_dir=record_data_dir,
+                    placements=placements,
+                    port_start=port_start,
+                    shard=shard,
+                    tracer=tracer,
                 )
             case ExecutionType.NATIVE:
                 # TODO: add app name in process/container name
                 executer = Processes(
                     home_dir=self.csb_dir,
                     count=container_cnt,
-                    cpus_per_proc=container_cfg.core_count,
                     record_data_dir=record_data_dir,
                     apps=apps,
-                    core_affinity_offset_list=container_cfg.get_core_affinity_offset_list(),
+                    placements=placements,
+                    shard=shard,
+                    tracer=tracer,
                 )
             case _:
                 bm_log(f"Unsupported execution type = {execution_type}", LogType.FATAL)
                 sys.exit(1)
         assert executer is not None
+        g_container_pool.release_unused(
+            shard,
+            (
+                [eu.name for eu in executer.exec_units]
+                if execution_type == ExecutionType.CONTAINER
+                else []
+            ),
+        )
         executer.exec_all(
             threads=nb_threads,
-            duration=benchmark_duration_seconds,
+            duration=duration,
             noise=noise,
             initial_size=initial_size,
             port_start=port_start,
         )
         output = executer.collect_results()
+        if record_data_dir is None:
+            return output
+        point = {
+            "execution_type": execution_type.value,
+            "container_cnt": container_cnt,
+            "nb_threads": nb_threads,
+            "noise": noise,
+            "initial_size": initial_size,
+            "benchmark_duration_seconds": duration,
+        }
+        timeseries = executer.get_timeseries()
+        if timeseries:
+            bm_utils.append_csv(
+                os.path.join(record_data_dir, bm_utils.TIMESERIES_FILE),
+                [{**point, **interval} for interval in timeseries],
+            )
+        records = executer.get_records()
+        if records:
+            with open(os.path.join(record_data_dir, bm_utils.RECORDS_FILE), "a") as f:
+                f.writelines(json.dumps({**point, **record}) + "\n" for record in records)
         return output
 
     def parse_output_to_results(  # ty: ignore[invalid-method-override]
@@ -142,18 +434,11 @@ class ScalabilityBenchmark(Benchmark):
         record_data_dir: PathType,
         **_kwargs,
     ) -> RecordResult | List[RecordResult]:
-        output = command_output.strip()
-        lines = output.splitlines()
-        dicts = []
-        # transform the output from each line into a dictionary
-        for output in lines:
-            if output.strip() == "":
-                continue
-            if output.endswith(";"):
-                output = output[:-1]
-            splitted_output = output.split(";")
-            result_dict = {v[0]: v[1] for v in [x.split("=", maxsplit=1) for x in splitted_output]}
-            dicts.append(result_dict)
+        lines = command_output.strip().splitlines()
+        # the structured results of a unit are a JSON line, the others `key=val;` text
+        results = [decode_result_line(line) for line in lines]
+        # transform the output from each line into a typed dictionary
+        dicts = self.output_parser.parse_records(results)
 
         if self.multi_app:
             return bm_utils.dict_intersect(
@@ -168,16 +453,7 @@ class ScalabilityBenchmark(Benchmark):
 
     @staticmethod
     def get_run_var_names():
-        return [
-            "benchmark_duration_seconds",
-            "nb_threads",
-            "noise",
-            "initial_size",
-            "cpu_order",
-            "master_thread_core",
-            "container_cnt",
-            "execution_type",
-        ]
+        return list(bm_utils.GRID_COLUMNS)
 
     @staticmethod
     def get_tilt_var_names():
@@ -0,0 +1,81 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import statistics
+import sys
+import time
+from typing import Callable, Optional
+from config.benchmark import AdaptiveConfig
+from bm_parser import read_result_line, tag_result_line
+from utils.logger import bm_log, LogType
+from utils.stats import relative_ci
+
+
+def get_metric_mean(output: str, metric: str) -> float:
+    """
+    Returns the mean of the metric over all execution units of a run.
+    """
+    values = []
+    for line in output.splitlines():
+        if line.strip() == "":
+            continue
+        value = read_result_line(line).get(metric)
+        if value is None:
+            continue
+        try:
+            values.append(float(value))
+        except (TypeError, ValueError):
+            pass
+    if not values:
+        bm_log(f"Metric {metric} is not found in the results of the benchmark", LogType.FATAL)
+        sys.exit(1)
+    return statistics.fmean(values)
+
+
+def run_adaptive(cfg: AdaptiveConfig, duration: int, run: Callable[[int], str]) -> str:
+    """
+    Calls `run` with the duration of the benchmark until the confidence interval
+    of the metric is narrow enough, or the repetitions or time budget run out.
+    Returns the output of all repetitions, where the results of each line start
+    with the repetition index, its duration, and the achieved interval of the point.
+    """
+    start = time.monotonic()
+    outputs: list[tuple[str, int]] = []
+    samples: list[float] = []
+    ci: Optional[float] = None
+    converged = False
+    while True:
+        output = run(duration)
+        outputs.append((output, duration))
+        samples.append(get_metric_mean(output, cfg.metric))
+        ci = relative_ci(samples, cfg.confidence)
+        repeats = len(samples)
+        bm_log(f"repetition {repeats}: {cfg.metric}={samples[-1]}, relative CI={ci}")
+        if repeats >= cfg.min_repeats and ci is not None and ci <= cfg.target_ci:
+            converged = True
+            break
+        if repeats >= cfg.max_repeats:
+            break
+        if cfg.time_budget is not None and time.monotonic() - start >= cfg.time_budget:
+            bm_log(f"time budget of {cfg.time_budget}s exhausted after {repeats} repetitions")
+            break
+        if cfg.max_duration is not None and repeats >= cfg.min_repeats:
+            duration = min(duration * 2, max(cfg.max_duration, duration))
+
+    log_type = LogType.INFO if converged else LogType.WARNING
+    bm_log(
+        f"{cfg.metric} {'converged' if converged else 'did not converge'} after {len(samples)} repetitions, relative CI={ci}",
+        log_type,
+    )
+    point = {
+        "adaptive_repeats": len(samples),
+        "adaptive_ci": ci,
+        "adaptive_converged": int(converged),
+    }
+    lines = []
+    for idx, (output, run_duration) in enumerate(outputs):
+        tags = {"repeat_idx": idx, "run_duration_s": run_duration, **point}
+        lines.extend(
+            tag_result_line(line, tags) for line in output.splitlines() if line.strip() != ""
+        )
+    return "\n".join(lines) + "\n"
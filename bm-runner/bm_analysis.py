@@ -0,0 +1,109 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import numpy as np
+from pandas import DataFrame
+from bm_utils import GRID_COLUMNS
+from utils.stats import bootstrap_ci, mad_scores
+
+# columns that are numbers but not metrics of a run
+NON_METRIC_COLUMNS = ["rep", "shard_group", "shard_id", "shard_size"]
+# modified z-score above which a repeat is flagged as an outlier
+OUTLIER_THRESHOLD = 3.5
+# metrics bootstrapped together, bounds the memory of the resamples
+METRICS_PER_CHUNK = 32
+
+
+def get_point_columns(df: DataFrame) -> list[str]:
+    """
+    Returns the columns identifying the repeats of an execution unit at a
+    grid point.
+    """
+    return [c for c in GRID_COLUMNS + ["execution_unit"] if c in df.columns]
+
+
+def get_metric_columns(df: DataFrame, by: list[str]) -> list[str]:
+    return [
+        c for c in df.select_dtypes("number").columns if c not in by and c not in NON_METRIC_COLUMNS
+    ]
+
+
+def flag_outliers(
+    df: DataFrame, by: list[str], metrics: list[str], threshold: float = OUTLIER_THRESHOLD
+) -> DataFrame:
+    """
+    Returns a `<metric>_outlier` column per metric, set for the rows whose
+    modified z-score within their group is above `threshold`.
+    """
+    keys = [df[k] for k in by]
+    values = df[metrics].astype(float)
+    deviations = (values - values.groupby(keys, dropna=False).transform("median")).abs()
+    mads = deviations.groupby(keys, dropna=False).transform("median")
+    scores = mad_scores(deviations.to_numpy(), mads.to_numpy())
+    return DataFrame(scores > threshold, columns=[f"{m}_outlier" for m in metrics], index=df.index)
+
+
+def bootstrap_groups(
+    df: DataFrame, by: list[str], metrics: list[str], confidence: float, resamples: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the bootstrap confidence interval of the mean of every metric of
+    every group, in the order of `groupby`. The groups of the same size are
+    resampled together.
+    """
+    codes = df.groupby(by, sort=True, dropna=False).ngroup().to_numpy()
+    order = np.argsort(codes, kind="stable")
+    sizes = np.bincount(codes)
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    values = df[metrics].to_numpy(dtype=np.float64)[order]
+    low = np.full((len(sizes), len(metrics)), np.nan)
+    high = np.full((len(sizes), len(metrics)), np.nan)
+    for n in np.unique(sizes[sizes > 1]):
+        groups = np.flatnonzero(sizes == n)
+        rows = starts[groups][:, None] + np.arange(n)
+        for i in range(0, len(metrics), METRICS_PER_CHUNK):
+            chunk = slice(i, i + METRICS_PER_CHUNK)
+            low[groups, chunk], high[groups, chunk] = bootstrap_ci(
+                values[rows][:, :, chunk], confidence, resamples
+            )
+    return low, high
+
+
+def summarize(
+    df: DataFrame,
+    by: list[str],
+    metrics: list[str],
+    confidence: float = 0.95,
+    resamples: int = 1000,
+) -> DataFrame:
+    """
+    Returns one row per group of `by` with the number of samples, and the
+    mean, median, bootstrap confidence interval of the mean, coefficient of
+    variation and number of outliers of every metric.
+    """
+    keys = [df[k] for k in by]
+    grouped = df[metrics].astype(float).groupby(keys, sort=True, dropna=False)
+    mean = grouped.mean()
+    std = grouped.std()
+    low, high = bootstrap_groups(df, by, metrics, confidence, resamples)
+    outliers = flag_outliers(df, by, metrics).groupby(keys, sort=True, dropna=False).sum()
+    stats = {
+        "mean": mean,
+        "median": grouped.median(),
+        "ci_low": DataFrame(low, index=mean.index, columns=metrics),
+        "ci_high": DataFrame(high, index=mean.index, columns=metrics),
+        "cv": std / mean.abs().replace(0, np.nan),
+        "outliers": outliers.set_axis(metrics, axis=1),
+    }
+    columns = {"samples": grouped.size().to_numpy()}
+    columns |= {f"{m}_{name}": stat[m].to_numpy() for m in metrics for name, stat in stats.items()}
+    return DataFrame(columns, index=mean.index).reset_index()
+
+
+def summarize_results(df: DataFrame, confidence: float = 0.95) -> DataFrame:
+    """
+    Returns the summary of the repeats of every execution unit at every grid
+    point of the results of a campaign.
+    """
+    by = get_point_columns(df)
+    return summarize(df, by, get_metric_columns(df, by), confidence)
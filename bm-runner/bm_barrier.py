@@ -0,0 +1,106 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import os
+import select
+import time
+from typing import Optional
+from utils.logger import bm_log, LogType
+from bm_utils import resolve_path
+
+
+class StartBarrier:
+    """
+    Holds all execution units until the runner gives the start signal.
+
+    The barrier is made of two named pipes (FIFOs) under the CSB dir, which
+    are shared by native processes and containers (through the volume bind).
+    Every unit first writes one byte to the ready FIFO, then blocks reading a
+    single byte from the start FIFO. The runner waits until it has read one
+    byte per unit from the ready FIFO, and releases all of them at once by
+    writing one byte per unit to the start FIFO. The runner keeps both FIFOs
+    open until `destroy` so that units reaching the barrier late are released
+    as soon as they read from it.
+    """
+
+    TOKEN = b"1"
+    TIMEOUT_IN_SEC = 16 * 60  # 16 mins
+
+    def __init__(self, path: str):
+        self.path = path
+        self.ready_path = f"{path}.ready"
+        self.fd: Optional[int] = None
+        self.ready_fd: Optional[int] = None
+        self.release_time: Optional[float] = None
+
+    @staticmethod
+    def __open_fifo(path: str) -> int:
+        fifo = resolve_path(path)
+        if os.path.exists(fifo):
+            os.remove(fifo)
+        os.mkfifo(fifo, 0o666)
+        # O_RDWR does not block on a FIFO and keeps its buffer alive even
+        # when there is no reader/writer on the other side yet.
+        return os.open(fifo, os.O_RDWR | os.O_NONBLOCK)
+
+    def create(self):
+        self.fd = self.__open_fifo(self.path)
+        self.ready_fd = self.__open_fifo(self.ready_path)
+        self.release_time = None
+
+    def get_wait_cmd(self, release_file: str, use_in_container: bool) -> str:
+        """
+        Returns the shell snippet a unit runs before the benchmark. It signals
+        readiness, blocks on the barrier and then records the release time
+        (seconds since epoch) in `release_file`.
+        """
+        fifo = resolve_path(self.path, use_in_container=use_in_container)
+        ready_fifo = resolve_path(self.ready_path, use_in_container=use_in_container)
+        return (
+            f"printf {self.TOKEN.decode()} > {ready_fifo}; "
+            f"read -r -n 1 -t {self.TIMEOUT_IN_SEC} token < {fifo}; "
+            f'echo "${{EPOCHREALTIME:-$(date +%s.%N)}}" > {release_file};'
+        )
+
+    def wait_ready(self, n_units: int, timeout: float) -> int:
+        """
+        Waits until `n_units` units signaled readiness or `timeout` seconds
+        passed. Returns the number of ready units.
+        """
+        assert self.ready_fd is not None, "barrier is used before being created"
+        ready = 0
+        deadline = time.monotonic() + timeout
+        while ready < n_units:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            readable, _, _ = select.select([self.ready_fd], [], [], remaining)
+            if readable:
+                ready += len(os.read(self.ready_fd, n_units - ready))
+        return ready
+
+    def release(self, n_units: int, release_time: float):
+        assert self.fd is not None, "barrier is released before being created"
+        os.write(self.fd, self.TOKEN * n_units)
+        self.release_time = release_time
+
+    def destroy(self):
+        for fd in (self.fd, self.ready_fd):
+            if fd is not None:
+                os.close(fd)
+        self.fd = None
+        self.ready_fd = None
+        for path in (self.path, self.ready_path):
+            fifo = resolve_path(path)
+            if os.path.exists(fifo):
+                os.remove(fifo)
+
+    @staticmethod
+    def read_release_time(release_file: str) -> Optional[float]:
+        try:
+            with open(release_file, "r") as f:
+                # EPOCHREALTIME uses the decimal separator of the locale
+                return float(f.read().strip().replace(",", "."))
+        except (FileNotFoundError, ValueError) as e:
+            bm_log(f"Could not read release time from {release_file}: {e}", LogType.WARNING)
+            return None
@@ -0,0 +1,179 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import copy
+import hashlib
+import json
+import os
+import platform
+import shutil
+from collections import defaultdict
+from typing import Any, Optional
+from bm_scheduler import get_point_key
+from bm_utils import resolve_path
+from config.application import Application
+from config.benchmark import BenchmarkConfig, ExecutionType
+from config.container import ContainersConfig
+from config.plot import PlotConfig
+from utils.docker_client import get_docker_client
+from utils.logger import bm_log, LogType
+
+# keys of the configuration that define the points of the campaign, or that
+# do not change the results of a point
+GRID_KEYS: dict[Optional[str], list[str]] = {
+    None: [PlotConfig.CONFIG_KEY],
+    BenchmarkConfig.CONFIG_KEY: [
+        "threads",
+        "noise",
+        "initial_size",
+        "exec_env",
+        "repeat",
+        "schedule",
+    ],
+    ContainersConfig.CONFIG_KEY: ["container_list"],
+}
+
+
+def hash_str(value: str) -> str:
+    return hashlib.sha256(value.encode()).hexdigest()
+
+
+def hash_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def get_config_fingerprint(config: dict[str, Any]) -> str:
+    """
+    Returns the hash of the configuration, without the values that only
+    select the points of the campaign.
+    """
+    config = copy.deepcopy(config)
+    for section, keys in GRID_KEYS.items():
+        target = config if section is None else config.get(section)
+        if not isinstance(target, dict):
+            continue
+        for key in keys:
+            target.pop(key, None)
+    return hash_str(json.dumps(config, sort_keys=True))
+
+
+def get_binary_hash(app: Application) -> str:
+    """
+    Returns the hash of the binary of the application, or of its name when
+    the binary cannot be found e.g. a command of the shell.
+    """
+    path = resolve_path(os.path.join(app.path or Application.BUILTIN_APP_DIR, app.name))
+    if not os.path.isfile(path):
+        path = shutil.which(app.name) or ""
+    if not os.path.isfile(path):
+        return hash_str(app.name)
+    return hash_file(path)
+
+
+def get_image_digest(image: str) -> str:
+    return get_docker_client().images.get(image).id
+
+
+def get_sys_snapshot() -> str:
+    """
+    Returns the hash of the parts of the system configuration that are
+    stable between two campaigns and influence the results.
+    """
+    uname = platform.uname()
+    snapshot = {
+        "node": uname.node,
+        "release": uname.release,
+        "version": uname.version,
+        "machine": uname.machine,
+        "cpus": os.cpu_count(),
+    }
+    for name, path in [
+        ("cmdline", "/proc/cmdline"),
+        ("governor", "/sys/devices/system/cpu/cpu0/cpufreq/scaling_governor"),
+        ("smt", "/sys/devices/system/cpu/smt/control"),
+    ]:
+        try:
+            with open(path) as f:
+                snapshot[name] = f.read().strip()
+        except OSError:
+            snapshot[name] = None
+    return hash_str(json.dumps(snapshot, sort_keys=True))
+
+
+class ResultCache:
+    """
+    Output of every run of the campaign, keyed by the fingerprint of its point,
+    of the configuration, of the binaries, of the image and of the system.
+    Runs are stored as soon as they complete, and the runs that are already
+    stored are not executed again. Only used by campaigns run with `--resume`.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        config: dict[str, Any],
+        apps: list[Application],
+        image: str,
+    ):
+        self.cache_dir = cache_dir
+        self.config = config
+        self.apps = apps
+        self.image = image
+        self.environment: Optional[dict[str, str]] = None
+        self.image_digest: Optional[str] = None
+        # runs of a point requested so far, for campaigns that repeat points
+        self.occurrences: dict[str, int] = defaultdict(int)
+
+    def __get_environment(self) -> dict[str, str]:
+        # binaries are only built once the campaign starts
+        if self.environment is None:
+            self.environment = {
+                "config": get_config_fingerprint(self.config),
+                "binaries": hash_str(",".join(get_binary_hash(app) for app in self.apps)),
+                "sys": get_sys_snapshot(),
+            }
+        return self.environment
+
+    def get_fingerprint(self, point: dict[str, Any], duration: int, advance: bool = True) -> str:
+        """
+        Returns the fingerprint of the next run of the point, `advance` moves
+        on to the following run.
+        """
+        key = get_point_key({**point, "duration": duration})
+        run = self.occurrences[key]
+        if advance:
+            self.occurrences[key] += 1
+        fingerprint = {**self.__get_environment(), "point": key, "run": run}
+        if point.get("execution_type") == ExecutionType.CONTAINER:
+            if self.image_digest is None:
+                self.image_digest = get_image_digest(self.image)
+            fingerprint["image"] = self.image_digest
+        return hash_str(json.dumps(fingerprint, sort_keys=True))
+
+    def __get_path(self, fingerprint: str) -> str:
+        return os.path.join(self.cache_dir, f"{fingerprint}.out")
+
+    def load(self, fingerprint: str) -> Optional[str]:
+        """
+        Returns the stored output of the run, if any.
+        """
+        try:
+            with open(self.__get_path(fingerprint)) as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def store(self, fingerprint: str, output: str):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.__get_path(fingerprint)
+        tmp = f"{path}.tmp"
+        try:
+            with open(tmp, "w") as f:
+                f.write(output)
+            os.replace(tmp, path)
+        except OSError as e:
+            bm_log(f"Cannot store the results of the run in {path}: {e}", LogType.WARNING)
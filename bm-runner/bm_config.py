@@ -16,8 +16,22 @@ from config.nics import NicsConfig
 from utils.logger import bm_log, LogType
 
 
+def check_shards(shards: int, plugins: list[Plugin], nics: Optional[NicsConfig]):
+    """
+    Points running at the same time would share the processes of the plugins
+    and attach the same NICs, sharding is refused with either of them.
+    """
+    if shards > 1 and (plugins or nics is not None):
+        bm_log(
+            f"`shards` must be 1 when `{Plugin.CONFIG_KEY}` or `{NicsConfig.CONFIG_KEY}` are configured",
+            LogType.FATAL,
+        )
+        sys.exit(1)
+
+
 class CampaignConfig:
     CFG_THREADS = "threads"
+    CFG_CPU_ORDER = "cpu_order"
 
     def __init__(self, filename: str):
         """
@@ -49,6 +63,7 @@ class CampaignConfig:
         self.plots = self.__parse_plots()
         self.plugins = self.__parse_plugins()
         self.nics = self.__parse_nics()
+        check_shards(self.bm_cfg.shards, self.plugins, self.nics)
 
     def __load(self, filename: str):
         try:
@@ -106,11 +121,14 @@ class CampaignConfig:
         return self.plots
 
     def __parse_container_cfg(self) -> ContainersConfig:
-        containers = self.config.get(ContainersConfig.CONFIG_KEY)
-        if containers:
-            return ContainersConfig(**containers)
-        else:
-            return ContainersConfig()
+        containers = dict(self.config.get(ContainersConfig.CONFIG_KEY) or {})
+        # older configs have cpu_order at the top-level e.g. {"value": "desc", "type": "str"}
+        cpu_order = self.config.get(self.CFG_CPU_ORDER)
+        if cpu_order is not None and self.CFG_CPU_ORDER not in containers:
+            containers[self.CFG_CPU_ORDER] = (
+                cpu_order["value"] if isinstance(cpu_order, dict) else cpu_order
+            )
+        return ContainersConfig(**containers)
 
     def get_container_config(self) -> ContainersConfig:
         return self.container_cfg
@@ -4,23 +4,138 @@
 ### Reference: https://docker-py.readthedocs.io/en/stable/containers.html
 import docker
 import docker.errors
+import atexit
 import os
+import subprocess
+import threading
 import time
 import sys
 from benchkit.shell.shell import shell_out
 from bm_executer import Executer
 from bm_executer import ExecutionUnit
+from bm_placement import UnitPlacement
 import bm_utils
 from textwrap import indent
-from typing import Optional
+from typing import Callable, Optional
 from config.application import Application
 from config.container import ContainersConfig
 from config.nics import NicsConfig, ContainerNicConfig
 from config.benchmark import ExecutionType
+from utils.docker_client import get_docker_client, get_container_states
 from utils.logger import bm_log, LogType
+from utils.trace import Tracer, g_tracer
 from bm_utils import resolve_path
 
 
+class ContainerPool:
+    """
+    Long-lived containers that are reused by the runs of a campaign.
+    A pooled container keeps the name of the execution unit, and is only
+    reused by a unit with the same image, core set, port and NIC. Otherwise,
+    it is replaced. The containers that the current points do not use are
+    removed by `release_shards` and `release_unused`, all the others by
+    `teardown`, at the end of the campaign.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # container name -> (pool key, container id, has NIC attached, shard)
+        self.entries: dict[str, tuple[tuple, str, bool, Optional[int]]] = {}
+        atexit.register(self.teardown)
+
+    @staticmethod
+    def get_key(unit: "Container") -> tuple:
+        return (unit.image, unit.core_set, unit.port, unit.nic.nic if unit.nic else None)
+
+    def has(self, unit: "Container") -> bool:
+        """
+        Returns whether a running pooled container matches the given unit.
+        """
+        with self.lock:
+            entry = self.entries.pop(unit.name, None)
+        if entry is None or entry[0] != self.get_key(unit):
+            return False
+        if unit.known_state is None:
+            unit.known_state = get_container_states([unit.name]).get(unit.name, "")
+        if unit.known_state != "running":
+            return False
+        with self.lock:
+            self.entries[unit.name] = entry
+        unit.container_id = entry[1]
+        return True
+
+    def add(self, unit: "Container"):
+        assert unit.container_id is not None
+        with self.lock:
+            self.entries[unit.name] = (self.get_key(unit), unit.container_id, False, unit.shard)
+
+    def has_nic(self, unit: "Container") -> bool:
+        with self.lock:
+            entry = self.entries.get(unit.name)
+        return entry is not None and entry[2]
+
+    def set_nic(self, unit: "Container"):
+        with self.lock:
+            key, container_id, _, shard = self.entries[unit.name]
+            self.entries[unit.name] = (key, container_id, True, shard)
+
+    def release_shards(self, shards: list[Optional[int]]):
+        """
+        Removes the containers of the shards that do not run anymore, e.g.
+        when fewer points run at the same time.
+        """
+        self.__remove(lambda name, shard: shard not in shards)
+
+    def release_unused(self, shard: Optional[int], names: list[str]):
+        """
+        Removes the containers of the shard that are not among the units of
+        its current point, e.g. when the point has fewer units, so that they
+        do not hold their cpus and ports.
+        """
+        self.__remove(lambda name, entry_shard: entry_shard == shard and name not in names)
+
+    def teardown(self):
+        self.__remove(lambda name, shard: True)
+
+    def __remove(self, selected: Callable[[str, Optional[int]], bool]):
+        with self.lock:
+            entries = {name: e for name, e in self.entries.items() if selected(name, e[3])}
+            for name in entries:
+                del self.entries[name]
+        if not entries:
+            return
+        bm_log(f"Removing {len(entries)} pooled containers")
+        client = get_docker_client()
+        for name in entries:
+            try:
+                client.api.remove_container(name, force=True)
+            except docker.errors.NotFound:
+                pass
+        remove_netns([name for name, (_, _, has_nic, _) in entries.items() if has_nic])
+
+
+def remove_netns(names: list[str]):
+    """
+    Removes the network namespaces of the given containers with a single
+    `ip` invocation.
+    """
+    if not names:
+        return
+    batch = "".join(f"netns del {name}\n" for name in names)
+    # -force keeps going when a namespace does not exist anymore
+    subprocess.run(
+        ["sudo", "ip", "-force", "-batch", "-"],
+        input=batch,
+        text=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+# containers kept alive between runs, see `ContainersConfig.pool`
+g_container_pool = ContainerPool()
+
+
 class Container(ExecutionUnit):
     def __init__(
         self,
@@ -32,14 +147,30 @@ class Container(ExecutionUnit):
         app: Application,
         port: Optional[int] = None,
         nic: Optional[ContainerNicConfig] = None,
+        pooled: bool = False,
+        shard: Optional[int] = None,
     ):
-        super().__init__(idx=idx, type=ExecutionType.CONTAINER, home_dir=home_dir, app=app)
-        self.client = docker.from_env()  # Initialize Docker client
+        super().__init__(
+            idx=idx, type=ExecutionType.CONTAINER, home_dir=home_dir, app=app, shard=shard
+        )
         self.image = image
         self.core_set = core_set
         self.record_data_dir = record_data_dir
         self.port = port + self.idx if port else None
         self.nic = nic
+        self.pooled = pooled
+        # index of the point among the points running at the same time, if any
+        self.shard = shard
+        self.container_id: Optional[str] = None
+        # id of the `docker exec` running the benchmark in a pooled container
+        self.exec_id: Optional[str] = None
+        # state from the last batched lookup (see `Containers.prepare_launch`),
+        # None when unknown and "" when the container does not exist
+        self.known_state: Optional[str] = None
+
+    @property
+    def client(self) -> docker.DockerClient:
+        return get_docker_client()
 
     def get_results_dir(self) -> str:
         return str(resolve_path(self.record_data_dir, use_in_container=True))
@@ -71,38 +202,90 @@ class Container(ExecutionUnit):
 
             time.sleep(0.1)
 
+    def __wait_exec(self) -> int:
+        assert self.exec_id is not None
+        while True:
+            result = self.client.api.exec_inspect(self.exec_id)
+            if not result["Running"]:
+                return result["ExitCode"]
+            time.sleep(0.1)
+
     def wait(self, timeout=None):
-        container = self.client.containers.get(self.name)
-        bm_log(f"Waiting for Container: {self.name} to stop")
-        result = container.wait(timeout=timeout)
-        exit_code = result["StatusCode"]
+        if self.pooled:
+            bm_log(f"Waiting for benchmark in pooled Container: {self.name} to finish")
+            exit_code = self.__wait_exec()
+        else:
+            bm_log(f"Waiting for Container: {self.name} to stop")
+            result = self.client.api.wait(self.name, timeout=timeout)
+            exit_code = result["StatusCode"]
+        self.set_finished(exit_code, time.time())
+
+    def set_finished(self, exit_code: int, finish_time: float):
+        self.finish_time = finish_time
         if exit_code != 0:
+            # the container is removed without logging its status once finished
+            try:
+                self.__log_status(self.client.containers.get(self.name))
+            except docker.errors.NotFound:
+                pass
             bm_log(
                 f"Container: {self.name} has failed/or crashed with exit code {exit_code}",
                 LogType.FATAL,
             )
             sys.exit(1)
 
-    def stop(self):
-        bm_log(f"Stopping Container {self.name}")
+    def stop(self, remove_netns: bool = True):
+        if self.pooled:
+            self.__stop_exec()
+        else:
+            self.__remove(remove_netns)
+
+    def __stop_exec(self):
+        """
+        Kills whatever is still running in the pooled container, the
+        container itself keeps running.
+        """
+        if self.exec_id is None:
+            return
         try:
-            container = self.client.containers.get(self.name)
-
-            self.__log_status(container)
+            if self.client.api.exec_inspect(self.exec_id)["Running"]:
+                bm_log(f"Killing benchmark in pooled Container {self.name}")
+                # kills all processes in the container except its init
+                kill_id = self.client.api.exec_create(self.name, ["kill", "-9", "-1"])["Id"]
+                self.client.api.exec_start(kill_id)
+        except docker.errors.NotFound:
+            pass
+        self.exec_id = None
 
-            container.stop()
-            container.remove()
-            # Remove network namespace as well
-            if self.nic:
-                shell_out(f"sudo ip netns del {self.name}", ignore_any_error_code=True)
+    def __remove(self, remove_netns: bool = True):
+        if self.known_state == "":
+            return  # Container does not exist, nothing to do
+        try:
+            if self.finish_time is not None or self.known_state in ("exited", "dead"):
+                # nothing left to stop gracefully, and its status is known
+                if self.finish_time is None:
+                    # it stopped before the runner waited for it
+                    self.__log_status(self.client.containers.get(self.name))
+                self.client.api.remove_container(self.name, force=True)
+            else:
+                bm_log(f"Stopping Container {self.name}")
+                container = self.client.containers.get(self.name)
+
+                self.__log_status(container)
+
+                container.stop()
+                container.remove()
             bm_log(f"Container: {self.name} has been stopped and removed")
         except docker.errors.NotFound:
             pass  # Container does not exist, nothing to do
+        # Remove network namespace as well
+        if self.nic and remove_netns:
+            shell_out(f"sudo ip netns del {self.name}", ignore_any_error_code=True)
 
-    def add_nic(self, container):
+    def add_nic(self):
         assert self.nic is not None
         # find the PID of the initial task of a container.
-        pid = docker.APIClient().inspect_container(container.id)["State"]["Pid"]
+        pid = self.client.api.inspect_container(self.name)["State"]["Pid"]
         netcfg = self.nic
         smp_irq_affinity = (
             netcfg.core_affinity_offset
@@ -159,9 +342,11 @@ class Container(ExecutionUnit):
         )
         return None
 
-    def __start(self, commands):
-        self.stop()
-
+    def __run(self, command: list[str]):
+        """
+        Creates the container running the given command, and waits for it
+        to leave the `created` state.
+        """
         host_home_dir = self._host_home_dir()
 
         volumes = {
@@ -173,11 +358,11 @@ class Container(ExecutionUnit):
         }
 
         bm_log(f"Starting Container: {self.name}")
-        try:
-            ports = {f"{self.port}/tcp": ("0.0.0.0", self.port)} if self.port else None
+        ports = {f"{self.port}/tcp": ("0.0.0.0", self.port)} if self.port else None
+        with self.tracer.span("create container", track=self.name):
             container = self.client.containers.run(
                 image=self.image,
-                command=["bash", "-c", commands],
+                command=command,
                 name=self.name,
                 cpuset_cpus=self.core_set,
                 volumes=volumes,
@@ -187,20 +372,44 @@ class Container(ExecutionUnit):
                 ports=ports,
             )
 
-            timeout = 20
+        timeout = 20
+        with self.tracer.span("wait running", track=self.name):
             self.__wait_status(container, timeout)
-            self.__log_status(container)
+        self.__log_status(container)
 
-            if container.status != "running":
-                bm_log(
-                    f"Container {self.name} did not reach 'running' status in {timeout}s.",
-                    LogType.ERROR,
-                )
+        if container.status != "running":
+            bm_log(
+                f"Container {self.name} did not reach 'running' status in {timeout}s.",
+                LogType.ERROR,
+            )
+        self.container_id = container.id
+        return container
+
+    def __start_pooled(self, commands):
+        if g_container_pool.has(self):
+            bm_log(f"Reusing pooled Container: {self.name}")
+        else:
+            self.__remove()
+            self.__run(["sleep", "infinity"])
+            g_container_pool.add(self)
+        with self.tracer.span("exec in container", track=self.name):
+            self.exec_id = self.client.api.exec_create(
+                self.name, ["bash", "-c", commands], workdir="/home"
+            )["Id"]
+            self.client.api.exec_start(self.exec_id, detach=True)
 
-            bm_utils.save_container_config(self.record_data_dir, self.name)
+    def __start(self, commands):
+        self.container_id = None
+        self.exec_id = None
+        try:
+            if self.pooled:
+                self.__start_pooled(commands)
+            else:
+                self.__remove()
+                self.__run(["bash", "-c", commands])
 
-            if self.nic:
-                self.add_nic(container)
+            with self.tracer.span("save container config", track=self.name):
+                bm_utils.save_container_config(self.record_data_dir, self.name)
 
             bm_log(
                 f"Container {self.name} is created, will run on {self.idx} => {self.port}, and will run on cores={self.core_set} and waiting for start signal"
@@ -208,14 +417,27 @@ class Container(ExecutionUnit):
         except docker.errors.APIError as e:
             bm_log(f"Could not start container {self.name}: {str(e)}", LogType.ERROR)
             return False
+        finally:
+            self.known_state = None
 
         return True
 
+    def post_launch(self) -> bool:
+        if self.nic and not (self.pooled and g_container_pool.has_nic(self)):
+            try:
+                self.add_nic()
+                if self.pooled:
+                    g_container_pool.set_nic(self)
+            except docker.errors.APIError as e:
+                bm_log(f"Could not add NIC to container {self.name}: {str(e)}", LogType.ERROR)
+                return False
+        return True
+
     def exec(self, command):
         if self.app.cd:
             assert self.app.path is not None, "path is not set while change directory is requested!"
             command = f"cd {self.app.path} && {command}"
-        commands = f"{self.CMD_WHILE_NOT_START} {command} > {resolve_path(self.output_file, use_in_container=True)}"  # same as self.output_file outside container.
+        commands = f"{self.get_start_cmd(use_in_container=True)} {command} > {resolve_path(self.output_file, use_in_container=True)}"  # same as self.output_file outside container.
         return self.__start(commands)
 
 
@@ -227,22 +449,100 @@ class Containers(Executer):
         home_dir,
         count,
         record_data_dir,
+        placements: list[UnitPlacement],
+        port_start: Optional[int] = None,
         nics: Optional[NicsConfig] = None,
+        shard: Optional[int] = None,
+        tracer: Tracer = g_tracer,
     ):
-        super().__init__(home_dir, results_dir=record_data_dir)
+        super().__init__(home_dir, results_dir=record_data_dir, shard=shard, tracer=tracer)
         assert len(apps) == count, "[BUG] Application list length must be equal to count"
         bm_log(f"Initializing {count} containers with config: {config}")
-        core_offsets = config.get_core_affinity_offset_list()
+        self.launch_concurrency = config.launch_concurrency
         for i in range(count):
-            core_set = bm_utils.get_cpu_set(start=core_offsets[i], core_cnt=config.core_count)
             container = Container(
                 idx=i,
                 home_dir=home_dir,
                 image=config.image,
-                core_set=core_set,
+                core_set=placements[i].get_cpu_set(),
                 record_data_dir=record_data_dir,
-                port=config.port,
+                port=port_start,
                 app=apps[i],
                 nic=self.nics.get_cfg(i) if self.nics else None,
+                pooled=config.pool,
+                shard=shard,
             )
+            container.placement = placements[i]
             self.add_exec_unit(container)
+
+    def prepare_launch(self):
+        # one request for all containers instead of one per container
+        states = get_container_states([eu.name for eu in self.exec_units])
+        for eu in self.exec_units:
+            eu.known_state = states.get(eu.name, "")
+
+    def stop_unit(self, eu: Container):
+        # network namespaces are removed all at once by stop_all
+        with self.tracer.span("stop", track=eu.name):
+            eu.stop(remove_netns=False)
+
+    def stop_all(self):
+        super().stop_all()
+        with self.tracer.span("remove netns"):
+            remove_netns([eu.name for eu in self.exec_units if eu.nic and not eu.pooled])
+
+    def wait_all(self):
+        """
+        Tracks the completion of all containers with a single subscription to
+        the Docker events stream, so that a failing container is noticed as
+        soon as it exits, whatever its position.
+        """
+        # benchmarks run by `docker exec` in pooled containers end with an
+        # exec_die event, the others with the die event of their container
+        by_exec = {eu.exec_id: eu for eu in self.exec_units if eu.exec_id is not None}
+        by_container = {
+            eu.container_id: eu for eu in self.exec_units if eu.container_id is not None
+        }
+        pending = {eu.name for eu in by_exec.values()} | {
+            eu.name for eu in by_container.values() if not eu.pooled
+        }
+        for eu in self.exec_units:
+            if eu.name not in pending:
+                bm_log(f"Container {eu.name} was not launched, not waiting for it", LogType.ERROR)
+        if not pending:
+            return
+
+        bm_log(f"Waiting for {len(pending)} containers to finish")
+        client = get_docker_client()
+        # events since the launch are replayed, so no exit is missed
+        events = client.events(
+            since=self.launch_time,
+            decode=True,
+            filters={
+                "type": "container",
+                "event": ["die", "oom", "exec_die"],
+                "container": sorted(pending),
+            },
+        )
+        try:
+            for event in events:
+                action = event.get("Action")
+                actor = event.get("Actor", {})
+                attributes = actor.get("Attributes", {})
+                if action == "exec_die":
+                    eu = by_exec.get(attributes.get("execID"))
+                else:
+                    # a die event of a pooled container means its benchmark died too
+                    eu = by_container.get(actor.get("ID"))
+                if eu is None or eu.name not in pending:
+                    continue  # e.g. an older container with the same name
+                if action == "oom":
+                    bm_log(f"Container {eu.name} ran out of memory", LogType.ERROR)
+                    continue
+                pending.remove(eu.name)
+                finish_time = event.get("timeNano", time.time_ns()) / 1e9
+                eu.set_finished(int(attributes.get("exitCode", 0)), finish_time)
+                if not pending:
+                    break
+        finally:
+            events.close()
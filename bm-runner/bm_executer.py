@@ -2,35 +2,59 @@
 # SPDX-License-Identifier: MIT
 
 from benchkit.shell.shell import shell_out
+import json
 import os
-import sys
+import threading
 import time
-from typing import Optional
+from typing import Any, Optional
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 
 from config.plugin import ExecutionTime
 import bm_config
+from bm_parser import parse_output_line, flatten_records
 from config.application import Application
-from config.benchmark import ExecutionType
-from bm_utils import is_port_free_to_use
+from config.benchmark import ExecutionType, OutputFormat
 from monitors.monitor_factory import MonitorFactory
+from utils.trace import Tracer, g_tracer
 from utils.logger import bm_log, LogType
 from bm_utils import resolve_path
+from bm_barrier import StartBarrier
+from bm_placement import UnitPlacement
 
 
 class ExecutionUnit:
+    # Created once the units are released, plugins (e.g. clients of network
+    # benchmarks) can wait for it.
     START_FILE = f"{Application.BUILTIN_APP_DIR}/start"
-    RETRY_COUNT = 16 * 60  # 16 mins
-    CMD_WHILE_NOT_START = f"for i in $(seq 1 $((10 * RETRY_COUNT))); do if [ -e {START_FILE} ]; then break; fi; sleep 0.1; done;"
+    # prefix of the lines of builtin benchmarks holding the stats of an interval
+    TIMESERIES_PREFIX = "ts;"
 
-    def __init__(self, idx, home_dir, app: Application, type: ExecutionType):
+    def __init__(
+        self, idx, home_dir, app: Application, type: ExecutionType, shard: Optional[int] = None
+    ):
         self.app = app
         self.idx = idx
         self.type = type
         self.home_dir = home_dir
-        self.name = "C" if type == ExecutionType.CONTAINER else "N"
+        # units of points that run at the same time must not share names or files
+        self.name = f"S{shard}_" if shard is not None else ""
+        self.name += "C" if type == ExecutionType.CONTAINER else "N"
         self.name += f"{idx:03d}_{app.name}"
         self.output_file = os.path.join(Application.BUILTIN_APP_DIR, self.name)
+        self.release_file = f"{self.output_file}.release"
+        self.barrier: Optional[StartBarrier] = None
+        self.tracer = g_tracer
+        # time in seconds it took to bring the unit up to the start barrier
+        self.launch_latency: Optional[float] = None
+        # seconds since epoch at which the unit finished
+        self.finish_time: Optional[float] = None
+        # cpus assigned to the unit by the placement planner
+        self.placement: Optional[UnitPlacement] = None
+        # stats of every interval of the measurement window, see `interval_ms`
+        self.timeseries: list[dict[str, Any]] = []
+        # structured results of builtin benchmarks, see `output_format`
+        self.records: list[dict[str, Any]] = []
 
     @abstractmethod
     def get_results_dir(self) -> str:
@@ -40,6 +64,24 @@ class ExecutionUnit:
     def exec(self, command: str) -> bool:
         return False
 
+    def get_start_cmd(self, use_in_container: bool) -> str:
+        """
+        Returns the command that holds the unit until the start signal.
+        """
+        assert self.barrier is not None, "[BUG] unit is not added to an executer"
+        release_file = resolve_path(self.release_file, use_in_container=use_in_container)
+        return self.barrier.get_wait_cmd(str(release_file), use_in_container)
+
+    def get_release_time(self) -> Optional[float]:
+        return StartBarrier.read_release_time(str(resolve_path(self.release_file)))
+
+    def post_launch(self) -> bool:
+        """
+        Called once the unit is launched. Units are visited in index order,
+        even if they were launched concurrently.
+        """
+        return True
+
     @abstractmethod
     def wait(self):
         pass
@@ -48,25 +90,83 @@ class ExecutionUnit:
     def stop(self):
         pass
 
-    def get_output(self) -> str:
-        line = open(resolve_path(self.output_file), "r").read()
+    def get_output(
+        self, start_time: Optional[float] = None, structured: bool = False
+    ) -> str | dict[str, Any]:
+        """
+        Returns the results of the unit, as a `key=val;` line, or as a dict
+        when `structured` is set and the unit runs a builtin benchmark.
+        """
+        lines = open(resolve_path(self.output_file), "r").read().splitlines(keepends=True)
+        info: dict[str, Any] = {
+            "execution_unit": self.name,
+            "app": self.app.name,
+            "launch_latency_s": f"{self.launch_latency or 0:.6f}",
+        }
+        release_time = self.get_release_time()
+        if start_time is not None and release_time is not None:
+            info["start_delay_ms"] = f"{(release_time - start_time) * 1000:.3f}"
+        if self.placement:
+            info |= parse_output_line(self.placement.get_output())
+        if structured and self.app.is_builtin():
+            # only builtin benchmarks print records, they need no adapter
+            self.records = [json.loads(line) for line in lines if line.startswith("{")]
+            results, self.timeseries = flatten_records(self.records)
+            return info | results
+        # the intervals are printed before the results of the whole run
+        prefix = self.TIMESERIES_PREFIX
+        self.timeseries = [
+            parse_output_line(line[len(prefix) :]) for line in lines if line.startswith(prefix)
+        ]
+        line = "".join(line for line in lines if not line.startswith(prefix))
         # If there is an adapter, it means that
         # the applications' output needs to be transformed
         # after collection. This is important to have
         # a format complying to dict `key=val;...`
         if self.app.adapter is not None:
             line = self.app.adapter.adapt(line)
-        return f"execution_unit={self.name};app={self.app.name};{line}"
+        return "".join(f"{k}={v};" for k, v in info.items()) + line
 
 
 class Executer:
-    SLEEP_IN_SEC = 5
-
-    def __init__(self, home_dir, results_dir):
+    def __init__(
+        self, home_dir, results_dir, shard: Optional[int] = None, tracer: Tracer = g_tracer
+    ):
         assert bm_config.g_config
         self.home_dir = home_dir
         self.results_dir = results_dir
         self.exec_units = []
+        # index of the point among the points running at the same time, if any
+        self.shard = shard
+        # points running at the same time record their spans in their own trace
+        self.tracer = tracer
+        suffix = f".s{shard}" if shard is not None else ""
+        self.start_file = f"{ExecutionUnit.START_FILE}{suffix}"
+        # exists during the measurement window, between the warm-up and the cool-down
+        self.measure_file = f"{Application.BUILTIN_APP_DIR}/measure{suffix}"
+        self.barrier = StartBarrier(f"{Application.BUILTIN_APP_DIR}/start{suffix}.fifo")
+        # number of units launched in parallel, 1 launches them one by one
+        self.launch_concurrency = 1
+        self.ready_timeout = bm_config.g_config.get_benchmark_cfg().ready_timeout
+        # time in seconds spent stopping the units
+        self.teardown_time: Optional[float] = None
+        # first port of the range used by the units, if any
+        self.port_start: Optional[int] = None
+        # seconds since epoch at which the units started to be launched
+        self.launch_time: Optional[float] = None
+        # time in seconds spent waiting for the units to be ready
+        self.ready_wait: Optional[float] = None
+        bm_cfg = bm_config.g_config.get_benchmark_cfg()
+        self.warmup = bm_cfg.warmup
+        self.cooldown = bm_cfg.cooldown
+        self.interval_ms = bm_cfg.interval_ms
+        self.output_format = bm_cfg.output_format
+        self.duration = 0
+        self.window_lock = threading.Lock()
+        self.window_timers: list[threading.Timer] = []
+        # seconds since epoch at which the measurement window began and ended
+        self.measure_begin: Optional[float] = None
+        self.measure_end: Optional[float] = None
         self.plugins = bm_config.g_config.get_plugins()
         self.nics = bm_config.g_config.get_nics()
         self.monitors = [
@@ -77,12 +177,16 @@ class Executer:
     def __call_plugins(self, exec_time):
         plugins = [plugin for plugin in self.plugins if plugin.exec_time == exec_time]
         for plugin in plugins:
-            plugin.execute(
-                self.results_dir,
-                n_units=len(self.exec_units),
-                homedir=self.home_dir,
-                res_dir=self.results_dir,
-            )
+            with self.tracer.span(f"plugin {exec_time.value}"):
+                plugin.execute(
+                    self.results_dir,
+                    n_units=len(self.exec_units),
+                    homedir=self.home_dir,
+                    res_dir=self.results_dir,
+                    port_start=self.port_start,
+                    start_file=resolve_path(self.start_file),
+                    measure_file=resolve_path(self.measure_file),
+                )
 
     def __wrap_plugins(self) -> str:
         """
@@ -95,7 +199,9 @@ class Executer:
         ]
         return " ".join(plugins)
 
-    def add_exec_unit(self, unit):
+    def add_exec_unit(self, unit: ExecutionUnit):
+        unit.barrier = self.barrier
+        unit.tracer = self.tracer
         self.exec_units.append(unit)
 
     def __stop_plugins(self):
@@ -104,35 +210,119 @@ class Executer:
 
     def __start_monitors(self):
         for monitor in self.monitors:
-            monitor.start()
+            with self.tracer.span(f"start {type(monitor).__name__}"):
+                monitor.start()
 
     def __stop_monitors(self):
         for monitor in self.monitors:
-            monitor.stop()
+            with self.tracer.span(f"stop {type(monitor).__name__}"):
+                monitor.stop()
+
+    def __begin_measurement(self):
+        with self.window_lock:
+            if self.measure_begin is not None:
+                return
+            self.__start_monitors()
+            open(resolve_path(self.measure_file), "w").close()
+            self.measure_begin = time.time()
+        bm_log("Measurement window begins")
+
+    def __end_measurement(self):
+        with self.window_lock:
+            if self.measure_begin is None or self.measure_end is not None:
+                return
+            self.measure_end = time.time()
+            measure_file = resolve_path(self.measure_file)
+            if os.path.exists(measure_file):
+                os.remove(measure_file)
+            self.__stop_monitors()
+        self.tracer.add_span("measurement", self.measure_begin, self.measure_end)
+        bm_log("Measurement window ends")
+
+    def __schedule_window(self, release_time: float):
+        """
+        Begins and ends the measurement window at its time after the release,
+        monitors only run within the window.
+        """
+        events = []
+        if self.warmup > 0:
+            events.append((release_time + self.warmup, self.__begin_measurement))
+        if self.cooldown > 0:
+            events.append((release_time + self.warmup + self.duration, self.__end_measurement))
+        for at, callback in events:
+            timer = threading.Timer(max(at - time.time(), 0), callback)
+            timer.daemon = True
+            timer.start()
+            self.window_timers.append(timer)
+
+    def __launch(self, eu: ExecutionUnit, command: str) -> bool:
+        start = time.perf_counter()
+        with self.tracer.span("launch", track=eu.name):
+            ret = eu.exec(command)
+        eu.launch_latency = time.perf_counter() - start
+        bm_log(f"{eu.name} launched in {eu.launch_latency:.3f}s")
+        return ret
+
+    def prepare_launch(self):
+        """
+        Called once before the units are launched.
+        """
+        pass
+
+    def __launch_all(self, commands: list[str]) -> bool:
+        start = time.perf_counter()
+        self.launch_time = time.time()
+        with self.tracer.span("prepare launch"):
+            self.prepare_launch()
+        if self.launch_concurrency > 1:
+            bm_log(f"Launching {len(commands)} units, {self.launch_concurrency} at a time")
+            with ThreadPoolExecutor(max_workers=self.launch_concurrency) as pool:
+                launched = list(pool.map(self.__launch, self.exec_units, commands))
+        else:
+            launched = []
+            for eu, command in zip(self.exec_units, commands):
+                launched.append(self.__launch(eu, command))
+                if not launched[-1]:
+                    break
+        # post launch steps (e.g. NIC setup) keep the order of the units
+        for idx, ret in enumerate(launched):
+            if ret:
+                eu = self.exec_units[idx]
+                with self.tracer.span("post launch", track=eu.name):
+                    launched[idx] = eu.post_launch()
+        self.tracer.add_span("launch all", self.launch_time, time.time(), units=len(launched))
+        bm_log(f"{len(launched)} units launched in {time.perf_counter() - start:.3f}s")
+        return len(launched) == len(self.exec_units) and all(launched)
 
     def exec_all(self, threads, duration, noise, initial_size, port_start: Optional[int]):
+        self.port_start = port_start
+        self.duration = duration
         try:
+            self.barrier.create()
+            commands = []
             for idx, eu in enumerate(self.exec_units):
                 if port_start is not None:
-                    sz = idx + port_start
+                    # the range is checked for free ports before the units are created
                     # TODO: At the moment initial_size is exploited to pass the port number,
                     # make sure that initial_size is not used when port is available
                     # or find a proper way to pass the port number to the micro-bm
-                    if not is_port_free_to_use(sz):
-                        bm_log(
-                            f"Port {sz} is already in use!, make sure ports in this range [{port_start}:{len(self.exec_units)-1}] are free to use.",
-                            LogType.FATAL,
-                        )
-                        sys.exit(1)
+                    sz = idx + port_start
                 else:
                     sz = initial_size
-                ret = eu.exec(
+                release_file = resolve_path(eu.release_file)
+                if os.path.exists(release_file):
+                    os.remove(release_file)
+                commands.append(
                     eu.app.get_cmd(
                         plugins_cmds=self.__wrap_plugins(),
                         threads=threads,
                         duration=duration,
                         noise=noise,
                         initial_size=sz,
+                        warmup=self.warmup,
+                        cooldown=self.cooldown,
+                        interval=self.interval_ms,
+                        output_format=self.output_format.get_code(),
                         index=idx,
                         work_dir=self.home_dir,
                         n_units=len(self.exec_units),
@@ -140,41 +330,173 @@ class Executer:
                         res_dir=eu.get_results_dir(),
                     )
                 )
-                if not ret:
-                    break
+            if not self.__launch_all(commands):
+                bm_log("Not all execution units could be launched", LogType.ERROR)
 
             # give start signal
             self.signal_start()
             # wait for all containers to finish
-            for eu in self.exec_units:
-                eu.wait()
+            with self.tracer.span("wait all"):
+                self.wait_all()
+            self.__trace_benchmarks()
         finally:
-            self.cleanup()
+            with self.tracer.span("cleanup"):
+                self.cleanup()
+
+    def __trace_benchmarks(self):
+        # the benchmark of each unit runs from its release to its end
+        for eu in self.exec_units:
+            release_time = eu.get_release_time()
+            if release_time is not None and eu.finish_time is not None:
+                self.tracer.add_span("benchmark", release_time, eu.finish_time, track=eu.name)
+
+    def wait_all(self):
+        """
+        Waits for all units to finish and records their finish time.
+        """
+        for eu in self.exec_units:
+            eu.wait()
+            eu.finish_time = time.time()
+
+    def get_finish_spread(self) -> Optional[float]:
+        """
+        Returns the time in ms between the first and the last unit to finish,
+        i.e. how much the stragglers lag behind.
+        """
+        finish_times = [eu.finish_time for eu in self.exec_units]
+        known_times = [t for t in finish_times if t is not None]
+        if not known_times or len(known_times) != len(finish_times):
+            return None
+        return (max(known_times) - min(known_times)) * 1000
+
+    def get_start_skew(self) -> Optional[float]:
+        """
+        Returns the time in ms between the first and the last unit released
+        from the start barrier.
+        """
+        release_times = [eu.get_release_time() for eu in self.exec_units]
+        known_times = [t for t in release_times if t is not None]
+        if not known_times or len(known_times) != len(release_times):
+            return None
+        return (max(known_times) - min(known_times)) * 1000
 
     def collect_results(self) -> str:
-        stat_prefix = "".join([monitor.collect_results().strip() for monitor in self.monitors])
-        result = "".join(f"{stat_prefix}{eu.get_output()}" for eu in self.exec_units)
+        stat_prefix = ""
+        for monitor in self.monitors:
+            with self.tracer.span(f"collect {type(monitor).__name__}"):
+                stat_prefix += monitor.collect_results().strip()
+        start_skew = self.get_start_skew()
+        if start_skew is not None:
+            stat_prefix += f"start_skew_ms={start_skew:.3f};"
+        finish_spread = self.get_finish_spread()
+        if finish_spread is not None:
+            stat_prefix += f"finish_spread_ms={finish_spread:.3f};"
+        if self.ready_wait is not None:
+            stat_prefix += f"ready_wait_s={self.ready_wait:.6f};"
+        if self.port_start is not None:
+            stat_prefix += f"port_start={self.port_start};"
+        if self.teardown_time is not None:
+            stat_prefix += f"teardown_s={self.teardown_time:.6f};"
+        if self.warmup > 0 or self.cooldown > 0:
+            stat_prefix += f"warmup_s={self.warmup};cooldown_s={self.cooldown};"
+            if self.measure_begin is not None and self.measure_end is not None:
+                stat_prefix += f"measure_window_s={self.measure_end - self.measure_begin:.6f};"
+        start_time = self.barrier.release_time
+        structured = self.output_format == OutputFormat.JSONL
+        # adapter scripts of the units run at the same time
+        workers = min(len(self.exec_units), os.cpu_count() or 1) or 1
+        with self.tracer.span("collect outputs"), ThreadPoolExecutor(max_workers=workers) as pool:
+            outputs = list(
+                pool.map(lambda eu: eu.get_output(start_time, structured), self.exec_units)
+            )
+        stats = parse_output_line(stat_prefix) if stat_prefix else {}
+        # the structured results are passed on as JSON, not as `key=val;` text
+        result = "".join(
+            (
+                f"{stat_prefix}{output}"
+                if isinstance(output, str)
+                else json.dumps(stats | output) + "\n"
+            )
+            for output in outputs
+        )
         return result
 
+    def get_records(self) -> list[dict[str, Any]]:
+        """
+        Returns the structured records of all units, except for their intervals.
+        """
+        return [
+            {"execution_unit": eu.name, **record}
+            for eu in self.exec_units
+            for record in eu.records
+            if record.get("type") != "interval"
+        ]
+
+    def get_timeseries(self) -> list[dict[str, Any]]:
+        """
+        Returns the intervals of all units, available once the results are collected.
+        """
+        return [
+            {"execution_unit": eu.name, "app": eu.app.name, **interval}
+            for eu in self.exec_units
+            for interval in eu.timeseries
+        ]
+
     def signal_start(self):
-        bm_log(f"Waiting for {self.SLEEP_IN_SEC}, before giving the start signal")
-        time.sleep(self.SLEEP_IN_SEC)
+        n_units = len(self.exec_units)
+        bm_log(f"Waiting up to {self.ready_timeout}s for {n_units} units to be ready")
+        start = time.perf_counter()
+        with self.tracer.span("wait ready"):
+            ready = self.barrier.wait_ready(n_units, self.ready_timeout)
+        self.ready_wait = time.perf_counter() - start
+        if ready < n_units:
+            bm_log(
+                f"Only {ready}/{n_units} units are ready after {self.ready_timeout}s, giving the start signal anyway",
+                LogType.ERROR,
+            )
+        else:
+            bm_log(f"All units are ready after {self.ready_wait:.3f}s, giving the start signal")
         self.__call_plugins(ExecutionTime.PRE)
-        self.__start_monitors()
+        if self.warmup == 0:
+            self.__begin_measurement()
+        release_time = time.time()
+        self.barrier.release(n_units, release_time)
+        self.tracer.add_span("release", release_time, time.time())
+        self.__schedule_window(release_time)
         shell_out(
-            f"touch {ExecutionUnit.START_FILE}",
+            f"touch {self.start_file}",
             current_dir=self.home_dir,
             output_is_log=False,
         )
         self.__call_plugins(ExecutionTime.POST)
 
+    def stop_unit(self, eu: ExecutionUnit):
+        with self.tracer.span("stop", track=eu.name):
+            eu.stop()
+
+    def stop_all(self):
+        """
+        Stops all units, `launch_concurrency` of them at a time.
+        """
+        if self.launch_concurrency > 1:
+            with ThreadPoolExecutor(max_workers=self.launch_concurrency) as pool:
+                list(pool.map(self.stop_unit, self.exec_units))
+        else:
+            for eu in self.exec_units:
+                self.stop_unit(eu)
+
     def cleanup(self):
         bm_log("cleaning up, stopping all processes/containers")
-        for eu in self.exec_units:
-            eu.stop()
-        start_file = resolve_path(ExecutionUnit.START_FILE)
+        start = time.perf_counter()
+        self.stop_all()
+        self.teardown_time = time.perf_counter() - start
+        bm_log(f"{len(self.exec_units)} units stopped in {self.teardown_time:.3f}s")
+        start_file = resolve_path(self.start_file)
         if os.path.exists(start_file):
             os.remove(start_file)
-        self.__stop_monitors()
+        self.barrier.destroy()
+        for timer in self.window_timers:
+            timer.cancel()
+        self.__end_measurement()
         self.__call_plugins(ExecutionTime.CLEANUP)
         self.__stop_plugins()
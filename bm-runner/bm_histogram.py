@@ -0,0 +1,213 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+from typing import Iterable, Optional
+import numpy as np
+from pandas import DataFrame
+
+# as in bench/include/CSB/bm_stats.h
+NUM_BUCKETS = 60
+INC_FACTOR = 1.1
+FIRST_BUCKET_MAX = 99
+
+# name of the column -> quantile
+PERCENTILES = {"p50": 0.5, "p90": 0.9, "p99": 0.99, "p999": 0.999}
+
+
+def get_bucket_bounds(num_buckets: int = NUM_BUCKETS) -> np.ndarray:
+    """
+    Returns the inclusive upper bound of every bucket of the histograms of
+    builtin benchmarks, computed as `op_time_ranges` in `bm_stat_init`.
+    """
+    bounds = np.zeros(num_buckets, dtype=np.int64)
+    low, high = 0, FIRST_BUCKET_MAX
+    for i in range(num_buckets):
+        bounds[i] = high
+        # the double is truncated when assigned to the uint64_t in C
+        low, high = high + 1, int(high + (high - low + 1) * INC_FACTOR)
+    return bounds
+
+
+BUCKET_BOUNDS = get_bucket_bounds()
+
+
+def split_histograms(values: np.ndarray) -> np.ndarray:
+    """
+    Returns the comma separated bucket counts of a column as a matrix with
+    one row per value, shorter histograms are padded with zeros.
+    """
+    lengths = np.array([value.count(",") + 1 for value in values], dtype=np.int64)
+    if lengths.size > 0 and np.all(lengths == lengths[0]):
+        # one pass over all values
+        flat = np.array(",".join(values).split(","), dtype=np.int64)
+        return flat.reshape(len(values), lengths[0])
+    matrix = np.zeros((len(values), lengths.max(initial=0)), dtype=np.int64)
+    for i, value in enumerate(values):
+        matrix[i, : lengths[i]] = np.array(value.split(","), dtype=np.int64)
+    return matrix
+
+
+def get_percentiles(
+    counts: np.ndarray, quantiles: list[float], bounds: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Returns the quantiles of every row of bucket counts, interpolated
+    linearly within the bucket they fall in. Rows without any count give NaN.
+
+    Args:
+        counts: one histogram per row.
+        quantiles: in [0, 1].
+        bounds: inclusive upper bound of every bucket, those of the builtin
+            benchmarks by default.
+
+    Returns:
+        an array of shape (rows, quantiles).
+    """
+    counts = np.atleast_2d(np.asarray(counts, dtype=np.float64))
+    upper = (BUCKET_BOUNDS if bounds is None else bounds)[: counts.shape[1]].astype(np.float64)
+    lower = np.concatenate(([0.0], upper[:-1] + 1))
+    cumulative = np.cumsum(counts, axis=1)
+    total = cumulative[:, -1:]
+    # rank of every quantile in every row, shape (rows, quantiles)
+    ranks = total * np.asarray(quantiles, dtype=np.float64)[None, :]
+    # first bucket whose cumulative count reaches the rank
+    idx = (cumulative[:, None, :] < ranks[:, :, None]).sum(axis=2)
+    idx = np.minimum(idx, counts.shape[1] - 1)
+    rows = np.arange(counts.shape[0])[:, None]
+    in_bucket = counts[rows, idx]
+    before = cumulative[rows, idx] - in_bucket
+    with np.errstate(invalid="ignore", divide="ignore"):
+        fraction = np.where(in_bucket > 0, (ranks - before) / in_bucket, 0.0)
+    values = lower[idx] + fraction * (upper[idx] - lower[idx])
+    return np.where(total > 0, values, np.nan)
+
+
+def get_percentile_columns(prefix: str, counts: np.ndarray) -> dict[str, np.ndarray]:
+    """
+    Returns the `<prefix>_<p>` columns of `PERCENTILES` for the histograms of
+    builtin benchmarks, in the unit of their durations.
+    """
+    values = get_percentiles(counts, list(PERCENTILES.values()))
+    return {f"{prefix}_{name}": values[:, i] for i, name in enumerate(PERCENTILES)}
+
+
+class LatencyHistogram:
+    """
+    Counts of latencies in the buckets of the builtin benchmarks, so that
+    the histograms of threads, execution units and repeats can be summed and
+    give the percentiles of all their operations together.
+    """
+
+    def __init__(self, counts: Optional[np.ndarray] = None):
+        self.counts = (
+            np.zeros(NUM_BUCKETS, dtype=np.float64)
+            if counts is None
+            else np.asarray(counts, dtype=np.float64)
+        )
+
+    @staticmethod
+    def from_text(text: str) -> "LatencyHistogram":
+        return LatencyHistogram(np.array(text.split(","), dtype=np.float64))
+
+    def to_text(self) -> str:
+        return ",".join(str(c) for c in np.rint(self.counts).astype(np.int64).tolist())
+
+    @staticmethod
+    def from_values(values: np.ndarray) -> "LatencyHistogram":
+        """
+        Returns the histogram of latencies, as `bm_stat_add_op` buckets them.
+        """
+        idx = np.searchsorted(BUCKET_BOUNDS, np.asarray(values), side="left")
+        counts = np.bincount(np.minimum(idx, NUM_BUCKETS - 1), minlength=NUM_BUCKETS)
+        return LatencyHistogram(counts)
+
+    @property
+    def count(self) -> float:
+        return float(self.counts.sum())
+
+    def __add__(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        return LatencyHistogram(self.counts + other.counts)
+
+    def __iadd__(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        self.counts += other.counts
+        return self
+
+    @staticmethod
+    def merge(histograms: Iterable["LatencyHistogram"]) -> "LatencyHistogram":
+        merged = LatencyHistogram()
+        for histogram in histograms:
+            merged += histogram
+        return merged
+
+    def percentiles(self, quantiles: list[float]) -> list[float]:
+        return get_percentiles(self.counts, quantiles)[0].tolist()
+
+
+def merge_quantiles(distributions: list[dict[float, float]], quantiles: list[float]) -> list[float]:
+    """
+    Returns the quantiles of the latencies of several distributions of the
+    same number of latencies, of which only some quantiles are known, e.g.
+    `{0: min, 0.5: p50, 1: max}`. Every distribution is the piecewise linear
+    CDF through its known quantiles, the CDFs are averaged on the union of
+    their knots and the average is inverted. A single distribution gives back
+    its own quantiles.
+    """
+    cdfs = []
+    for distribution in distributions:
+        qs = np.array(sorted(distribution), dtype=np.float64)
+        values = np.maximum.accumulate(np.array([distribution[q] for q in qs], dtype=np.float64))
+        # the CDF jumps at repeated values, it is right continuous
+        last = np.append(values[1:] != values[:-1], True)
+        cdfs.append((values[last], qs[last]))
+    knots = np.unique(np.concatenate([values for values, _ in cdfs]))
+    cdf = np.mean(
+        [np.interp(knots, values, qs, left=0.0, right=1.0) for values, qs in cdfs], axis=0
+    )
+    # first knot at which the average CDF reaches every quantile
+    q = np.asarray(quantiles, dtype=np.float64)
+    hi = np.clip(np.searchsorted(cdf, q, side="left"), 1, len(knots) - 1) if len(knots) > 1 else 0
+    lo = np.maximum(hi - 1, 0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        fraction = np.clip(
+            np.where(cdf[hi] > cdf[lo], (q - cdf[lo]) / (cdf[hi] - cdf[lo]), 1.0), 0, 1
+        )
+    return (knots[lo] + fraction * (knots[hi] - knots[lo])).tolist()
+
+
+def merge_histograms(df: DataFrame, column: str, by: list[str]) -> DataFrame:
+    """
+    Returns the bucket counts of the `column` histograms summed over the rows
+    with the same values of `by`, one row per group.
+    """
+    counts = DataFrame(split_histograms(df[column].astype(str).to_numpy()), index=df.index)
+    return counts.groupby([df[k] for k in by], dropna=False).sum()
+
+
+def get_merged_samples(df: DataFrame, column: str, by: list[str], samples: int) -> DataFrame:
+    """
+    Returns `samples` latencies per group of rows with the same values of
+    `by`, spread evenly over the quantiles of the merged `column` histograms,
+    so that they follow the distribution the bucket counts weight.
+    """
+    merged = merge_histograms(df, column, by)
+    quantiles = (np.arange(samples) + 0.5) / samples
+    latencies = get_percentiles(merged.to_numpy(), quantiles.tolist())
+    index = merged.index.set_names(by).repeat(samples)
+    return DataFrame({"latency": latencies.ravel()}, index=index).dropna().reset_index()
+
+
+def get_merged_percentiles(df: DataFrame, column: str, by: list[str]) -> DataFrame:
+    """
+    Returns the `PERCENTILES` and count of the operations of every group of
+    rows with the same values of `by`, e.g. of all threads, execution units
+    and repeats of a grid point.
+    """
+    merged = merge_histograms(df, column, by)
+    counts = merged.to_numpy()
+    percentiles = DataFrame(
+        get_percentiles(counts, list(PERCENTILES.values())),
+        columns=list(PERCENTILES),
+        index=merged.index.set_names(by),
+    )
+    percentiles.insert(0, "count", counts.sum(axis=1))
+    return percentiles.reset_index()
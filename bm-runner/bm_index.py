@@ -0,0 +1,296 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import argparse
+import datetime
+import glob
+import json
+import os
+import sqlite3
+import sys
+from typing import Any, Optional
+import pandas as pd
+from pandas import DataFrame
+from bm_cache import get_config_fingerprint, hash_file, hash_str
+from bm_store import load_results
+from utils.logger import bm_log, LogType
+
+# relative to bm-runner, as the results of the campaigns
+DEFAULT_DB = os.path.join("../results", "index.db")
+SYS_CONFIG_DIR = "sys-config"
+
+# columns of the results that identify a row, all other numeric columns are metrics
+POINT_KEYS = {
+    "execution_type": "TEXT",
+    "container_cnt": "INTEGER",
+    "nb_threads": "TEXT",
+    "noise": "INTEGER",
+    "initial_size": "INTEGER",
+    "rep": "INTEGER",
+    "execution_unit": "TEXT",
+    "app": "TEXT",
+}
+CAMPAIGN_KEYS = ["name", "path", "started", "hostname", "kernel", "image"]
+CAMPAIGN_KEYS += ["config_fingerprint", "sys_config_hash"]
+AGGREGATES = ["avg", "min", "max", "sum", "count"]
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS campaigns (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    name TEXT,
+    started TEXT,
+    hostname TEXT,
+    kernel TEXT,
+    image TEXT,
+    config_fingerprint TEXT,
+    sys_config_hash TEXT,
+    csv_mtime REAL,
+    csv_size INTEGER
+);
+CREATE TABLE IF NOT EXISTS sys_config (
+    campaign_id INTEGER REFERENCES campaigns(id) ON DELETE CASCADE,
+    file TEXT,
+    hash TEXT,
+    PRIMARY KEY (campaign_id, file)
+);
+CREATE TABLE IF NOT EXISTS points (
+    campaign_id INTEGER REFERENCES campaigns(id) ON DELETE CASCADE,
+    row INTEGER,
+    {", ".join(f"{k} {t}" for k, t in POINT_KEYS.items())},
+    PRIMARY KEY (campaign_id, row)
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    campaign_id INTEGER REFERENCES campaigns(id) ON DELETE CASCADE,
+    row INTEGER,
+    name TEXT,
+    value REAL,
+    PRIMARY KEY (name, campaign_id, row)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS campaigns_started ON campaigns(started);
+CREATE INDEX IF NOT EXISTS metrics_campaign ON metrics(campaign_id);
+"""
+
+
+def find_campaigns(results_dir: str) -> list[str]:
+    """
+    Returns the output dirs of the campaigns under `results_dir`, i.e. the
+    dirs that have a CSV of results with the same name next to them.
+    """
+    csv_files = glob.glob(os.path.join(results_dir, "**", "*.csv"), recursive=True)
+    return sorted(f[: -len(".csv")] for f in csv_files if os.path.isdir(f[: -len(".csv")]))
+
+
+def read_text(path: str) -> Optional[str]:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+class ResultIndex:
+    """
+    SQLite index of the results of all campaigns, with the fingerprint of
+    their configuration, their host and system configuration, and every
+    metric of every row of their results.
+    """
+
+    def __init__(self, db: str = DEFAULT_DB):
+        os.makedirs(os.path.dirname(os.path.abspath(db)), exist_ok=True)
+        self.db = db
+        self.conn = sqlite3.connect(db)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def ingest(self, results_dir: str) -> int:
+        """
+        Indexes the campaigns under `results_dir` that are new or changed
+        since they were indexed, returns their number.
+        """
+        count = sum(self.ingest_campaign(path) for path in find_campaigns(results_dir))
+        bm_log(f"{count} campaigns of {results_dir} indexed in {self.db}", LogType.INFO)
+        return count
+
+    def ingest_campaign(self, output_dir: Any) -> bool:
+        path = os.path.abspath(output_dir)
+        csv_file = f"{path}.csv"
+        stat = os.stat(csv_file)
+        row = self.conn.execute(
+            "SELECT csv_mtime, csv_size FROM campaigns WHERE path = ?", (path,)
+        ).fetchone()
+        if row is not None and tuple(row) == (stat.st_mtime, stat.st_size):
+            return False
+        df = load_results(path)
+        with self.conn:
+            self.conn.execute("DELETE FROM campaigns WHERE path = ?", (path,))
+            campaign_id = self.__insert_campaign(path, df, stat)
+            self.__insert_rows(campaign_id, df)
+        return True
+
+    def __insert_campaign(self, path: str, df: DataFrame, stat: os.stat_result) -> int:
+        sys_config_dir = os.path.join(path, SYS_CONFIG_DIR)
+        files = sorted(glob.glob(os.path.join(sys_config_dir, "**", "*"), recursive=True))
+        hashes = {
+            os.path.relpath(f, sys_config_dir): hash_file(f) for f in files if os.path.isfile(f)
+        }
+        uname = (read_text(os.path.join(sys_config_dir, "uname.txt")) or "").split()
+        hostname = read_text(os.path.join(sys_config_dir, "hostname.txt"))
+        if hostname is None and "hostname" in df.columns and len(df) > 0:
+            hostname = str(df["hostname"].iloc[0])
+        config: dict[str, Any] = {}
+        if os.path.exists(f"{path}.json"):
+            with open(f"{path}.json") as f:
+                config = json.load(f)
+        image = config.get("containers", {}).get("image")
+        started = datetime.datetime.fromtimestamp(stat.st_mtime).isoformat(timespec="seconds")
+        cursor = self.conn.execute(
+            "INSERT INTO campaigns (path, name, started, hostname, kernel, image,"
+            " config_fingerprint, sys_config_hash, csv_mtime, csv_size)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                path,
+                os.path.basename(path),
+                started,
+                hostname,
+                uname[2] if len(uname) > 2 else None,
+                image,
+                get_config_fingerprint(config) if config else None,
+                hash_str(json.dumps(hashes, sort_keys=True)) if hashes else None,
+                stat.st_mtime,
+                stat.st_size,
+            ),
+        )
+        campaign_id = cursor.lastrowid
+        assert campaign_id is not None
+        self.conn.executemany(
+            "INSERT INTO sys_config VALUES (?, ?, ?)",
+            [(campaign_id, f, h) for f, h in hashes.items()],
+        )
+        return campaign_id
+
+    def __insert_rows(self, campaign_id: int, df: DataFrame):
+        keys = [k for k in POINT_KEYS if k in df.columns]
+        points = df[keys].astype(object).where(df[keys].notna(), None)
+        columns = ["campaign_id", "row", *keys]
+        self.conn.executemany(
+            f"INSERT INTO points ({', '.join(columns)}) VALUES ({', '.join(['?'] * len(columns))})",
+            [(campaign_id, i, *values) for i, values in enumerate(points.itertuples(index=False))],
+        )
+        metrics = df.select_dtypes("number").drop(columns=keys, errors="ignore")
+        # one row per cell, the long layout lets any metric be queried the same way
+        long = metrics.reset_index(names="row").melt(id_vars="row").dropna()
+        self.conn.executemany(
+            "INSERT INTO metrics VALUES (?, ?, ?, ?)",
+            zip(
+                [campaign_id] * len(long),
+                long["row"].tolist(),
+                long["variable"].tolist(),
+                long["value"].astype(float).tolist(),
+            ),
+        )
+
+    def metrics(self) -> list[str]:
+        return [r[0] for r in self.conn.execute("SELECT DISTINCT name FROM metrics ORDER BY name")]
+
+    def query(
+        self,
+        metric: str,
+        where: Optional[dict[str, Any]] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        by: Optional[list[str]] = None,
+        agg: Optional[str] = None,
+    ) -> DataFrame:
+        """
+        Returns the values of `metric` for the rows matching `where`, of the
+        campaigns started between `since` and `until` (ISO dates), either one
+        row per result, or aggregated with `agg` over the columns `by`.
+        """
+        columns = {k: f"c.{k}" for k in CAMPAIGN_KEYS} | {k: f"p.{k}" for k in POINT_KEYS}
+        for key in [*(where or {}), *(by or [])]:
+            if key not in columns:
+                bm_log(f"Unknown column `{key}`, use one of {list(columns)}", LogType.FATAL)
+                sys.exit(1)
+        if agg is not None and agg not in AGGREGATES:
+            bm_log(f"Unknown aggregate `{agg}`, use one of {AGGREGATES}", LogType.FATAL)
+            sys.exit(1)
+        conditions = ["m.name = ?"]
+        params: list[Any] = [metric]
+        for key, value in (where or {}).items():
+            conditions.append(f"{columns[key]} = ?")
+            params.append(value)
+        if since is not None:
+            conditions.append("c.started >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("c.started < ?")
+            params.append(until)
+        if agg is not None:
+            selected = [f"{columns[k]} AS {k}" for k in by or []]
+            selected += [f"{agg.upper()}(m.value) AS {agg}", "COUNT(*) AS samples"]
+        else:
+            selected = [f"{v} AS {k}" for k, v in columns.items()] + ["m.value AS value"]
+        sql = (
+            f"SELECT {', '.join(selected)} FROM metrics m"
+            " JOIN points p ON p.campaign_id = m.campaign_id AND p.row = m.row"
+            " JOIN campaigns c ON c.id = m.campaign_id"
+            f" WHERE {' AND '.join(conditions)}"
+        )
+        if agg is not None and by:
+            group = ", ".join(columns[k] for k in by)
+            sql += f" GROUP BY {group} ORDER BY {group}"
+        return pd.read_sql_query(sql, self.conn, params=params)
+
+
+def parse_where(values: list[str]) -> dict[str, str]:
+    where = {}
+    for value in values:
+        key, sep, val = value.partition("=")
+        if not sep:
+            bm_log(f"`--where {value}` must be `<column>=<value>`", LogType.FATAL)
+            sys.exit(1)
+        where[key] = val
+    return where
+
+
+###########################################################################
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Index of the results of CSB campaigns")
+    parser.add_argument("--db", help="Path to the SQLite index.", default=DEFAULT_DB)
+    commands = parser.add_subparsers(dest="command", required=True)
+    ingest = commands.add_parser("ingest", help="Index the new or changed campaigns.")
+    ingest.add_argument("results_dir", nargs="?", default="../results")
+    query = commands.add_parser("query", help="Print the values of a metric.")
+    query.add_argument("--metric", help="Metric to query, lists them when omitted.")
+    query.add_argument(
+        "--where", help="Filter as <column>=<value>, repeatable.", action="append", default=[]
+    )
+    query.add_argument("--since", help="Campaigns started from this ISO date.")
+    query.add_argument("--until", help="Campaigns started before this ISO date.")
+    query.add_argument("--by", help="Comma separated columns to aggregate by.", default="")
+    query.add_argument("--agg", help="Aggregate of the values.", choices=AGGREGATES)
+    query.add_argument("--csv", help="Export the result to this CSV file.")
+    args = parser.parse_args()
+
+    index = ResultIndex(args.db)
+    if args.command == "ingest":
+        index.ingest(args.results_dir)
+    elif args.metric is None:
+        print("\n".join(index.metrics()))
+    else:
+        result = index.query(
+            args.metric,
+            where=parse_where(args.where),
+            since=args.since,
+            until=args.until,
+            by=[k for k in args.by.split(",") if k],
+            agg=args.agg,
+        )
+        if args.csv:
+            result.to_csv(args.csv, sep=";", index=False)
+        print(result.to_string(index=False))
+    index.close()
@@ -0,0 +1,238 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import json
+from typing import Any, Iterable, Optional
+import numpy as np
+from bm_histogram import NUM_BUCKETS, get_percentile_columns, split_histograms
+
+HISTOGRAM_SUFFIX = "_histogram"
+
+# columns that are kept as strings, even when their values look like numbers
+DEFAULT_SCHEMA: dict[str, type] = {
+    "execution_unit": str,
+    "app": str,
+    "algo_name": str,
+    "placement": str,
+    "cpus": str,
+    "numa_nodes": str,
+}
+
+
+def parse_output_line(line: str) -> dict[str, str]:
+    """
+    Returns the `key=val;` pairs of an output line of the runner as a dict.
+    """
+    line = line.strip()
+    if line.endswith(";"):
+        line = line[:-1]
+    return {v[0]: v[1] for v in [x.split("=", maxsplit=1) for x in line.split(";")]}
+
+
+def decode_result_line(line: str) -> str | dict[str, Any]:
+    """
+    Returns the structured results of a builtin benchmark, which the runner
+    writes as a JSON record, as a dict and any other line as is.
+    """
+    return json.loads(line) if line.startswith("{") else line
+
+
+def read_result_line(line: str) -> dict[str, Any]:
+    """
+    Returns the results of an output line of the runner, either a JSON
+    record or `key=val;` pairs.
+    """
+    result = decode_result_line(line.strip())
+    return result if isinstance(result, dict) else parse_output_line(result)
+
+
+def tag_result_line(line: str, tags: dict[str, Any]) -> str:
+    """
+    Returns the output line with the `tags` added in front of its results.
+    """
+    result = decode_result_line(line)
+    if isinstance(result, dict):
+        return json.dumps({**tags, **result})
+    return "".join(f"{k}={'' if v is None else v};" for k, v in tags.items()) + line
+
+
+def join_histogram(histogram: list[int]) -> str:
+    return ",".join(map(str, histogram))
+
+
+def flatten_records(records: list[dict[str, Any]]) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """
+    Returns the results of the structured output of a builtin benchmark
+    with the keys and in the order of its text output, and the stats of its
+    intervals.
+    """
+    params: dict[str, Any] = {}
+    ops: dict[str, Any] = {}
+    summary: dict[str, Any] = {}
+    calibration: dict[str, Any] = {}
+    intervals = []
+    for record in records:
+        record = dict(record)
+        match record.pop("type", None):
+            case "params":
+                op_dist = record.pop("op_dist", [])
+                params = record | {f"op{i}_dist": v for i, v in enumerate(op_dist)}
+            case "summary":
+                summary = record
+            case "op":
+                name = record["name"]
+                count = record["count"]
+                for stat in ["max", "min", "sum", "count", "succ_count", "skipped_count"]:
+                    ops[f"{name}_{stat}"] = record[stat]
+                ops[f"{name}_avg"] = round(record["sum"] / count, 2) if count else 0.0
+                ops[f"{name}_succ_percent"] = (
+                    round(record["succ_count"] * 100 / count, 2) if count else 0.0
+                )
+                ops[f"{name}_histogram"] = join_histogram(record["histogram"])
+            case "calibration":
+                calibration = record
+            case "interval":
+                record["histogram"] = join_histogram(record["histogram"])
+                intervals.append(record)
+    results = dict(params)
+    if "algo_name" in summary:
+        results["algo_name"] = summary.pop("algo_name")
+    extra_info = summary.pop("extra_info", "")
+    if extra_info:
+        results |= parse_output_line(extra_info)
+    # the usage of the process comes last
+    usage = {k: summary.pop(k) for k in ["sys_time", "usr_time", "max_rss_kb"] if k in summary}
+    results |= ops | summary | calibration | usage
+    return results, intervals
+
+
+def load_records(path: str) -> list[dict[str, Any]]:
+    """
+    Returns the structured records saved along the results of a run.
+    """
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip() != ""]
+
+
+def convert_column(values: np.ndarray, type: Optional[type] = None) -> np.ndarray:
+    """
+    Converts a column of strings at once, to the given type or else to the
+    narrowest of int, float and str that fits all its values. The values of
+    structured output already have their type, which is kept.
+    """
+    typed = values.size > 0 and not isinstance(values[0], str)
+    if type is str:
+        return values.astype(str).astype(object) if typed else values
+    if type is not None:
+        return values.astype(np.int64 if type is int else np.float64)
+    if typed:
+        return np.array(values.tolist())
+    for dtype in (np.int64, np.float64):
+        try:
+            return values.astype(dtype)
+        except (ValueError, OverflowError):
+            pass
+    return values
+
+
+class OutputTable:
+    """
+    Typed columns of the output lines that have the same keys in the same
+    order, e.g. the execution units of an application.
+    """
+
+    def __init__(self, rows: list[int], keys: list[str], values: np.ndarray, schema: dict):
+        # index of the lines of the table in the output
+        self.rows = rows
+        self.keys = keys
+        self.columns: dict[str, np.ndarray] = {}
+        # bucket counts of the `*_histogram` columns, one row per line
+        self.histograms: dict[str, np.ndarray] = {}
+        for i, key in enumerate(keys):
+            if key.endswith(HISTOGRAM_SUFFIX):
+                # the text is kept for the CSV, no need to join the buckets again
+                self.columns[key] = values[:, i]
+                self.histograms[key] = split_histograms(values[:, i])
+            else:
+                self.columns[key] = convert_column(values[:, i], schema.get(key))
+        # percentiles of the histograms of builtin benchmarks, after their histogram
+        for key, counts in self.histograms.items():
+            if counts.shape[1] == NUM_BUCKETS:
+                percentiles = get_percentile_columns(key.removesuffix(HISTOGRAM_SUFFIX), counts)
+                self.columns |= {k: v.round(2) for k, v in percentiles.items()}
+                idx = self.keys.index(key) + 1
+                self.keys = self.keys[:idx] + list(percentiles) + self.keys[idx:]
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def to_records(self) -> list[dict[str, Any]]:
+        # `tolist` converts numpy values into python ones
+        columns = [self.columns[key].tolist() for key in self.keys]
+        return [dict(zip(self.keys, values)) for values in zip(*columns)]
+
+
+class OutputParser:
+    """
+    Parses the `key=val;` lines of a run into typed columns. The lines with
+    the same keys are parsed together, and every column is converted once
+    with the type declared in the schema or an inferred one. Structured
+    results are given as dicts instead of lines.
+    """
+
+    def __init__(self, schema: Optional[dict[str, type]] = None):
+        self.schema = {**DEFAULT_SCHEMA, **(schema or {})}
+
+    def parse(self, lines: Iterable[str | dict[str, Any]]) -> list[OutputTable]:
+        rows, fields = [], []
+        # structured results, grouped apart from the text lines
+        groups: dict[tuple[bool, tuple[str, ...]], tuple[list[int], list[list[Any]]]] = {}
+        for idx, line in enumerate(lines):
+            if isinstance(line, dict):
+                group_rows, values = groups.setdefault((True, tuple(line)), ([], []))
+                group_rows.append(idx)
+                values.append(list(line.values()))
+                continue
+            line = line.strip().removesuffix(";")
+            if line != "":
+                rows.append(idx)
+                fields.append(line)
+        table = self.__parse_uniform(rows, fields) if fields and not groups else None
+        if table is not None:
+            return [table]
+        for idx, line in zip(rows, fields):
+            pairs = [x.split("=", maxsplit=1) for x in line.split(";")]
+            keys = tuple(p[0] for p in pairs)
+            group_rows, values = groups.setdefault((False, keys), ([], []))
+            group_rows.append(idx)
+            values.append([p[1] if len(p) > 1 else "" for p in pairs])
+        return [
+            OutputTable(group_rows, list(keys), np.array(values, dtype=object), self.schema)
+            for (_, keys), (group_rows, values) in groups.items()
+        ]
+
+    def __parse_uniform(self, rows: list[int], lines: list[str]) -> Optional[OutputTable]:
+        # common case where all lines have the same keys: the whole output is
+        # split at once into alternating keys and values
+        n_fields = lines[0].count(";") + 1
+        if any(line.count(";") + 1 != n_fields for line in lines):
+            return None
+        text = ";".join(lines)
+        if text.count("=") != n_fields * len(lines):
+            return None
+        flat = text.replace("=", ";").split(";")
+        keys = flat[0 : 2 * n_fields : 2]
+        if flat[0::2] != keys * len(lines):
+            return None
+        values = np.array(flat[1::2], dtype=object).reshape(len(lines), n_fields)
+        return OutputTable(rows, keys, values, self.schema)
+
+    def parse_records(self, lines: Iterable[str | dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Returns a typed dict per non-empty line or dict, in the order of the lines.
+        """
+        tables = self.parse(lines)
+        if len(tables) == 1:
+            return tables[0].to_records()
+        records = [(row, record) for t in tables for row, record in zip(t.rows, t.to_records())]
+        return [record for _, record in sorted(records, key=lambda r: r[0])]
@@ -0,0 +1,230 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import copy
+import os
+from typing import Optional
+from bm_utils import parse_cpu_set
+from config.container import CpuOrder, PlacementStrategy
+from utils.logger import bm_log, LogType
+
+SYSFS_DIR = "/sys/devices/system"
+
+
+class Cpu:
+    def __init__(self, id: int, package: int, core: int, node: int, llc: int):
+        self.id = id
+        self.package = package
+        # physical core, shared by SMT siblings
+        self.core = core
+        self.node = node
+        # first cpu of the last level cache domain
+        self.llc = llc
+
+
+class CpuTopology:
+    """
+    Online cpus of the machine with their NUMA node, physical core and last
+    level cache, as exposed by sysfs.
+    """
+
+    def __init__(self, sysfs_dir: str = SYSFS_DIR):
+        self.sysfs_dir = sysfs_dir
+        online = self.__read(f"{sysfs_dir}/cpu/online")
+        ids = sorted(parse_cpu_set(online)) if online else list(range(os.cpu_count() or 1))
+        nodes = self.__read_nodes()
+        self.cpus = [self.__read_cpu(id, nodes.get(id, 0)) for id in ids]
+
+    @staticmethod
+    def __read(path: str) -> Optional[str]:
+        try:
+            with open(path) as f:
+                return f.read().strip()
+        except OSError:
+            return None
+
+    def __read_nodes(self) -> dict[int, int]:
+        nodes = {}
+        node_dir = f"{self.sysfs_dir}/node"
+        if not os.path.isdir(node_dir):
+            return nodes
+        for entry in os.listdir(node_dir):
+            if not entry.startswith("node") or not entry[4:].isdigit():
+                continue
+            cpulist = self.__read(f"{node_dir}/{entry}/cpulist")
+            for cpu in parse_cpu_set(cpulist) if cpulist else []:
+                nodes[cpu] = int(entry[4:])
+        return nodes
+
+    def __read_llc(self, cpu_dir: str, id: int) -> int:
+        llc, llc_level = id, 0
+        cache_dir = f"{cpu_dir}/cache"
+        if not os.path.isdir(cache_dir):
+            return llc
+        for entry in os.listdir(cache_dir):
+            level = self.__read(f"{cache_dir}/{entry}/level")
+            shared = self.__read(f"{cache_dir}/{entry}/shared_cpu_list")
+            if level is None or not shared or int(level) <= llc_level:
+                continue
+            llc, llc_level = min(parse_cpu_set(shared)), int(level)
+        return llc
+
+    def __read_cpu(self, id: int, node: int) -> Cpu:
+        cpu_dir = f"{self.sysfs_dir}/cpu/cpu{id}"
+        package = self.__read(f"{cpu_dir}/topology/physical_package_id")
+        siblings = self.__read(f"{cpu_dir}/topology/thread_siblings_list")
+        return Cpu(
+            id=id,
+            package=int(package) if package else 0,
+            core=min(parse_cpu_set(siblings)) if siblings else id,
+            node=node,
+            llc=self.__read_llc(cpu_dir, id),
+        )
+
+    def partition(self, sizes: list[int]) -> list["CpuTopology"]:
+        """
+        Splits the cpus into disjoint topologies of the given sizes. The cpus
+        are taken in topology order, so that a part spans as few NUMA nodes
+        and LLCs as possible.
+        """
+        assert sum(sizes) <= len(self.cpus), "[BUG] not enough cpus to partition"
+        cpus = sorted(self.cpus, key=lambda cpu: (cpu.node, cpu.package, cpu.llc, cpu.core, cpu.id))
+        parts = []
+        for size in sizes:
+            part = copy.copy(self)
+            part.cpus = sorted(cpus[:size], key=lambda cpu: cpu.id)
+            cpus = cpus[size:]
+            parts.append(part)
+        return parts
+
+
+class UnitPlacement:
+    def __init__(self, strategy: PlacementStrategy, cpus: list[Cpu]):
+        self.strategy = strategy
+        self.cpus = cpus
+
+    def get_cpu_set(self) -> str:
+        return ",".join(str(cpu.id) for cpu in self.cpus)
+
+    def get_nodes(self) -> str:
+        return ",".join(str(node) for node in sorted({cpu.node for cpu in self.cpus}))
+
+    def get_output(self) -> str:
+        return f"placement={self.strategy.value};cpus={self.get_cpu_set()};numa_nodes={self.get_nodes()};"
+
+
+class PlacementPlanner:
+    """
+    Assigns cpus to execution units following a placement strategy.
+    Units only share cpus when there are not enough cpus for all of them,
+    in which case a warning is logged.
+    """
+
+    def __init__(self, topology: CpuTopology, order: CpuOrder = CpuOrder.ASC):
+        self.topology = topology
+        self.order = order
+
+    def __ordered(self, cpus: list[Cpu], key) -> list[Cpu]:
+        return sorted(cpus, key=key, reverse=self.order == CpuOrder.DESC)
+
+    @staticmethod
+    def __compact_key(cpu: Cpu):
+        # SMT siblings are next to each other, then cores of the same LLC and node
+        return (cpu.node, cpu.package, cpu.llc, cpu.core, cpu.id)
+
+    @staticmethod
+    def __take(cpus: list[Cpu], start: int, count: int) -> list[Cpu]:
+        return [cpus[(start + i) % len(cpus)] for i in range(count)]
+
+    def __warn_overlap(self, count: int, core_count: int):
+        total = len(self.topology.cpus)
+        if count * core_count > total:
+            bm_log(
+                f"{count} units of {core_count} cores do not fit on {total} cpus, some units share cpus!",
+                LogType.WARNING,
+            )
+
+    def __linear(self, offsets: list[int], count: int, core_count: int) -> list[list[Cpu]]:
+        cpus = self.__ordered(self.topology.cpus, key=lambda cpu: cpu.id)
+        if any(offset + core_count > len(cpus) for offset in offsets[:count]):
+            bm_log(
+                "core affinity offsets exceed the number of cpus, wrapping around", LogType.WARNING
+            )
+        return [self.__take(cpus, offsets[i], core_count) for i in range(count)]
+
+    def __compact(self, count: int, core_count: int) -> list[list[Cpu]]:
+        cpus = self.__ordered(self.topology.cpus, key=self.__compact_key)
+        return [self.__take(cpus, i * core_count, core_count) for i in range(count)]
+
+    def __no_smt(self, count: int, core_count: int) -> list[list[Cpu]]:
+        # one thread per physical core first, the siblings only when needed
+        cpus = self.__ordered(self.topology.cpus, key=self.__compact_key)
+        first_threads = {}
+        for cpu in cpus:
+            first_threads.setdefault((cpu.package, cpu.core), cpu)
+        primary = list(first_threads.values())
+        cpus = primary + [cpu for cpu in cpus if cpu not in primary]
+        return [self.__take(cpus, i * core_count, core_count) for i in range(count)]
+
+    def __by_domain(self, domain_of) -> list[list[Cpu]]:
+        domains: dict[int, list[Cpu]] = {}
+        for cpu in self.__ordered(self.topology.cpus, key=self.__compact_key):
+            domains.setdefault(domain_of(cpu), []).append(cpu)
+        return list(domains.values())
+
+    def __spread(self, count: int, core_count: int) -> list[list[Cpu]]:
+        # round robin over the NUMA nodes, compact within a node
+        nodes = self.__by_domain(lambda cpu: cpu.node)
+        used = [0] * len(nodes)
+        units = []
+        for i in range(count):
+            # skip the nodes that are already full
+            candidates = [(i + j) % len(nodes) for j in range(len(nodes))]
+            fitting = [n for n in candidates if used[n] + core_count <= len(nodes[n])]
+            n = fitting[0] if fitting else candidates[0]
+            units.append(self.__take(nodes[n], used[n], core_count))
+            used[n] += core_count
+        return units
+
+    def __llc_aligned(self, count: int, core_count: int) -> list[list[Cpu]]:
+        # a unit gets cpus of a single LLC domain whenever one has enough free cpus
+        domains = self.__by_domain(lambda cpu: cpu.llc)
+        free = [list(domain) for domain in domains]
+        units = []
+        for _ in range(count):
+            if sum(len(domain) for domain in free) < core_count:
+                # all cpus are taken, the next units overlap the first ones
+                free = [list(domain) for domain in domains]
+            fitting = [domain for domain in free if len(domain) >= core_count]
+            # otherwise the unit spans the domains with the most free cpus
+            candidates = fitting[:1] or sorted(free, key=len, reverse=True)
+            unit = [cpu for domain in candidates for cpu in domain][:core_count]
+            units.append(unit)
+            free = [[cpu for cpu in domain if cpu not in unit] for domain in free]
+        return units
+
+    def plan(
+        self,
+        strategy: PlacementStrategy,
+        count: int,
+        core_count: int,
+        offsets: Optional[list[int]] = None,
+    ) -> list[UnitPlacement]:
+        core_count = min(core_count, len(self.topology.cpus))
+        self.__warn_overlap(count, core_count)
+        match strategy:
+            case PlacementStrategy.LINEAR:
+                offsets = offsets or [core_count * i for i in range(count)]
+                units = self.__linear(offsets, count, core_count)
+            case PlacementStrategy.COMPACT:
+                units = self.__compact(count, core_count)
+            case PlacementStrategy.SPREAD:
+                units = self.__spread(count, core_count)
+            case PlacementStrategy.NO_SMT:
+                units = self.__no_smt(count, core_count)
+            case PlacementStrategy.LLC:
+                units = self.__llc_aligned(count, core_count)
+        placements = [UnitPlacement(strategy, cpus) for cpus in units]
+        for idx, placement in enumerate(placements):
+            bm_log(f"unit {idx} placed on cpus {placement.get_cpu_set()} ({strategy.value})")
+        return placements
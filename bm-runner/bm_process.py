@@ -2,59 +2,131 @@
 # SPDX-License-Identifier: MIT
 
 import os
+import re
+import select
+import shlex
+import subprocess
 import sys
+import time
 import bm_utils
-import subprocess
+from typing import Optional
 from bm_executer import Executer
 from bm_executer import ExecutionUnit
+from bm_placement import UnitPlacement
 from bm_utils import stop_process
 from bm_config import Application
 from config.benchmark import ExecutionType
 from utils.logger import bm_log, LogType
+from utils.trace import Tracer, g_tracer
 from bm_utils import resolve_path
 
+# characters that only a shell can interpret
+SHELL_SYNTAX = re.compile(r"[$`*?~]")
+# environment assignment in front of a command e.g. `VAR=val cmd`
+ASSIGNMENT = re.compile(r"[A-Za-z_][A-Za-z0-9_]*=.*")
+# exit code of bash when the command cannot be found or executed
+EXIT_NOT_FOUND = 127
+
+
+def split_command(command: str) -> list[str]:
+    """
+    Returns the argument vector of the command. Commands that rely on shell
+    features (pipes, redirections, variables, globs, assignments...) are run by bash.
+    """
+    lexer = shlex.shlex(command, posix=True, punctuation_chars=True)
+    lexer.whitespace_split = True
+    argv = list(lexer)
+    if (
+        SHELL_SYNTAX.search(command)
+        or (argv and ASSIGNMENT.fullmatch(argv[0]))
+        or any(set(arg) <= set(lexer.punctuation_chars) for arg in argv)
+    ):
+        return ["bash", "-c", command]
+    return argv
+
 
 class Process(ExecutionUnit):
-    def __init__(self, idx, home_dir, record_data_dir, core_set, app: Application):
-        super().__init__(idx=idx, home_dir=home_dir, app=app, type=ExecutionType.NATIVE)
+    def __init__(
+        self,
+        idx,
+        home_dir,
+        record_data_dir,
+        core_set,
+        app: Application,
+        shard: Optional[int] = None,
+    ):
+        super().__init__(
+            idx=idx, home_dir=home_dir, app=app, type=ExecutionType.NATIVE, shard=shard
+        )
         self.record_data_dir = record_data_dir
         self.core_set = core_set
+        self.proc: Optional[subprocess.Popen] = None
+        self.pid: Optional[int] = None
+        self.exit_code: Optional[int] = None
 
     def get_results_dir(self) -> str:
         return str(resolve_path(self.record_data_dir, use_in_container=False))
 
+    def get_error_file(self) -> str:
+        return f"{self.output_file}.err"
+
     def exec(self, command):
-        change_dir = ""
+        cwd = os.path.abspath(self.home_dir)
         if self.app.cd:
             assert self.app.path is not None, "path is not set while change directory is requested!"
-            change_dir = f" cd {self.app.path} && "
-        commands = (
-            f"{self.CMD_WHILE_NOT_START}{change_dir}taskset --cpu-list {self.core_set} {command}"
-        )
-        with open(resolve_path(self.output_file), "w") as outfile:
-            self.process = subprocess.Popen(
-                commands,
-                shell=True,
+            cwd = os.path.join(cwd, self.app.path)
+        argv = split_command(command)
+        # The unit is spawned without running any python in the child: a bash
+        # wrapper waits on the barrier and then execs the benchmark's argv.
+        wrapper = f'{self.get_start_cmd(use_in_container=False)} exec "$@"'
+        with (
+            open(resolve_path(self.output_file), "w") as outfile,
+            open(resolve_path(self.get_error_file()), "w") as errfile,
+        ):
+            self.proc = subprocess.Popen(
+                ["bash", "-c", wrapper, self.name, *argv],
+                cwd=cwd,
+                stdin=subprocess.DEVNULL,
                 stdout=outfile,
-                stderr=subprocess.DEVNULL,
-                preexec_fn=os.setpgrp,
-                cwd=self.home_dir,
+                stderr=errfile,
+                process_group=0,
             )
-        bm_log(f"launched process {self.name} with {commands}")
+        self.pid = self.proc.pid
+        self.exit_code = None
+        # the wrapper is held on the barrier, the benchmark inherits its affinity
+        os.sched_setaffinity(self.pid, bm_utils.parse_cpu_set(self.core_set))
+        bm_log(f"launched process {self.name} on cores {self.core_set} with {argv}")
         return True
 
-    def wait(self):
-        self.process.wait()
-        if self.process.returncode != 0:
+    def get_errors(self) -> str:
+        try:
+            with open(resolve_path(self.get_error_file())) as f:
+                return f.read().strip()
+        except OSError:
+            return ""
+
+    def set_finished(self, exit_code: int, finish_time: float):
+        self.finish_time = finish_time
+        self.exit_code = exit_code
+        if self.exit_code != 0:
+            reason = " (command not found)" if exit_code == EXIT_NOT_FOUND else ""
+            errors = self.get_errors()
             bm_log(
-                f"process {self.name} has failed/or crashed with return code {self.process.returncode}",
+                f"process {self.name} has failed/or crashed with return code {self.exit_code}"
+                f"{reason}" + (f":\n{errors}" if errors else ""),
                 LogType.FATAL,
             )
             sys.exit(1)
 
+    def wait(self):
+        assert self.proc is not None
+        self.set_finished(self.proc.wait(), time.time())
+
     def stop(self):
-        if self.process is not None:
-            stop_process(self.process.pid)
+        if self.proc is not None and self.exit_code is None:
+            stop_process(self.proc.pid)
+            self.proc.wait()
+            self.exit_code = -1
 
 
 class Processes(Executer):
@@ -63,21 +135,42 @@ class Processes(Executer):
         home_dir,
         count,
         record_data_dir,
-        cpus_per_proc,
-        core_affinity_offset_list,
+        placements: list[UnitPlacement],
         apps: list[Application],
+        shard: Optional[int] = None,
+        tracer: Tracer = g_tracer,
     ):
-        super().__init__(home_dir=home_dir, results_dir=record_data_dir)
+        super().__init__(home_dir=home_dir, results_dir=record_data_dir, shard=shard, tracer=tracer)
         assert len(apps) == count, "[BUG] Application list length must be equal to count"
         for i in range(count):
-            core_set = bm_utils.get_cpu_set(
-                start=core_affinity_offset_list[i], core_cnt=cpus_per_proc
-            )
             proc = Process(
                 idx=i,
                 home_dir=home_dir,
-                core_set=core_set,
+                core_set=placements[i].get_cpu_set(),
                 record_data_dir=record_data_dir,
                 app=apps[i],
+                shard=shard,
             )
+            proc.placement = placements[i]
             self.add_exec_unit(proc)
+
+    def wait_all(self):
+        """
+        Waits on a pidfd per process, so that processes are reaped in the order
+        they finish and a failure is noticed right away.
+        """
+        pending = {}
+        for eu in self.exec_units:
+            if eu.pid is not None:
+                pending[os.pidfd_open(eu.pid)] = eu
+        try:
+            while pending:
+                readable, _, _ = select.select(list(pending), [], [])
+                finish_time = time.time()
+                for fd in readable:
+                    eu = pending.pop(fd)
+                    os.close(fd)
+                    eu.set_finished(eu.proc.wait(), finish_time)
+        finally:
+            for fd in pending:
+                os.close(fd)
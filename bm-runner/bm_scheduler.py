@@ -0,0 +1,242 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import itertools
+import json
+import os
+from enum import Enum
+from typing import Any, Callable, Iterable, Optional
+from config.benchmark import SchedulePolicy
+from utils.logger import bm_log, LogType
+
+# variables whose change between two consecutive points tears down or
+# creates execution units, from the most to the least expensive
+ENV_VARIABLES = ["execution_type", "container_cnt"]
+# cost assumed for a point without any observation: the duration of the
+# benchmark plus the setup of the units
+DEFAULT_OVERHEAD_S = 5.0
+DEFAULT_UNIT_OVERHEAD_S = 0.5
+
+
+def to_json_value(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (list, tuple)):
+        return [to_json_value(v) for v in value]
+    return value
+
+
+def get_point_key(point: dict[str, Any]) -> str:
+    """
+    Returns a stable identifier of a point of the campaign.
+    """
+    return json.dumps({k: to_json_value(v) for k, v in sorted(point.items())})
+
+
+def count_switches(points: list[dict[str, Any]], names: Iterable[str]) -> int:
+    """
+    Returns how often one of the variables changes between consecutive points.
+    """
+    names = list(names)
+    return sum(
+        any(prev.get(n) != cur.get(n) for n in names) for prev, cur in zip(points, points[1:])
+    )
+
+
+class CostModel:
+    """
+    Observed cost in seconds of the points of previous campaigns, persisted
+    as JSON. The points are keyed along with the fingerprint of the
+    configuration they ran with, as the same point of another benchmark has
+    another cost. Points that were never observed are estimated with a linear
+    fit of the overhead on the number of units, per configuration and
+    execution type.
+    """
+
+    # weight of the newest observation of a point
+    ALPHA = 0.5
+
+    def __init__(self, path: Optional[str] = None, config: Optional[str] = None):
+        self.path = path
+        # fingerprint of the configuration of the campaign
+        self.config = config
+        self.points: dict[str, dict[str, float]] = {}
+        if path is not None and os.path.isfile(path):
+            try:
+                with open(path) as f:
+                    self.points = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                bm_log(f"Ignoring the cost model {path}: {e}", LogType.WARNING)
+
+    def __get_key(self, point: dict[str, Any], duration: int) -> str:
+        return get_point_key({**point, "duration": duration, "config": self.config})
+
+    def observe(self, point: dict[str, Any], duration: int, seconds: float):
+        key = self.__get_key(point, duration)
+        entry = self.points.get(key)
+        if entry is None:
+            self.points[key] = {"seconds": seconds, "count": 1}
+        else:
+            entry["seconds"] = self.ALPHA * seconds + (1 - self.ALPHA) * entry["seconds"]
+            entry["count"] += 1
+
+    def __fit_overhead(self, execution_type: Any) -> Optional[tuple[float, float]]:
+        # least squares of `overhead = a + b * container_cnt`
+        samples = []
+        for key, entry in self.points.items():
+            point = json.loads(key)
+            if point.get("execution_type") != to_json_value(execution_type):
+                continue
+            if point.get("config") != self.config:
+                continue
+            samples.append((point.get("container_cnt", 1), entry["seconds"] - point["duration"]))
+        if not samples:
+            return None
+        mean_x = sum(x for x, _ in samples) / len(samples)
+        mean_y = sum(y for _, y in samples) / len(samples)
+        var_x = sum((x - mean_x) ** 2 for x, _ in samples)
+        if var_x == 0:
+            return mean_y, 0.0
+        slope = sum((x - mean_x) * (y - mean_y) for x, y in samples) / var_x
+        return mean_y - slope * mean_x, slope
+
+    def predict(self, point: dict[str, Any], duration: int, repeats: int = 1) -> float:
+        """
+        Returns the expected cost in seconds of a run of the point.
+        """
+        entry = self.points.get(self.__get_key(point, duration))
+        if entry is not None:
+            return entry["seconds"]
+        count = point.get("container_cnt", 1)
+        fit = self.__fit_overhead(point.get("execution_type"))
+        if fit is None:
+            overhead = DEFAULT_OVERHEAD_S + DEFAULT_UNIT_OVERHEAD_S * count
+        else:
+            overhead = fit[0] + fit[1] * count
+        return duration * repeats + max(overhead, 0.0)
+
+    def save(self):
+        if self.path is None:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.points, f, indent=1)
+        os.replace(tmp, self.path)
+
+
+class CampaignScheduler:
+    """
+    Orders the cartesian product of the variables of a campaign and keeps
+    track of its progress to log an estimation of the remaining time.
+    """
+
+    def __init__(
+        self,
+        variables: dict[str, Iterable[Any]],
+        policy: SchedulePolicy,
+        cost_model: CostModel,
+        duration: int,
+        nb_runs: int = 1,
+        repeats: int = 1,
+    ):
+        self.variables = {k: list(v) for k, v in variables.items()}
+        self.policy = policy
+        self.cost_model = cost_model
+        self.duration = duration
+        self.nb_runs = nb_runs
+        self.repeats = repeats
+        self.points = self.__order(self.__product())
+        # predictions at the time of the plan, to compare with the elapsed time
+        self.predictions = {
+            get_point_key(p): cost_model.predict(p, duration, repeats) for p in self.points
+        }
+        self.predicted_total = nb_runs * sum(self.predictions.values())
+        self.predicted_done = 0.0
+        self.elapsed_done = 0.0
+        self.runs_done = 0
+
+    def __product(self) -> list[dict[str, Any]]:
+        names = list(self.variables)
+        return [dict(zip(names, v)) for v in itertools.product(*self.variables.values())]
+
+    def __order(self, points: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        # sort on the position of the values in the configuration, the values
+        # themselves are not necessarily comparable
+        def position(point: dict[str, Any], name: str) -> int:
+            return self.variables[name].index(point[name]) if name in self.variables else 0
+
+        others = [n for n in self.variables if n not in ENV_VARIABLES]
+        match self.policy:
+            case SchedulePolicy.NESTED:
+                return points
+            case SchedulePolicy.MIN_SWITCHES:
+                # the units of a count are reused by the next count with a pool
+                names = ENV_VARIABLES + others
+            case SchedulePolicy.INTERLEAVED:
+                # the execution types of a point run back to back, so that
+                # drifts of the machine affect them alike
+                names = ["container_cnt"] + others + ["execution_type"]
+        return sorted(points, key=lambda p: [position(p, n) for n in names])
+
+    def get_points(self) -> list[dict[str, Any]]:
+        return self.points
+
+    def get_shards(
+        self, max_shards: int, capacity: int, cpus_of: Callable[[dict[str, Any]], int]
+    ) -> list[list[dict[str, Any]]]:
+        """
+        Packs consecutive points into groups of at most `max_shards` points
+        that need at most `capacity` cpus in total, to be run at the same time.
+        """
+        shards: list[list[dict[str, Any]]] = []
+        used = 0
+        for point in self.points:
+            cpus = cpus_of(point)
+            if not shards or len(shards[-1]) >= max_shards or used + cpus > capacity:
+                shards.append([])
+                used = 0
+            shards[-1].append(point)
+            used += cpus
+        return shards
+
+    def get_eta(self) -> float:
+        """
+        Returns the remaining time in seconds, the prediction is scaled by
+        how far off it was for the runs that are done.
+        """
+        remaining = max(self.predicted_total - self.predicted_done, 0.0)
+        if self.predicted_done > 0:
+            remaining *= self.elapsed_done / self.predicted_done
+        return remaining
+
+    def log_plan(self):
+        nested = self.__product()
+        bm_log(
+            f"{len(self.points)} points ordered as {self.policy.value}: "
+            f"{count_switches(self.points, ENV_VARIABLES)} environment switches "
+            f"({count_switches(nested, ENV_VARIABLES)} in nested order), "
+            f"estimated duration {format_seconds(self.get_eta())}"
+        )
+
+    def on_run_done(self, point: dict[str, Any], seconds: float):
+        point = {k: v for k, v in point.items() if k in self.variables}
+        key = get_point_key(point)
+        self.predicted_done += self.predictions.get(
+            key, self.cost_model.predict(point, self.duration, self.repeats)
+        )
+        self.elapsed_done += seconds
+        self.runs_done += 1
+        self.cost_model.observe(point, self.duration, seconds)
+        self.cost_model.save()
+        total = len(self.points) * self.nb_runs
+        bm_log(
+            f"run {self.runs_done}/{total} took {format_seconds(seconds)}, "
+            f"ETA {format_seconds(self.get_eta())}"
+        )
+
+
+def format_seconds(seconds: float) -> str:
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m{seconds:02d}s" if hours else f"{minutes}m{seconds:02d}s"
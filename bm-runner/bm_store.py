@@ -0,0 +1,159 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import json
+import os
+from typing import Any
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+from bm_histogram import split_histograms
+from bm_parser import HISTOGRAM_SUFFIX, join_histogram
+from utils.logger import bm_log, LogType
+
+# version of the layout of the archive
+STORE_VERSION = 1
+
+
+class ResultStore:
+    """
+    Results of a campaign as typed columns, saved in a NumPy archive next to
+    the CSV written by benchkit. Numeric columns keep their dtype, text
+    columns are stored as fixed width strings and the `*_histogram` columns
+    as matrices of bucket counts, so that loading the results parses no text.
+    """
+
+    SUFFIX = ".npz"
+
+    def __init__(
+        self,
+        columns: dict[str, np.ndarray],
+        histograms: dict[str, np.ndarray],
+        nulls: dict[str, np.ndarray],
+        order: list[str],
+    ):
+        self.columns = columns
+        self.histograms = histograms
+        # rows without a value, for the columns that have any
+        self.nulls = nulls
+        self.order = order
+
+    def __len__(self) -> int:
+        array = next(iter({**self.columns, **self.histograms}.values()), None)
+        return 0 if array is None else len(array)
+
+    @staticmethod
+    def from_frame(df: DataFrame) -> "ResultStore":
+        columns, histograms, nulls = {}, {}, {}
+        for name in df.columns:
+            series = df[name]
+            if series.dtype.kind in "biuf":
+                # missing numbers are already NaN
+                columns[name] = series.to_numpy()
+                continue
+            null = series.isna().to_numpy()
+            if null.any():
+                nulls[name] = null
+            if name.endswith(HISTOGRAM_SUFFIX):
+                try:
+                    histograms[name] = split_histograms(series.fillna("0").astype(str).to_numpy())
+                    continue
+                except ValueError:
+                    bm_log(f"Column {name} is not a histogram, stored as text", LogType.WARNING)
+            columns[name] = series.fillna("").astype(str).to_numpy(dtype=str)
+        return ResultStore(columns, histograms, nulls, [str(c) for c in df.columns])
+
+    def to_frame(self, histograms_as_text: bool = True) -> DataFrame:
+        """
+        Returns the results as a data frame. The histograms are either joined
+        as in the CSV, or kept as arrays of bucket counts.
+        """
+        data: dict[str, Any] = {}
+        for name in self.order:
+            if name in self.histograms:
+                matrix = self.histograms[name]
+                data[name] = (
+                    [join_histogram(row) for row in matrix.tolist()]
+                    if histograms_as_text
+                    else list(matrix)
+                )
+            else:
+                data[name] = self.columns[name]
+        df = DataFrame(data, columns=self.order)
+        for name, null in self.nulls.items():
+            df[name] = df[name].astype(object).where(~null, None)
+        return df
+
+    def save(self, path: str):
+        arrays = {f"col:{k}": v for k, v in self.columns.items()}
+        arrays |= {f"hist:{k}": v for k, v in self.histograms.items()}
+        arrays |= {f"null:{k}": v for k, v in self.nulls.items()}
+        schema = {
+            "version": STORE_VERSION,
+            "order": self.order,
+            "dtypes": {k: v.dtype.str for k, v in {**self.columns, **self.histograms}.items()},
+        }
+        arrays["schema"] = np.array(json.dumps(schema))
+        tmp = f"{path}.tmp{self.SUFFIX}"
+        np.savez_compressed(tmp, **arrays)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def load(path: str) -> "ResultStore":
+        columns, histograms, nulls = {}, {}, {}
+        with np.load(path, allow_pickle=False) as archive:
+            schema = json.loads(str(archive["schema"]))
+            for key in archive.files:
+                kind, _, name = key.partition(":")
+                match kind:
+                    case "col":
+                        columns[name] = archive[key]
+                    case "hist":
+                        histograms[name] = archive[key]
+                    case "null":
+                        nulls[name] = archive[key]
+        return ResultStore(columns, histograms, nulls, schema["order"])
+
+
+def read_results_csv(csv_file: str) -> DataFrame:
+    try:
+        return pd.read_csv(csv_file, sep=";", comment="#", engine="c", on_bad_lines="error")
+    except pd.errors.ParserError:
+        return pd.read_csv(csv_file, sep=";", comment="#", engine="python", on_bad_lines="error")
+
+
+def get_store_path(output_dir: Any) -> str:
+    return f"{output_dir}{ResultStore.SUFFIX}"
+
+
+def convert_results(output_dir: Any) -> ResultStore:
+    """
+    Parses the CSV of the campaign once and saves it as a `ResultStore`.
+    """
+    csv_file = f"{output_dir}.csv"
+    store = ResultStore.from_frame(read_results_csv(csv_file))
+    store.save(get_store_path(output_dir))
+    bm_log(f"results of {csv_file} stored in {get_store_path(output_dir)}")
+    return store
+
+
+def load_store(output_dir: Any) -> ResultStore:
+    """
+    Returns the stored results of the campaign, the CSV is only parsed when
+    the store is missing or older, e.g. for campaigns run before the store
+    existed.
+    """
+    csv_file = f"{output_dir}.csv"
+    path = get_store_path(output_dir)
+    if os.path.exists(path) and (
+        not os.path.exists(csv_file) or os.path.getmtime(path) >= os.path.getmtime(csv_file)
+    ):
+        try:
+            return ResultStore.load(path)
+        except (OSError, ValueError, KeyError) as e:
+            bm_log(f"Cannot load {path}, parsing {csv_file} again: {e}", LogType.WARNING)
+    return convert_results(output_dir)
+
+
+def load_results(output_dir: Any) -> DataFrame:
+    return load_store(output_dir).to_frame()
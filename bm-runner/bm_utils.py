@@ -1,9 +1,9 @@
 # Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
 # SPDX-License-Identifier: MIT
 
+import csv
 import os
 import sys
-import socket
 from benchkit.shell.shell import shell_out
 from benchkit.utils.dir import get_curdir
 import psutil
@@ -137,39 +137,94 @@ def save_container_config(output_dir, container_name):
             )
 
 
-def get_cpu_set(start: int, core_cnt: int) -> str:
-    total_core_cnt = os.cpu_count()
-    cores = ""
-    assert total_core_cnt is not None
-    assert core_cnt > 0, "There should be at least one core assigned to the container"
-    if core_cnt > total_core_cnt:
-        bm_log(
-            f"requested core count {core_cnt} exceeds total core count {total_core_cnt}, using {total_core_cnt} instead!",
-            LogType.WARNING,
-        )
-        core_cnt = total_core_cnt
-    for i in range(core_cnt):
-        core = start + i
-        if core >= total_core_cnt:
-            core = core % total_core_cnt
-            bm_log(
-                f"core index exceeded total core count, wrap around to core {start + i} -> {core}",
-                LogType.WARNING,
-            )
-        cores += f"{core},"
-    assert len(cores) > 1, "cores cannot be empty!"
-    cores = cores[:-1]  # drop last comma
+# intervals of the builtin benchmarks, saved with the results of every run
+TIMESERIES_FILE = "timeseries.csv"
+# structured results of the builtin benchmarks, saved with the results of every run
+RECORDS_FILE = "records.jsonl"
+# variables of a run, the rows with the same values are those of a grid point
+GRID_COLUMNS = [
+    "benchmark_duration_seconds",
+    "nb_threads",
+    "noise",
+    "initial_size",
+    "cpu_order",
+    "master_thread_core",
+    "container_cnt",
+    "execution_type",
+]
+
+
+def append_csv(path: PathType, rows: list[dict]):
+    """
+    Appends the rows to a `;` separated CSV file, the header is written
+    with the first rows.
+    """
+    if not rows:
+        return
+    new_file = not os.path.exists(path)
+    with open(path, "a", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]), delimiter=";", extrasaction="ignore")
+        if new_file:
+            writer.writeheader()
+        writer.writerows(rows)
+
+
+def parse_cpu_set(core_set: str) -> set[int]:
+    """
+    Returns the cores of a cpu list as used by taskset/cpuset, e.g. "0,2,4-7".
+    """
+    cores = set()
+    for part in core_set.split(","):
+        first, _, last = part.strip().partition("-")
+        cores.update(range(int(first), int(last or first) + 1))
     return cores
 
 
-def is_port_free_to_use(port, host="127.0.0.1"):
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        s.settimeout(1)
+# TCP socket tables of the kernel, see proc_net_tcp(5)
+PROC_NET_TCP = ["/proc/net/tcp", "/proc/net/tcp6"]
+TCP_TIME_WAIT = "06"
+
+
+def get_used_ports(tables: list[str] = PROC_NET_TCP) -> set[int]:
+    """
+    Returns the local TCP ports bound by any socket of the current network
+    namespace, whatever address it is bound to. Sockets in TIME_WAIT are
+    ignored, as servers usually bind with SO_REUSEADDR.
+    """
+    ports = set()
+    for table in tables:
         try:
-            s.connect((host, port))
-            return False  # connection succeeded → port is in use
-        except (ConnectionRefusedError, OSError):
-            return True  # connection failed → port is free
+            with open(table) as f:
+                next(f, None)  # header
+                for line in f:
+                    fields = line.split()
+                    if len(fields) < 4 or fields[3] == TCP_TIME_WAIT:
+                        continue
+                    ports.add(int(fields[1].rsplit(":", 1)[1], 16))
+        except FileNotFoundError:
+            pass  # e.g. IPv6 is disabled
+    return ports
+
+
+def find_free_port_range(
+    port_start: int, count: int, auto_shift: bool, used_ports: Optional[set[int]] = None
+) -> Optional[int]:
+    """
+    Returns the first port of `count` consecutive free ports. It is
+    `port_start` if the range is free, otherwise the next free range above it
+    when `auto_shift` is set, and None if there is no such range.
+    """
+    used = get_used_ports() if used_ports is None else used_ports
+    start = port_start
+    while start + count - 1 <= 65535:
+        busy = [port for port in range(start, start + count) if port in used]
+        if not busy:
+            return start
+        if not auto_shift:
+            bm_log(f"Ports {busy} are already in use", LogType.ERROR)
+            return None
+        start = busy[-1] + 1
+    return None
 
 
 def stop_process(pid: int):
@@ -1,11 +1,13 @@
 # Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
 # SPDX-License-Identifier: MIT
 
+import copy
 import os
 import datetime
 import glob
 from dominate import document
 from dominate.tags import style, table, tr, td, div, img, h1, h2, a, iframe
+import numpy as np
 import pandas as pd
 from pandas import DataFrame
 import seaborn as sns
@@ -13,15 +15,23 @@ import matplotlib.pyplot as plt
 import matplotlib.ticker as ticker
 import base64
 import statistics
-import math
 from benchkit.utils.dir import parentdir
 from config.plot import PlotConfig
 from config.plot import PlotType
+from bm_utils import GRID_COLUMNS, TIMESERIES_FILE
+from bm_store import load_results
+from bm_analysis import summarize, summarize_results
+from bm_histogram import get_merged_percentiles, get_merged_samples
+from bm_parser import HISTOGRAM_SUFFIX
 import time
 from pathlib import Path
+from typing import Optional
 import re
 from utils.logger import bm_log, LogType
 
+# latencies drawn per group of a histogram plot
+HISTOGRAM_SAMPLES = 1000
+
 # TODO: refactor histogram building not to use global vars
 # TODO: document functions
 ###########################################################################
@@ -41,8 +51,13 @@ def plot_chart(
     plot: PlotConfig,
     df: DataFrame,
     out_fig_name,
+    band: Optional[tuple[str, str]] = None,
     **kwargs,
 ):
+    """
+    Draws `plot` with the seaborn function of its shape, and when `band` is
+    given, fills the area between its lower and upper columns for every hue.
+    """
     args = dict(kwargs)
     fig = plt.figure(dpi=150)
     chart = fig.add_subplot()
@@ -71,9 +86,17 @@ def plot_chart(
         **args,
     )
 
+    if band is not None:
+        for color, group in zip(palette, sorted_gp):
+            rows = df[df[plot.hue] == group].sort_values(plot.x)
+            chart.fill_between(
+                rows[plot.x], rows[band[0]], rows[band[1]], color=color, alpha=0.2, linewidth=0
+            )
+
     chart.xaxis.set_major_locator(ticker.MultipleLocator(1))
     chart.set(xlabel=plot.x_lbl, ylabel=plot.y_lbl)
-    new_ylim = 1.2 * max(df[plot.y])
+    top = max(df[plot.y]) if band is None else np.nanmax([df[plot.y].max(), df[band[1]].max()])
+    new_ylim = 1.2 * top
     chart.set_ylim(0, 1 if new_ylim == 0 else new_ylim)
 
     plt.legend(
@@ -237,72 +260,64 @@ def create_min_max_avg_plot(org_df, config: PlotConfig, dir: str):
 
 
 ###########################################################
-# TODO: do we need to pass it as a param?
-bucket_avg = []
-
-
-def gen_row(smr, threads, i):
-    # todo find real value instead of i+1
-    return [smr, threads, bucket_avg[i]]
+def create_histogram_plot(df, plot: PlotConfig, dir):
+    """
+    Plots the distribution of the operations of the `<y>_histogram` column.
+    The histograms of the rows with the same `x` and `hue` are summed, and
+    their bucket counts weight the latencies that are drawn.
+    """
+    histo = f"{plot.y}_histogram"
+    if not col_exists(df, histo, plot.title):
+        return
+    trans_df = get_merged_samples(df, histo, [plot.hue, plot.x], HISTOGRAM_SAMPLES)
+    plot = copy.copy(plot)
+    plot.y = "latency"
+    plot_chart(plot=plot, df=trans_df, out_fig_name=f"{dir}/{histo}_boxplot")
 
 
-def log_scale(cnt):
-    if cnt == 0:
-        return 0
-    else:
-        return int(math.log2(cnt) + 1)
-
-
-def gen_rows_from_histogram(smr, threads, histogram):
-    # split the column value into an array
-    # map bucket i to the number of elements of the bucket
-    buckets = histogram.split(",")
-    return [
-        # add the row log_scale(int(count)] times
-        # to not use log_scale just use count directly
-        [gen_row(smr, threads, i)] * log_scale(int(count))
-        for i, count in enumerate(buckets)
-    ]
-
-
-def implicit_add_columns(trans_df, subdf, histo, x_col, gp_name):
-    res_l = list(
-        map(
-            gen_rows_from_histogram,
-            subdf[gp_name],
-            subdf[x_col],
-            subdf[histo],
-        )
+def create_percentiles_plot(df, plot: PlotConfig, dir):
+    """
+    Plots the percentiles of the `<y>_histogram` column. The histograms of
+    the rows with the same `x` and `hue` are summed before the percentiles
+    are computed, so that they are those of all operations of the group.
+    """
+    histo = f"{plot.y}_histogram"
+    if not col_exists(df, histo, plot.title):
+        return
+    percentiles = get_merged_percentiles(df, histo, [plot.hue, plot.x])
+    trans_df = percentiles.drop(columns="count").melt(
+        id_vars=[plot.hue, plot.x], var_name="percentile", value_name="latency"
     )
-    res = [item for sublist in res_l for sublist_2 in sublist for item in sublist_2]
-    o_df = pd.DataFrame(res)
-    trans_df[[gp_name, x_col, "latency"]] = o_df[[0, 1, 2]]
+    plot = copy.copy(plot)
+    plot.y = "latency"
+    # one line per percentile, the other shapes aggregate them
+    kwargs = {"style": "percentile"} if plot.shape in ["lineplot", "scatterplot"] else {}
+    plot_chart(plot=plot, df=trans_df, out_fig_name=f"{dir}/{histo}_percentiles", **kwargs)
 
 
-###########################################################
-def create_histogram_plot(df, plot: PlotConfig, dir):
-    col_prefix = plot.y
-    histo = f"{col_prefix}_histogram"
-    subdf = df[[plot.x, plot.hue, histo]].copy()
-
-    ############################################################
-    cols = range(1, 61)  # TODO: align with C
-    bucket_min = 0
-    bucket_max = 99
-    for i in cols:
-        bucket_avg.append((bucket_max + bucket_min) / 2)
-        bucket_max, bucket_min = (
-            bucket_max + int((bucket_max - bucket_min + 1) * 1.1),
-            bucket_max + 1,
-        )
+###########################################################################
+def is_metric(df: DataFrame, col: str) -> bool:
+    return col in df.columns and pd.api.types.is_numeric_dtype(df[col])
 
-    ############################################################
-    # Transformation
-    trans_df = pd.DataFrame()
-    implicit_add_columns(trans_df, subdf, histo, plot.x, plot.hue)
-    ############################################################
-    plot.y = "latency"  # TODO configure
-    plot_chart(plot=plot, df=trans_df, out_fig_name=f"{dir}/{histo}_boxplot")
+
+def create_mean_ci_plot(df: DataFrame, plot: PlotConfig, fig_name: str):
+    """
+    Plots the mean of the repeats of every `x` and `hue` with the bootstrap
+    confidence interval of the mean as a band.
+    """
+    if not col_exists(df, plot.x, plot.title) or not col_exists(df, plot.hue, plot.title):
+        return
+    summary = summarize(df, [plot.hue, plot.x], [plot.y])
+    plot = copy.copy(plot)
+    y = plot.y
+    plot.y = f"{y}_mean"
+    plot_chart(
+        plot=plot,
+        df=summary,
+        out_fig_name=fig_name,
+        band=(f"{y}_ci_low", f"{y}_ci_high"),
+        errorbar=None,
+    )
 
 
 ###########################################################################
@@ -312,15 +327,22 @@ def create_plots(df, plots: list[PlotConfig], dir, info: str):
             case PlotType.NORMAL:
                 fig_name = f"{dir}/{plot.x}_vs_{plot.y}_{info}"
                 with sns.axes_style("ticks", {"axes.grid": True}):
-                    plot_chart(plot=plot, df=df, out_fig_name=fig_name)
+                    if plot.shape == "lineplot" and is_metric(df, plot.y):
+                        create_mean_ci_plot(df, plot, fig_name)
+                    else:
+                        plot_chart(plot=plot, df=df, out_fig_name=fig_name)
             case PlotType.MIN_MAX_AVG:
                 create_min_max_avg_plot(org_df=df, config=plot, dir=dir)
             case PlotType.SUCCESS_PERCENT:
                 create_success_rate_plot(org_df=df, config=plot, dir=dir)
             case PlotType.HISTOGRAM:
                 create_histogram_plot(df=df, plot=plot, dir=dir)
+            case PlotType.PERCENTILES:
+                create_percentiles_plot(df=df, plot=plot, dir=dir)
             case PlotType.LINEARITY:
                 create_linearity_plot(df=df, plot=plot, dir=dir)
+            case PlotType.TIMESERIES:
+                create_timeseries_plot(df=df, plot=plot, dir=dir, info=info)
             case _:
                 bm_log(f"unsupported plot type: {plot.type} skipped!", LogType.WARNING)
 
@@ -408,6 +430,77 @@ def create_linearity_plot(df: DataFrame, plot: PlotConfig, dir):
     plot_chart(plot=plot, df=lin_df, out_fig_name=f"{dir}/linearity")
 
 
+###########################################################################
+def load_timeseries(dir) -> Optional[DataFrame]:
+    files = sorted(glob.glob(os.path.join(dir, "**", TIMESERIES_FILE), recursive=True))
+    if not files:
+        return None
+    return pd.concat([pd.read_csv(f, sep=";") for f in files], ignore_index=True)
+
+
+def create_timeseries_plot(df: DataFrame, plot: PlotConfig, dir, info: str):
+    """
+    Plots `plot.y` over the time of the measurement window, for the points
+    of the data frame. There is one plot per execution type and count of
+    execution units, with one line per `plot.hue`.
+    """
+    ts_df = load_timeseries(dir)
+    if ts_df is None:
+        bm_log(
+            f"cannot find any {TIMESERIES_FILE}, set `interval_ms` to generate `{plot.title}`",
+            LogType.ERROR,
+        )
+        return
+    ts_df = ts_df[
+        ts_df["nb_threads"].astype(str).isin(df["nb_threads"].astype(str).unique())
+        & ts_df["noise"].isin(df["noise"].unique())
+    ].copy()
+    ts_df["time_s"] = ts_df["time_ms"] / 1000
+    for (exec_type, count), point_df in ts_df.groupby(["execution_type", "container_cnt"]):
+        point_plot = PlotConfig(
+            **{
+                **plot,
+                "x": "time_s",
+                "x_lbl": "time (s)",
+                "title": f"{plot.title} ({exec_type}, {count} units)",
+            }
+        )
+        with sns.axes_style("ticks", {"axes.grid": True}):
+            plot_chart(
+                plot=point_plot,
+                df=point_df,
+                out_fig_name=f"{dir}/timeseries_{plot.y}_{exec_type}_{count}_{info}",
+            )
+
+
+###########################################################################
+def get_fleet_latency(df: DataFrame) -> DataFrame:
+    """
+    Returns the percentiles of the latencies of every operation of every
+    grid point, over all threads, execution units and repeats of the point.
+    """
+    by = [c for c in GRID_COLUMNS if c in df.columns]
+    frames = []
+    for column in [c for c in df.columns if c.endswith(HISTOGRAM_SUFFIX)]:
+        # the rows of other applications have no such column
+        rows = df[df[column].notna()]
+        if rows.empty:
+            continue
+        latency = get_merged_percentiles(rows, column, by)
+        latency.insert(len(by), "op", column.removesuffix(HISTOGRAM_SUFFIX))
+        frames.append(latency)
+    return pd.concat(frames, ignore_index=True) if frames else DataFrame()
+
+
+def add_latency_tbl(df: DataFrame, doc: document):
+    tbl = table()
+    tbl.add(tr([td(col) for col in df.columns]))
+    for values in df.round(2).itertuples(index=False):
+        tbl.add(tr([td(str(v)) for v in values]))
+    doc.add(h2("Latency percentiles over all execution units and repeats"))
+    doc.add(tbl)
+
+
 ###########################################################################
 # puts all generated graphs in one
 def visualize_in_html(output_dir: Path, title: str, plots: list[PlotConfig]):
@@ -435,10 +528,13 @@ def visualize_in_html(output_dir: Path, title: str, plots: list[PlotConfig]):
     hostname = ""
     # load data frame
     result_file = f"{output_dir}.csv"
-    data_frame = pd.read_csv(
-        result_file, sep=";", comment="#", engine="python", on_bad_lines="error"
-    )
+    data_frame = load_results(output_dir)
     hostname = data_frame["hostname"].unique()
+    latency = get_fleet_latency(data_frame)
+    if not latency.empty:
+        latency.to_csv(f"{output_dir}_latency.csv", sep=";", index=False)
+        add_latency_tbl(latency, doc)
+    summarize_results(data_frame).to_csv(f"{output_dir}_summary.csv", sep=";", index=False)
     # we split the data-frame into multiple data frames to help with visualization
     data_frames = split_data_frame(data_frame)
     # For each data frame we'll generate the related graphs
@@ -1,36 +1,117 @@
 # Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
 # SPDX-License-Identifier: MIT
 
+import importlib
+import importlib.util
+import os
+import re
 import subprocess
-from typing import Optional
+import sys
+from typing import Any, Callable, Optional
 from pathlib import Path
-from bm_utils import ensure_exists
+from bm_utils import ensure_exists, resolve_path
+from utils.logger import bm_log, LogType
 
 
 class Adapter(dict):
     ENV_VAR = "CSB_ADAPTERS"
+    # relative to the project dir
+    DEFAULT_DIR = "scripts/adapters"
 
-    def __init__(self, name: str, path: Optional[Path] = None):
+    def __init__(
+        self,
+        name: Optional[str] = None,
+        path: Optional[Path] = None,
+        regex: Optional[str] = None,
+        function: Optional[str] = None,
+    ):
         """
         Adapters used to transform the output of an external benchmark into
-        the format understood by the framework: a line of `<key>:<val>;`
-        pairs e.g. `throughput:1000;latency:20;`.
-        If an adapter is used the output of the benchmark is piped
-        to the adapter script. See scripts/adapters for examples.
+        the format understood by the framework: a line of `<key>=<val>;`
+        pairs e.g. `throughput=1000;latency=20;`.
+        Exactly one of `name`, `regex` and `function` must be set. Regular
+        expressions and functions run within the runner, scripts are run
+        with the output of the benchmark piped to them.
+        See scripts/adapters for examples.
 
         Parameters
         ----------
-        name: str
+        name: Optional[str]
             Adapter script filename.
         path: Optional[Path]
-            The dir where the script exists. Required if it does not exist
-            system wide, or under script/adapters.
+            The dir where the script or the module of `function` exists. Required if
+            it does not exist system wide, or under script/adapters.
+        regex: Optional[str]
+            Regular expression searched in every line of the output. Each match gives
+            a line with the named groups of the expression as keys.
+            JSON example: `"regex": "(?P<throughput_lps>[0-9.]+)\\\\s+lps"`
+        function: Optional[str]
+            Python function given as `<module>:<function>`, called with the output and
+            returning either the adapted output or a dict of results. The module is
+            loaded from `path`, under script/adapters or from the python path.
+            JSON example: `"function": "stress_ng_adapter:adapt"`
         -
         """
-        super().__init__(name=name, path=path)
-        self.fname = ensure_exists(name, path, self.ENV_VAR)
+        super().__init__(name=name, path=path, regex=regex, function=function)
+        if sum(v is not None for v in [name, regex, function]) != 1:
+            bm_log(
+                f"Exactly one of `name`, `regex` or `function` must be set in adapter {dict(self)}",
+                LogType.FATAL,
+            )
+            sys.exit(1)
+        self.fname: Optional[str] = None
+        self.pattern: Optional[re.Pattern] = None
+        self.function: Optional[Callable[[str], Any]] = None
+        if regex is not None:
+            self.pattern = re.compile(regex)
+            if not self.pattern.groupindex:
+                bm_log(f"The adapter regex `{regex}` has no named group", LogType.FATAL)
+                sys.exit(1)
+        elif function is not None:
+            self.function = self.__load_function(function, path)
+        else:
+            assert name is not None
+            self.fname = ensure_exists(name, path, self.ENV_VAR)
+
+    def __load_function(self, function: str, path: Optional[Path]) -> Callable[[str], Any]:
+        module_name, _, function_name = function.partition(":")
+        if not function_name:
+            bm_log(f"Adapter function `{function}` must be `<module>:<function>`", LogType.FATAL)
+            sys.exit(1)
+        dirs = [str(resolve_path(path))] if path is not None else []
+        if os.getenv(self.ENV_VAR) is not None:
+            dirs.append(os.environ[self.ENV_VAR])
+        dirs.append(str(resolve_path(self.DEFAULT_DIR)))
+        files = [os.path.join(d, f"{module_name}.py") for d in dirs]
+        file = next((f for f in files if os.path.isfile(f)), None)
+        try:
+            if file is not None:
+                spec = importlib.util.spec_from_file_location(module_name, file)
+                assert spec is not None and spec.loader is not None
+                module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(module)
+            else:
+                module = importlib.import_module(module_name)
+            return getattr(module, function_name)
+        except (ImportError, AttributeError) as e:
+            bm_log(f"Cannot load adapter function `{function}`: {e}", LogType.FATAL)
+            sys.exit(1)
 
     def adapt(self, output: str) -> str:
+        if self.pattern is not None:
+            lines = []
+            for line in output.splitlines():
+                match = self.pattern.search(line)
+                if match is not None:
+                    groups = match.groupdict(default="")
+                    lines.append("".join(f"{k}={v};" for k, v in groups.items()) + "\n")
+            return "".join(lines)
+        if self.function is not None:
+            result = self.function(output)
+            if isinstance(result, dict):
+                return "".join(f"{k}={v};" for k, v in result.items()) + "\n" if result else ""
+            return result
         # This is a blocking call
+        assert self.fname is not None
         result = subprocess.run([self.fname], text=True, capture_output=True, input=output)
         return result.stdout
@@ -47,12 +47,14 @@ class Application(dict):
             The sum of all values in the list must be equal to 1024.
             Each index represents a specific operation as defined by the benchmark/application.
             This is only relevant for builtin benchmarks.
-        args: Optional[str] = -t={threads} -n={noise} -d={duration} -s={initial_size}
+        args: Optional[str] = -t={threads} -n={noise} -d={duration} -s={initial_size} -w={warmup} -c={cooldown} -i={interval} -f={output_format}
             A string that represents the command line arguments of the application.
             It can contain place holders for dynamic values. Available place holders:
-            are `{threads}`, `{noise}`, `{duration}`, `{index}`, and `{initial_size}`.
+            are `{threads}`, `{noise}`, `{duration}`, `{index}`, `{initial_size}`, `{warmup}`, `{cooldown}`, `{total_duration}`, `{interval}` and `{output_format}`.
             They are replaced at runtime with the actual values: number of threads, number of nop instructions following an operation,
-            duration of the benchmark in seconds, the index of the execution unit in the current benchmarking run, and initial size of the data structure respectively.
+            duration of the benchmark in seconds, the index of the execution unit in the current benchmarking run, initial size of the data structure,
+            the warm-up and cool-down times in seconds, the sum of the last three, the period of the
+            time series in milliseconds and the code of the output format of builtin benchmarks respectively.
             If any of the above is relevant for the external application they can be used in the args
             string. Otherwise they can be omitted.
         adapter: Optional[Adapter] = {}
@@ -76,7 +78,9 @@ class Application(dict):
         self.cd = cd
         # Set default framework arguments
         self.args = (
-            "-t={threads} -n={noise} -d={duration} -s={initial_size}" if args is None else args
+            "-t={threads} -n={noise} -d={duration} -s={initial_size} -w={warmup} -c={cooldown} -i={interval} -f={output_format}"
+            if args is None
+            else args
         )
         self.adapter = Adapter(**adapter) if adapter is not None else None
         if len(self.operations) > 0 and sum(self.operations) != self.DISTRIBUTION_SUM:
@@ -92,6 +96,12 @@ class Application(dict):
                 LogType.ERROR,
             )
 
+    def is_builtin(self) -> bool:
+        """
+        Returns whether the application is a benchmark of the `bench` directory.
+        """
+        return self.path is None and self.adapter is None
+
     def __get_runnable_cmd(self, work_dir: Path) -> str:
         if self.path:
             fname = ensure_exists(name=self.name, dir=self.path)
@@ -116,6 +126,10 @@ class Application(dict):
         n_units: int,
         homedir: str,
         res_dir: str,
+        warmup: int = 0,
+        cooldown: int = 0,
+        interval: int = 0,
+        output_format: int = 0,
     ) -> str:
         """
         Returns full command line for a single benchmark run.
@@ -136,6 +150,11 @@ class Application(dict):
             duration=duration,
             noise=noise,
             initial_size=initial_size,
+            warmup=warmup,
+            cooldown=cooldown,
+            total_duration=warmup + duration + cooldown,
+            interval=interval,
+            output_format=output_format,
             index=index,
             n_units=n_units,
             homedir=homedir,
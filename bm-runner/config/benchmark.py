@@ -2,8 +2,11 @@
 # SPDX-License-Identifier: MIT
 
 from enum import Enum
+import sys
 from typing import Optional
 from config.list import ListConfig
+from utils.logger import bm_log, LogType
+from utils.stats import SUPPORTED_CONFIDENCES
 
 
 class ExecutionType(str, Enum):
@@ -39,6 +42,112 @@ class MonitorType(str, Enum):
     SAR_NET = "sar_net"
 
 
+class SchedulePolicy(str, Enum):
+    """
+    Order in which the points of the campaign are run.
+
+    Members
+    ----------
+    NESTED: Nested loops over the variables of the campaign.
+    MIN_SWITCHES: Groups the points by execution type and then by number of units, so that units are created and removed as seldom as possible.
+    INTERLEAVED: Groups the points by number of units and alternates the execution types of each point.
+    """
+
+    NESTED = "nested"
+    MIN_SWITCHES = "min_switches"
+    INTERLEAVED = "interleaved"
+
+
+class OutputFormat(str, Enum):
+    """
+    Format of the results of the builtin benchmarks.
+
+    Members
+    ----------
+    TEXT: One `key=val;` line per run.
+    JSONL: One JSON object per line with the raw histograms, the bounds of their buckets, the stats of every thread and the clock calibration, saved in `records.jsonl` next to the results of the run.
+    """
+
+    TEXT = "text"
+    JSONL = "jsonl"
+
+    def get_code(self) -> int:
+        """
+        Returns the value of the `-f=` argument of the builtin benchmarks.
+        """
+        return list(OutputFormat).index(self)
+
+
+class AdaptiveConfig(dict):
+    def __init__(
+        self,
+        metric: str,
+        target_ci: float = 0.05,
+        confidence: float = 0.95,
+        min_repeats: int = 3,
+        max_repeats: int = 20,
+        time_budget: Optional[int] = None,
+        max_duration: Optional[int] = None,
+    ):
+        """
+        Adaptive mode repeats every point of the campaign until the confidence
+        interval of a metric is narrow enough, instead of a fixed number of times.
+        After each repetition, the metric is averaged over the execution units, and
+        the confidence interval of the mean of these averages is computed.
+        The number of repetitions and the achieved interval are added to the results.
+
+        Parameters
+        ----------
+        metric: str
+            Name of the result to converge on e.g. `throughput_min`.
+        target_ci: float = 0.05
+            Target half width of the confidence interval relative to the mean.
+            With `0.05` a point stops once its mean is known within +/- 5%.
+        confidence: float = 0.95
+            Confidence level of the interval, one of 0.9, 0.95 and 0.99.
+        min_repeats: int = 3
+            Minimum number of repetitions of a point.
+        max_repeats: int = 20
+            Maximum number of repetitions of a point.
+        time_budget: Optional[int]
+            Maximum time in seconds spent on a single point, the point stops
+            after the repetition that exceeds it.
+        max_duration: Optional[int]
+            When set, the duration of the benchmark is doubled, up to `max_duration`
+            seconds, for every repetition after `min_repeats` without convergence.
+            The metric should then not depend on the duration e.g. a throughput.
+        -
+        """
+        super().__init__(
+            metric=metric,
+            target_ci=target_ci,
+            confidence=confidence,
+            min_repeats=min_repeats,
+            max_repeats=max_repeats,
+            time_budget=time_budget,
+            max_duration=max_duration,
+        )
+        self.metric = metric
+        self.target_ci = target_ci
+        self.confidence = confidence
+        self.min_repeats = max(min_repeats, 2)
+        self.max_repeats = max_repeats
+        self.time_budget = time_budget
+        self.max_duration = max_duration
+        if confidence not in SUPPORTED_CONFIDENCES:
+            bm_log(
+                f"Unsupported confidence {confidence}, use one of {SUPPORTED_CONFIDENCES}",
+                LogType.FATAL,
+            )
+            sys.exit(1)
+        if self.max_repeats < self.min_repeats:
+            bm_log(
+                f"max_repeats ({max_repeats}) must be at least min_repeats ({self.min_repeats})",
+                LogType.FATAL,
+            )
+            sys.exit(1)
+
+
 class BenchmarkConfig(dict):
     CONFIG_KEY: str = "benchmark_config"
 
@@ -51,6 +160,14 @@ class BenchmarkConfig(dict):
         exec_env: list[ExecutionType] = [ExecutionType.NATIVE, ExecutionType.CONTAINER],
         monitors: dict[MonitorType, list[str]] = {},
         threads: Optional[ListConfig] = None,
+        ready_timeout: int = 60,
+        adaptive: Optional[AdaptiveConfig] = None,
+        schedule: SchedulePolicy = SchedulePolicy.NESTED,
+        shards: int = 1,
+        warmup: int = 0,
+        cooldown: int = 0,
+        interval_ms: int = 0,
+        output_format: OutputFormat = OutputFormat.TEXT,
     ):
         """
         General configuration for benchmarks, as well as a collection
@@ -80,6 +197,49 @@ class BenchmarkConfig(dict):
         threads: ListConfig = {"values": [[1]]}
             Determines number of threads to run target benchmarks with.
             If not provided all applications will be run with 1 thread.
+        ready_timeout: int
+            Maximum time in seconds to wait for all execution units to be
+            ready before giving the start signal. The signal is given as soon
+            as all units are ready.
+            JSON example: `"ready_timeout": 120`
+        adaptive: Optional[AdaptiveConfig]
+            When set, the number of repetitions of each point is decided at runtime
+            and `repeat` is ignored.
+            JSON example: `"adaptive": {"metric": "throughput_min", "target_ci": 0.02}`
+        schedule: SchedulePolicy = "nested"
+            Order in which the points of the campaign are run. The cost of every
+            point is recorded in `results/cost_model.json` to estimate the remaining
+            time of the next campaigns.
+            JSON example: `"schedule": "min_switches"`
+        shards: int = 1
+            Maximum number of points of the campaign that run at the same time.
+            Consecutive points (see `schedule`) are packed as long as all their units
+            fit on distinct cpus, each point gets its own cpus and ports.
+            The results are tagged with `shard_id` and `shard_size` so that co-scheduled
+            points can be told apart. `1` runs one point at a time. It must be `1`
+            when plugins or NICs are configured, as they cannot be shared by points.
+            JSON example: `"shards": 4`
+        warmup: int = 0
+            Time in seconds the execution units run after the start signal before the
+            measurement window begins. Builtin benchmarks do not record the operations of
+            the warm-up, and monitors only start with the measurement window.
+            The runner creates `build/bench/measure` for the duration of the window.
+            JSON example: `"warmup": 5`
+        cooldown: int = 0
+            Time in seconds the execution units keep running after the measurement window,
+            e.g. to avoid measuring while other units stop. The whole run lasts
+            `warmup + duration + cooldown` seconds.
+            JSON example: `"cooldown": 2`
+        interval_ms: int = 0
+            Period in milliseconds at which builtin benchmarks print the throughput and the
+            latency histogram of the last interval of the measurement window. The intervals
+            of every run are saved in `timeseries.csv`, one row per execution unit and interval,
+            next to the results of the run. `0` disables the time series.
+            JSON example: `"interval_ms": 100`
+        output_format: OutputFormat = "text"
+            Format in which builtin benchmarks report their results to the runner. The
+            results of the campaign are the same in both formats.
+            JSON example: `"output_format": "jsonl"`
         -
         """
         self.duration = duration
@@ -88,6 +248,14 @@ class BenchmarkConfig(dict):
         self.noise = noise
         self.exec_env = exec_env
         self.monitors = monitors
+        self.ready_timeout = ready_timeout
+        self.adaptive = AdaptiveConfig(**adaptive) if adaptive is not None else None
+        self.schedule = SchedulePolicy(schedule)
+        self.shards = max(shards, 1)
+        self.warmup = warmup
+        self.cooldown = cooldown
+        self.interval_ms = interval_ms
+        self.output_format = OutputFormat(output_format)
         self.threads = (
             ListConfig.from_dict(threads).get_list()
             if threads is not None
@@ -1,15 +1,52 @@
 # Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
 # SPDX-License-Identifier: MIT
 
+from enum import Enum
 from typing import Optional
 from config.list import ListConfig
-import docker
+from utils.docker_client import get_docker_client
 import docker.errors
 import sys
 from utils.logger import bm_log, LogType
+from utils.trace import g_tracer
 from utils.platform import get_os, OperatingSystem
 
 
+class PlacementStrategy(str, Enum):
+    """
+    Strategy used to assign cpus to the execution units, based on the cpu
+    topology of the machine (NUMA nodes, SMT siblings and last level caches).
+
+    Members
+    ----------
+    LINEAR: Each unit gets `core_count` consecutive cpus starting at its core affinity offset.
+    COMPACT: Fills a NUMA node, one LLC and one physical core (with its SMT siblings) at a time.
+    SPREAD: Distributes the units over the NUMA nodes in a round robin fashion.
+    NO_SMT: Uses a single hardware thread per physical core, as long as there are enough cores.
+    LLC: Keeps the cpus of each unit within a single last level cache domain when possible.
+    """
+
+    LINEAR = "linear"
+    COMPACT = "compact"
+    SPREAD = "spread"
+    NO_SMT = "no_smt"
+    LLC = "llc"
+
+
+class CpuOrder(str, Enum):
+    """
+    Order in which the cpus are assigned to the execution units.
+
+    Members
+    ----------
+    ASC: Starts from the lowest cpu numbers.
+    DESC: Starts from the highest cpu numbers.
+    """
+
+    ASC = "asc"
+    DESC = "desc"
+
+
 class ContainersConfig(dict):
     CONFIG_KEY: str = "containers"
     DEFAULT_IMG: dict[OperatingSystem, str] = {
@@ -26,6 +63,11 @@ class ContainersConfig(dict):
         name: str = "",
         image: Optional[str] = None,
         port: Optional[int] = None,
+        launch_concurrency: int = 1,
+        pool: bool = False,
+        port_auto_shift: bool = False,
+        placement: PlacementStrategy = PlacementStrategy.LINEAR,
+        cpu_order: CpuOrder = CpuOrder.ASC,
     ):
         """
         ContainersConfig represents the configuration for multiple containers.
@@ -47,9 +89,42 @@ class ContainersConfig(dict):
             The starting port number to use for the first container.
             Subsequent containers will use incremented port numbers.
             This configuration is relevant for networking benchmarks.
+            The whole range of ports is checked before launching, and the run is
+            aborted if any of them is in use (see `port_auto_shift`).
+        launch_concurrency: int
+            Number of containers that are created and started, and then stopped
+            and removed, in parallel. With `1` containers are launched one after
+            the other. NICs are always attached in the order of the containers.
+        pool: bool = false
+            When set to `true`, containers are kept alive between the runs of a
+            campaign and the benchmarks are started in them with `docker exec`.
+            A container is reused by the following runs as long as its image, cores,
+            port and NIC do not change, otherwise it is replaced. Pooled containers
+            are removed at the end of the campaign.
+        port_auto_shift: bool = false
+            When set to `true` and some ports of the range are in use, the next
+            free range of ports is used instead of aborting the run. The first port
+            of the range is recorded as `port_start` in the results.
+        placement: PlacementStrategy = "linear"
+            How cpus are assigned to the containers and native processes.
+            `core_affinity_offsets` are only used by the `linear` strategy.
+            The assigned cpus are recorded for every unit in the results.
+        cpu_order: CpuOrder = "asc"
+            Whether cpus are assigned starting from the lowest or the highest
+            cpu numbers. A top-level `"cpu_order": {"value": "desc"}` is also accepted.
         -
         """
-        super().__init__(image=image, name=name, core_count=core_count, port=port)
+        super().__init__(
+            image=image,
+            name=name,
+            core_count=core_count,
+            port=port,
+            launch_concurrency=launch_concurrency,
+            pool=pool,
+            port_auto_shift=port_auto_shift,
+            placement=placement,
+            cpu_order=cpu_order,
+        )
         self.container_list = ListConfig.from_dict(container_list).get_list()
         self.core_count = core_count
         self.core_affinity_offsets = (
@@ -61,6 +136,16 @@ class ContainersConfig(dict):
         bm_log(f"Selected image {self.image}", LogType.INFO)
         self.name = name
         self.port = port
+        if launch_concurrency < 1:
+            bm_log(
+                f"launch_concurrency must be at least 1, got {launch_concurrency}", LogType.FATAL
+            )
+            sys.exit(1)
+        self.launch_concurrency = launch_concurrency
+        self.pool = pool
+        self.port_auto_shift = port_auto_shift
+        self.placement = PlacementStrategy(placement)
+        self.cpu_order = CpuOrder(cpu_order)
         self.__ensure_img_exists()
 
     def get_container_cnt_list(self) -> list[int]:
@@ -70,7 +155,7 @@ class ContainersConfig(dict):
         return self.core_affinity_offsets
 
     def __pull_image(self):
-        client = docker.from_env()
+        client = get_docker_client()
         bm_log(f"Docker image {self.image} does not exist. Pulling it now...\n", LogType.INFO)
         try:
             client.images.pull(self.image)
@@ -79,8 +164,9 @@ class ContainersConfig(dict):
             sys.exit(1)
 
     def __ensure_img_exists(self):
-        client = docker.from_env()
-        try:
-            client.images.get(self.image)
-        except docker.errors.ImageNotFound:
-            self.__pull_image()
+        client = get_docker_client()
+        with g_tracer.span("check image"):
+            try:
+                client.images.get(self.image)
+            except docker.errors.ImageNotFound:
+                self.__pull_image()
@@ -14,15 +14,19 @@ class PlotType(str, Enum):
     NORMAL: Plots according to the config no post processing of data.
     MIN_MAX_AVG: Experimental, Plots min, max and average time of operations.
     HISTOGRAM: Experimental, Plots the distribution of operations.
+    PERCENTILES: Plots the p50, p90, p99 and p99.9 of `<y>_histogram`, merged over the rows of the same `x` and `hue`.
     SUCCESS_PERCENT: Experimental, Plots the percentage of successful operations.
     LINEARITY: Calculates and plots the linearity of the benchmark results.
+    TIMESERIES: Plots `y` of `timeseries.csv` (e.g. `throughput`) over the measurement window, one line per `hue`. Requires `interval_ms`.
     """
 
     NORMAL = "normal"
     MIN_MAX_AVG = "min_max_avg"
     HISTOGRAM = "histogram"
+    PERCENTILES = "percentiles"
     SUCCESS_PERCENT = "success_percent"
     LINEARITY = "linearity"
+    TIMESERIES = "timeseries"
 
 
 class PlotConfig(dict):
@@ -32,8 +36,10 @@ class PlotConfig(dict):
         PlotType.NORMAL: "lineplot",
         PlotType.MIN_MAX_AVG: "barplot",
         PlotType.HISTOGRAM: "boxenplot",
+        PlotType.PERCENTILES: "lineplot",
         PlotType.SUCCESS_PERCENT: "barplot",
         PlotType.LINEARITY: "lineplot",
+        PlotType.TIMESERIES: "lineplot",
     }
 
     def __init__(
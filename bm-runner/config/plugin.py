@@ -63,8 +63,11 @@ class Plugin(dict):
             or if it is available system wide.
         args: list[str]
             List of arguments to be passed to the script/process.
-            It can include one place holder: `{homedir}`.
-            This is replaced at runtime with the path of the build directory of the CSB project.
+            It can include the place holders: `{homedir}`, `{n_units}`, `{res_dir}`, `{port_start}`, `{start_file}` and `{measure_file}`.
+            These are replaced at runtime with the path of the build directory of the CSB project,
+            the number of execution units, the results directory, the first port used
+            by the execution units (see `port` in containers), the file created once the units
+            are started and the file that exists during the measurement window respectively.
         force_stop: bool
             Whether to forcefully stop the process if it is still running during cleanup.
         -
@@ -3,8 +3,15 @@
 
 import inspect
 from config.application import Application, Adapter
-from config.benchmark import BenchmarkConfig, MonitorType, ExecutionType
-from config.container import ContainersConfig
+from config.benchmark import (
+    BenchmarkConfig,
+    MonitorType,
+    ExecutionType,
+    AdaptiveConfig,
+    SchedulePolicy,
+    OutputFormat,
+)
+from config.container import ContainersConfig, PlacementStrategy, CpuOrder
 from config.plugin import Plugin, ExecutionTime
 from config.plot import PlotConfig, PlotType
 from config.list import ListConfig, RangeConfig
@@ -16,8 +23,17 @@ from config.env_config import UniversalConfig
 import sys
 import re
 
-g_enums = [MonitorType, PlotType, ExecutionTime, ExecutionType]
-g_sub_types = [Adapter, ListConfig, RangeConfig]
+g_enums = [
+    MonitorType,
+    PlotType,
+    ExecutionTime,
+    ExecutionType,
+    PlacementStrategy,
+    CpuOrder,
+    SchedulePolicy,
+    OutputFormat,
+]
+g_sub_types = [Adapter, ListConfig, RangeConfig, AdaptiveConfig]
 # main types are those that exist directly in JSON and have a CONFIG_KEY defined
 g_main_types = [BenchmarkConfig, Application, ContainersConfig, Plugin, PlotConfig, NicsConfig]
 main_config = CampaignConfig
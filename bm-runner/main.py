@@ -6,6 +6,9 @@ import pathlib
 import sys
 from pathlib import Path
 import bm_visualize
+import bm_store
+from bm_index import ResultIndex
+import bm_container
 from benchmark import ScalabilityBenchmark
 from benchkit.benchmark import (
     CommandWrapper,
@@ -13,12 +16,14 @@ from benchkit.benchmark import (
     PostRunHook,
     CommandAttachment,
 )
-from benchkit.campaign import CampaignCartesianProduct, CampaignSuite
+from benchkit.campaign import CampaignCartesianProduct, CampaignIterateVariables, CampaignSuite
 from benchkit.utils.dir import get_curdir, parentdir
 from typing import Iterable, Optional, Dict, Any
 import bm_config
 from bm_config import CampaignConfig
-from config.benchmark import ExecutionType
+from config.benchmark import ExecutionType, SchedulePolicy
+from bm_scheduler import CampaignScheduler, CostModel
+from bm_cache import ResultCache, get_config_fingerprint
 import traceback
 from bm_utils import remove_files_by_ext
 from utils.logger import bm_log, LogType
@@ -46,7 +51,10 @@ def v_campaign(
     continuing: bool = False,
     constants: Optional[Dict[str, Any]] = None,
     pretty: Optional[Dict[str, str]] = None,
-) -> CampaignCartesianProduct:
+    schedule: SchedulePolicy = SchedulePolicy.NESTED,
+    repeats_per_run: int = 1,
+    cache: Optional[ResultCache] = None,
+) -> CampaignCartesianProduct | CampaignIterateVariables:
     variables = {
         "nb_threads": nb_threads,
         "noise": noise,
@@ -59,17 +67,33 @@ def v_campaign(
     if pretty is not None:
         pretty_dict = {"lock": pretty}
 
-    return CampaignCartesianProduct(
-        name=name,
-        benchmark=ScalabilityBenchmark(
-            command_wrappers=command_wrappers,
-            command_attachments=command_attachments,
-            shared_libs=shared_libs,
-            post_run_hooks=post_run_hooks,
-            csb_dir=csb_dir,
+    # the cost of the points is shared by all the campaigns of the machine
+    assert bm_config.g_config is not None
+    scheduler = CampaignScheduler(
+        variables=variables,
+        policy=schedule,
+        cost_model=CostModel(
+            os.path.join("../results", "cost_model.json"),
+            config=get_config_fingerprint(bm_config.g_config.config),
         ),
+        duration=benchmark_duration_seconds,
+        nb_runs=nb_runs,
+        repeats=repeats_per_run,
+    )
+    scheduler.log_plan()
+    benchmark = ScalabilityBenchmark(
+        command_wrappers=command_wrappers,
+        command_attachments=command_attachments,
+        shared_libs=shared_libs,
+        post_run_hooks=post_run_hooks,
+        csb_dir=csb_dir,
+        scheduler=scheduler,
+        cache=cache,
+    )
+    kwargs: Dict[str, Any] = dict(
+        name=name,
+        benchmark=benchmark,
         nb_runs=nb_runs,
-        variables=variables,
         constants=constants,
         debug=debug,
         gdb=gdb,
@@ -81,6 +105,9 @@ def v_campaign(
             "../results", EnvUniversalConfig.get(UniversalConfig.CSB_RESULTS_GROUP) or ""
         ),
     )
+    if schedule == SchedulePolicy.NESTED:
+        return CampaignCartesianProduct(variables=variables, **kwargs)
+    return CampaignIterateVariables(variables=scheduler.get_points(), **kwargs)
 
 
 ###########################################################################
@@ -91,6 +118,11 @@ if __name__ == "__main__":
         help="Rebuild plots instead of running the benchmark.",
         action="store_true",
     )
+    parser.add_argument(
+        "--resume",
+        help="Store the results of every run, and skip the runs whose results are already stored for the same configuration, binaries, image and system. Skipped runs have no trace nor per-unit outputs.",
+        action="store_true",
+    )
     parser.add_argument("--title", help="The Benchmark title.", required=True)
     parser.add_argument(
         "--config",
@@ -132,7 +164,23 @@ if __name__ == "__main__":
         execution_type=benchmark_config.exec_env,
         noise=benchmark_config.noise,
         initial_size=benchmark_config.initial_size,
-        nb_runs=benchmark_config.repeat,
+        # in adaptive mode the repetitions happen within each run
+        nb_runs=1 if benchmark_config.adaptive is not None else benchmark_config.repeat,
+        repeats_per_run=(
+            benchmark_config.adaptive.min_repeats if benchmark_config.adaptive is not None else 1
+        ),
+        schedule=benchmark_config.schedule,
+        # the outputs of the runs are only stored when they can be reused
+        cache=(
+            ResultCache(
+                cache_dir=os.path.join("../results", "cache"),
+                config=bm_config.g_config.config,
+                apps=bm_config.g_config.get_apps(),
+                image=container_cfg.image,
+            )
+            if args.resume
+            else None
+        ),
         continuing=arg_continue,
         enable_data_dir=True,
         bench_subdir="bench",
@@ -142,7 +190,13 @@ if __name__ == "__main__":
     if not arg_continue:
         campaign_suite.print_durations()
         campaign_suite.run_suite()
+        bm_container.g_container_pool.teardown()
         results_dir = campaign.base_data_dir()
+        if results_dir is not None:
+            bm_store.convert_results(results_dir)
+            index = ResultIndex()
+            index.ingest_campaign(results_dir)
+            index.close()
     else:
         results_dir = dir_arg[0]
         remove_files_by_ext(results_dir, ["png", "pdf"])
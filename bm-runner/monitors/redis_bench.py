@@ -3,10 +3,15 @@
 
 import pandas as pd
 from pathlib import Path
+from bm_histogram import merge_quantiles
 from monitors.monitor import Monitor
 
 
 class RedisStats(Monitor):
+    # columns of the output of redis-benchmark -> quantile of the latencies
+    QUANTILES = {"min": 0.0, "p50": 0.5, "p95": 0.95, "p99": 0.99, "max": 1.0}
+    PERCENTILES = ["p50", "p95", "p99"]
+
     def __init__(self, output_dir: Path, args: list[str] = []):
         super().__init__(dir=output_dir, args=args)
         assert len(args) > 0, "at least one argument should be there"
@@ -20,16 +25,24 @@ class RedisStats(Monitor):
 
     def collect_results(self) -> str:
         data = pd.read_csv(self.dir / self.fname)
-        # OK/NOT OK: redis-benchmark provides the statistics like requests per seconds, avg. latency, etc. as a list for a number of requests. What we want to achieve here is to aggregate the lists per metric into a single number. It should be statistically meaningful to calculate average RPS and latency with mean, and min and max latencies with the corresponding functions (OK), but it is probably not right for p50/p95/p99 latencies (NOT OK).
-        agg_data = data.agg(
-            {
-                "rps": "mean",  # OK
-                "avg_latency_ms": "mean",  # OK
-                "min_latency_ms": "min",  # OK
-                "p50_latency_ms": "mean",  # NOT OK?
-                "p95_latency_ms": "max",  # NOT OK
-                "p99_latency_ms": "max",  # NOT OK
-                "max_latency_ms": "max",  # OK
-            }
+        # redis-benchmark provides the statistics, e.g. requests per second or
+        # latencies, per test. The averages are the mean of those of the tests,
+        # as every test runs the same number of requests. The percentiles of all
+        # requests are those of the average of the CDFs of the tests, which are
+        # linear between their known percentiles.
+        percentiles = merge_quantiles(
+            [
+                {q: row[f"{name}_latency_ms"] for name, q in self.QUANTILES.items()}
+                for _, row in data.iterrows()
+            ],
+            [self.QUANTILES[p] for p in self.PERCENTILES],
         )
+        agg_data = {
+            "rps": data["rps"].mean(),
+            "avg_latency_ms": data["avg_latency_ms"].mean(),
+            "min_latency_ms": data["min_latency_ms"].min(),
+        }
+        for name, value in zip(self.PERCENTILES, percentiles):
+            agg_data[f"{name}_latency_ms"] = round(value, 3)
+        agg_data["max_latency_ms"] = data["max_latency_ms"].max()
         return "".join(["{}={};".format(i, v) for i, v in agg_data.items()])
@@ -0,0 +1,46 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import os
+import pytest
+from config.adapter import Adapter
+
+STRESS_NG_OUTPUT = """stress-ng: info:  [10] dispatching hogs: 2 futex
+stress-ng: metrc: [10] stressor       bogo ops real time  usr time  sys time   bogo ops/s     bogo ops/s CPU used per       RSS Max
+stress-ng: metrc: [10]                           (secs)    (secs)    (secs)   (real time) (usr+sys time) instance (%)          (KB)
+stress-ng: metrc: [10] futex            4051434     10.00      1.27     16.68    405119.96      225706.35        89.75          1628
+stress-ng: info:  [10] successful run completed in 10.00 secs
+"""
+
+
+def test_regex_adapter():
+    adapter = Adapter(regex=r"(?P<throughput_lps>[0-9.]+)\s+lps")
+    output = "System Call Overhead   1234.5 lps   (10.0 s)\nnothing\nPipe   99 lps\n"
+    assert adapter.adapt(output) == "throughput_lps=1234.5;\nthroughput_lps=99;\n"
+    assert Adapter(regex="average:(?P<average>[^:]*)").adapt("average: 42\n") == "average= 42;\n"
+
+
+def test_function_adapter(tmp_path):
+    with open(os.path.join(tmp_path, "my_adapter.py"), "w") as f:
+        f.write("def adapt(output):\n    return {'lines': len(output.splitlines())}\n")
+        f.write("def raw(output):\n    return 'x=1;\\n'\n")
+    assert Adapter(function="my_adapter:adapt", path=tmp_path).adapt("a\nb\n") == "lines=2;\n"
+    assert Adapter(function="my_adapter:raw", path=tmp_path).adapt("") == "x=1;\n"
+
+
+def test_stress_ng_adapter():
+    adapter = Adapter(function="stress_ng_adapter:adapt")
+    assert adapter.adapt(STRESS_NG_OUTPUT) == (
+        "stressor=futex;ops=4051434;real_time=10.00;usr_time=1.27;sys_time=16.68;"
+        "throughput_real=405119.96;throughput_cpus=225706.35;cpu_percent=89.75;rss_max=1628;\n"
+    )
+    assert adapter.adapt("") == ""
+
+
+def test_invalid_adapter():
+    with pytest.raises(SystemExit):
+        Adapter()
+    with pytest.raises(SystemExit):
+        Adapter(name="a.sh", regex="(?P<a>.)")
+    with pytest.raises(SystemExit):
+        Adapter(regex="no group")
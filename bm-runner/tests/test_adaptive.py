@@ -0,0 +1,76 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import json
+from bm_adaptive import run_adaptive
+from bm_parser import OutputParser, decode_result_line, parse_output_line
+from config.benchmark import AdaptiveConfig
+from utils.stats import relative_ci, t_critical
+
+
+def test_relative_ci():
+    assert t_critical(0.95, 4) == 2.776
+    assert t_critical(0.95, 35) == 2.042
+    assert relative_ci([10.0], 0.95) is None
+    assert relative_ci([10.0, 10.0, 10.0], 0.95) == 0.0
+    # mean 10, sample stdev sqrt(4/3), n=4: 3.182 * sqrt(4/3) / 2 / 10
+    assert abs(relative_ci([9.0, 11.0, 9.0, 11.0], 0.95) - 0.18373) < 1e-4
+
+
+def fake_runs(values):
+    durations = []
+
+    def run(duration):
+        durations.append(duration)
+        value = values[len(durations) - 1]
+        return f"execution_unit=N000_x;throughput={value};\nexecution_unit=N001_x;throughput={value};\n"
+
+    return run, durations
+
+
+def test_adaptive_converges():
+    run, durations = fake_runs([100.0, 101.0, 100.5, 100.0])
+    cfg = AdaptiveConfig(metric="throughput", target_ci=0.05, min_repeats=3)
+    rows = [parse_output_line(line) for line in run_adaptive(cfg, 2, run).splitlines()]
+    assert durations == [2, 2, 2]
+    assert len(rows) == 6
+    assert {row["adaptive_repeats"] for row in rows} == {"3"}
+    assert {row["adaptive_converged"] for row in rows} == {"1"}
+    assert [row["repeat_idx"] for row in rows] == ["0", "0", "1", "1", "2", "2"]
+
+
+def test_adaptive_max_repeats_and_duration():
+    run, durations = fake_runs([10.0, 100.0, 10.0, 100.0])
+    cfg = AdaptiveConfig(
+        metric="throughput", target_ci=0.01, min_repeats=2, max_repeats=4, max_duration=5
+    )
+    rows = [parse_output_line(line) for line in run_adaptive(cfg, 2, run).splitlines()]
+    assert durations == [2, 2, 4, 5]
+    assert {row["adaptive_converged"] for row in rows} == {"0"}
+    assert float(rows[0]["adaptive_ci"]) > 0.01
+
+
+def test_adaptive_jsonl():
+    values = [100.0, 100.0, 100.0]
+
+    def run(duration):
+        value = values.pop()
+        record = {"execution_unit": "N000_x", "app": "x", "throughput": value, "op0_count": 3}
+        return json.dumps(record) + "\n"
+
+    cfg = AdaptiveConfig(metric="throughput", target_ci=0.05, min_repeats=2)
+    output = run_adaptive(cfg, 2, run)
+    records = OutputParser().parse_records(
+        [decode_result_line(line) for line in output.splitlines()]
+    )
+    assert len(records) == 2
+    assert list(records[1])[:6] == [
+        "repeat_idx",
+        "run_duration_s",
+        "adaptive_repeats",
+        "adaptive_ci",
+        "adaptive_converged",
+        "execution_unit",
+    ]
+    assert records[1]["repeat_idx"] == 1 and records[1]["adaptive_converged"] == 1
+    assert records[1]["throughput"] == 100.0 and records[1]["op0_count"] == 3
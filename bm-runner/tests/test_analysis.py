@@ -0,0 +1,60 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import numpy as np
+from pandas import DataFrame
+from bm_analysis import flag_outliers, summarize, summarize_results
+from utils.stats import bootstrap_ci
+
+
+def make_results() -> DataFrame:
+    return DataFrame(
+        {
+            "container_cnt": [1] * 5 + [2] * 3 + [4],
+            "execution_unit": ["C0"] * 9,
+            "rep": [0, 1, 2, 3, 4, 0, 1, 2, 0],
+            "throughput": [100.0, 101.0, 99.0, 100.0, 500.0, 10.0, 20.0, 30.0, 7.0],
+            "usr_time": [1, 1, 1, 1, 1, 2, 2, 2, 3],
+        }
+    )
+
+
+def test_bootstrap_ci():
+    rng = np.random.default_rng(1)
+    samples = rng.normal(100, 10, (3, 30, 2))
+    low, high = bootstrap_ci(samples, 0.95)
+    assert low.shape == high.shape == (3, 2)
+    means = samples.mean(axis=1)
+    assert (low < means).all() and (means < high).all()
+    # about the normal interval of the mean
+    half = 1.96 * samples.std(axis=1, ddof=1) / np.sqrt(30)
+    assert np.allclose(high - low, 2 * half, rtol=0.25)
+    assert np.array_equal(bootstrap_ci(samples, 0.95)[0], low)
+
+
+def test_flag_outliers():
+    flags = flag_outliers(make_results(), ["container_cnt"], ["throughput", "usr_time"])
+    assert flags["throughput_outlier"].tolist() == [False] * 4 + [True] + [False] * 4
+    assert not flags["usr_time_outlier"].any()
+
+
+def test_summarize():
+    summary = summarize(make_results(), ["container_cnt"], ["throughput"])
+    assert summary["container_cnt"].tolist() == [1, 2, 4]
+    assert summary["samples"].tolist() == [5, 3, 1]
+    assert summary["throughput_mean"].tolist() == [180.0, 20.0, 7.0]
+    assert summary["throughput_median"].tolist() == [100.0, 20.0, 7.0]
+    assert summary["throughput_outliers"].tolist() == [1, 0, 0]
+    assert summary["throughput_cv"][1] == 0.5
+    low, high = summary["throughput_ci_low"], summary["throughput_ci_high"]
+    assert low[0] < 180.0 < high[0] and 10.0 <= low[1] < 20.0 < high[1] <= 30.0
+    # no interval for a single sample
+    assert np.isnan(low[2]) and np.isnan(high[2])
+
+
+def test_summarize_results():
+    summary = summarize_results(make_results())
+    assert list(summary.columns[:3]) == ["container_cnt", "execution_unit", "samples"]
+    # the repeat is not a metric
+    assert "rep_mean" not in summary.columns
+    assert "usr_time_mean" in summary.columns
@@ -0,0 +1,42 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import subprocess
+import time
+from bm_barrier import StartBarrier
+
+
+def launch_units(barrier: StartBarrier, tmp_path, count: int) -> list[subprocess.Popen]:
+    return [
+        subprocess.Popen(["bash", "-c", barrier.get_wait_cmd(f"{tmp_path}/{i}.release", False)])
+        for i in range(count)
+    ]
+
+
+def test_barrier_release(tmp_path):
+    units = 4
+    barrier = StartBarrier(f"{tmp_path}/start.fifo")
+    barrier.create()
+    try:
+        procs = launch_units(barrier, tmp_path, units)
+        assert barrier.wait_ready(units, timeout=10) == units
+        # nobody passes the barrier before the release
+        assert all(p.poll() is None for p in procs)
+        release_time = time.time()
+        barrier.release(units, release_time)
+        for p in procs:
+            assert p.wait(timeout=10) == 0
+        for i in range(units):
+            released = StartBarrier.read_release_time(f"{tmp_path}/{i}.release")
+            assert released is not None and released >= release_time - 1
+    finally:
+        barrier.destroy()
+
+
+def test_barrier_ready_timeout(tmp_path):
+    barrier = StartBarrier(f"{tmp_path}/start.fifo")
+    barrier.create()
+    try:
+        assert barrier.wait_ready(1, timeout=0.1) == 0
+    finally:
+        barrier.destroy()
@@ -0,0 +1,63 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+from bm_cache import ResultCache, get_config_fingerprint
+from config.application import Application
+from config.benchmark import ExecutionType
+
+CONFIG = {
+    "benchmark_config": {"duration": 5, "threads": {"values": [[1], [2]]}, "repeat": 3},
+    "containers": {"container_list": {"values": [[1, 2]]}, "core_count": 1},
+    "applications": [{"name": "bench"}],
+}
+POINT = {
+    "nb_threads": [1],
+    "noise": 0,
+    "initial_size": 0,
+    "container_cnt": 2,
+    "execution_type": ExecutionType.NATIVE,
+}
+
+
+def test_config_fingerprint():
+    fingerprint = get_config_fingerprint(CONFIG)
+    # the points of the campaign are not part of the fingerprint
+    grown = {
+        **CONFIG,
+        "benchmark_config": {**CONFIG["benchmark_config"], "threads": {"values": [[1], [4]]}},
+        "containers": {**CONFIG["containers"], "container_list": {"values": [[1, 8]]}},
+        "plots": [{"type": "line"}],
+    }
+    assert get_config_fingerprint(grown) == fingerprint
+    changed = {**CONFIG, "containers": {**CONFIG["containers"], "core_count": 2}}
+    assert get_config_fingerprint(changed) != fingerprint
+
+
+def make_cache(tmp_path, config=CONFIG):
+    return ResultCache(
+        cache_dir=str(tmp_path),
+        config=config,
+        apps=[Application(name="true")],
+        image="ubuntu:latest",
+    )
+
+
+def test_resume(tmp_path):
+    cache = make_cache(tmp_path)
+    first = cache.get_fingerprint(POINT, 5)
+    second = cache.get_fingerprint(POINT, 5)
+    # every run of a point has its own entry
+    assert first != second
+    assert cache.load(first) is None
+    cache.store(first, "execution_unit=N000;throughput=1;\n")
+
+    cache = make_cache(tmp_path)
+    fingerprint = cache.get_fingerprint(POINT, 5)
+    assert fingerprint == first
+    assert cache.load(fingerprint) == "execution_unit=N000;throughput=1;\n"
+    assert cache.load(cache.get_fingerprint(POINT, 5)) is None
+    assert cache.get_fingerprint(POINT, 10) != first
+
+    changed = {**CONFIG, "benchmark_config": {**CONFIG["benchmark_config"], "duration": 6}}
+    cache = make_cache(tmp_path, config=changed)
+    assert cache.load(cache.get_fingerprint(POINT, 5)) is None
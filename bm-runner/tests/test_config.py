@@ -0,0 +1,14 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import pytest
+from bm_config import check_shards
+from config.plugin import ExecutionTime, Plugin
+
+
+def test_shards_refuse_plugins():
+    plugins = [Plugin(name="sleep", exec_time=ExecutionTime.PRE, args=["1"])]
+    check_shards(1, plugins, None)
+    check_shards(4, [], None)
+    with pytest.raises(SystemExit):
+        check_shards(2, plugins, None)
@@ -0,0 +1,35 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import bm_container
+from bm_container import ContainerPool
+
+
+class FakeApi:
+    def __init__(self):
+        self.removed = []
+
+    def remove_container(self, name, force=False):
+        self.removed.append(name)
+
+
+class FakeClient:
+    def __init__(self):
+        self.api = FakeApi()
+
+
+def test_pool_release(monkeypatch):
+    client = FakeClient()
+    monkeypatch.setattr(bm_container, "get_docker_client", lambda: client)
+    pool = ContainerPool()
+    for name, shard in [("C000_a", None), ("C001_a", None), ("S0_C000_a", 0), ("S1_C000_a", 1)]:
+        pool.entries[name] = ((), name, False, shard)
+    # the point has fewer containers than the previous one
+    pool.release_unused(None, ["C000_a"])
+    assert client.api.removed == ["C001_a"]
+    # fewer points run at the same time
+    pool.release_shards([None, 0])
+    assert client.api.removed == ["C001_a", "S1_C000_a"]
+    pool.teardown()
+    assert sorted(client.api.removed[2:]) == ["C000_a", "S0_C000_a"]
+    assert pool.entries == {}
@@ -0,0 +1,151 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import numpy as np
+import pytest
+from pandas import DataFrame
+from bm_histogram import (
+    BUCKET_BOUNDS,
+    NUM_BUCKETS,
+    LatencyHistogram,
+    get_merged_percentiles,
+    get_merged_samples,
+    get_percentile_columns,
+    get_percentiles,
+    merge_quantiles,
+)
+from bm_parser import OutputParser, parse_output_line
+from monitors.redis_bench import RedisStats
+
+# `op_time_ranges` printed by bm_empty with `-f=1`
+C_BOUNDS_HEAD = [99, 209, 330, 463, 609, 769, 945, 1138, 1350, 1583]
+C_BOUNDS_TAIL = [200560, 220692, 242837, 267196, 293990]
+
+
+def test_bucket_bounds():
+    assert len(BUCKET_BOUNDS) == NUM_BUCKETS
+    assert BUCKET_BOUNDS[:10].tolist() == C_BOUNDS_HEAD
+    assert BUCKET_BOUNDS[-5:].tolist() == C_BOUNDS_TAIL
+
+
+def test_percentiles():
+    counts = np.zeros((3, NUM_BUCKETS), dtype=np.int64)
+    # 100 operations, 90 in [0, 99], 9 in [100, 209] and 1 in [210, 330]
+    counts[0, :3] = [90, 9, 1]
+    counts[2, 59] = 4
+    p = get_percentiles(counts, [0.5, 0.9, 0.99, 1.0])
+    assert p[0].tolist() == [99 * 50 / 90, 99.0, 209.0, 330.0]
+    assert np.isnan(p[1]).all()
+    assert p[2, -1] == BUCKET_BOUNDS[-1]
+    # the percentiles of merged histograms are not those of merged percentiles
+    merged = get_percentiles(counts[0] + counts[2], [0.99])[0, 0]
+    assert merged > BUCKET_BOUNDS[-2]
+    assert list(get_percentile_columns("op0", counts)) == [
+        "op0_p50",
+        "op0_p90",
+        "op0_p99",
+        "op0_p999",
+    ]
+
+
+def test_parse_percentiles():
+    histogram = ",".join(["90", "9", "1"] + ["0"] * (NUM_BUCKETS - 3))
+    table = OutputParser().parse([f"execution_unit=N000_a;op0_histogram={histogram};count=1;"])[0]
+    assert table.keys == [
+        "execution_unit",
+        "op0_histogram",
+        "op0_p50",
+        "op0_p90",
+        "op0_p99",
+        "op0_p999",
+        "count",
+    ]
+    assert table.to_records()[0]["op0_p99"] == 209.0
+
+
+def test_merge_histograms():
+    rng = np.random.default_rng(0)
+    units = [rng.integers(0, 20000, 1000) for _ in range(4)]
+    merged = LatencyHistogram.merge(LatencyHistogram.from_values(v) for v in units)
+    expected = LatencyHistogram.from_values(np.concatenate(units))
+    assert merged.counts.tolist() == expected.counts.tolist()
+    assert merged.count == 4000
+    assert LatencyHistogram.from_text(merged.to_text()).counts.tolist() == merged.counts.tolist()
+    # the percentiles are within the bucket of the exact ones
+    exact = np.percentile(np.concatenate(units), [50, 99])
+    for value, p in zip(exact, merged.percentiles([0.5, 0.99])):
+        bucket = np.searchsorted(BUCKET_BOUNDS, value)
+        assert BUCKET_BOUNDS[bucket - 1] <= p <= BUCKET_BOUNDS[bucket]
+
+
+def test_merged_percentiles():
+    fast = LatencyHistogram.from_values(np.full(99, 50)).to_text()
+    slow = LatencyHistogram.from_values(np.full(1, 100000)).to_text()
+    df = DataFrame(
+        {
+            "container_cnt": [2, 2, 4],
+            "rep": [0, 1, 0],
+            "op0_histogram": [fast, slow, fast],
+        }
+    )
+    latency = get_merged_percentiles(df, "op0_histogram", ["container_cnt"])
+    assert latency["container_cnt"].tolist() == [2, 4]
+    assert latency["count"].tolist() == [100, 99]
+    # the slow repeat is the tail of the point
+    assert latency["p50"][0] < 99 and latency["p999"][0] > 90000
+    assert latency["p999"][1] < 99
+
+
+def test_redis_stats(tmp_path):
+    with open(tmp_path / "redis.csv", "w") as f:
+        f.write("test,rps,avg_latency_ms,min_latency_ms,p50_latency_ms,p95_latency_ms,")
+        f.write("p99_latency_ms,max_latency_ms\n")
+        f.write("SET,1000,0.5,0.1,0.4,1.0,2.0,5.0\n")
+        f.write("GET,3000,0.2,0.1,0.2,0.3,0.4,1.0\n")
+    results = parse_output_line(RedisStats(tmp_path, ["redis.csv"]).collect_results())
+    assert list(results) == [
+        "rps",
+        "avg_latency_ms",
+        "min_latency_ms",
+        "p50_latency_ms",
+        "p95_latency_ms",
+        "p99_latency_ms",
+        "max_latency_ms",
+    ]
+    assert results["rps"] == "2000.0" and results["max_latency_ms"] == "5.0"
+    # between the p50 of the tests, and below the max of their p99
+    assert 0.2 < float(results["p50_latency_ms"]) < 0.4
+    assert 1.0 < float(results["p99_latency_ms"]) < 2.0
+
+
+def test_redis_stats_single_test(tmp_path):
+    with open(tmp_path / "redis.csv", "w") as f:
+        f.write("test,rps,avg_latency_ms,min_latency_ms,p50_latency_ms,p95_latency_ms,")
+        f.write("p99_latency_ms,max_latency_ms\n")
+        f.write("SET,1000,0.3,0.1,0.279,0.415,0.551,0.9\n")
+    results = parse_output_line(RedisStats(tmp_path, ["redis.csv"]).collect_results())
+    assert results["p50_latency_ms"] == "0.279"
+    assert results["p95_latency_ms"] == "0.415"
+    assert results["p99_latency_ms"] == "0.551"
+
+
+def test_merge_quantiles():
+    test = {0.0: 0.1, 0.5: 0.2, 0.5 + 1e-9: 0.2, 1.0: 1.0}
+    assert merge_quantiles([test], [0.0, 0.5, 1.0]) == pytest.approx([0.1, 0.2, 1.0])
+    assert merge_quantiles([test, test], [0.5, 0.75]) == pytest.approx([0.2, 0.6])
+    # half of the latencies are below 1 and half above 2
+    low, high = {0.0: 0.0, 1.0: 1.0}, {0.0: 2.0, 1.0: 3.0}
+    assert merge_quantiles([low, high], [0.25, 0.5, 0.75]) == pytest.approx([0.5, 1.0, 2.5])
+
+
+def test_merged_samples():
+    fast = LatencyHistogram.from_values(np.full(300, 50)).to_text()
+    slow = LatencyHistogram.from_values(np.full(100, 150)).to_text()
+    df = DataFrame({"container_cnt": [1, 1, 2], "op0_histogram": [fast, slow, fast]})
+    samples = get_merged_samples(df, "op0_histogram", ["container_cnt"], 100)
+    assert samples.columns.tolist() == ["container_cnt", "latency"]
+    assert (samples["container_cnt"] == 1).sum() == 100
+    # the buckets weight the samples: 3/4 of the operations are in the first one
+    first = samples[samples["container_cnt"] == 1]["latency"]
+    assert (first <= BUCKET_BOUNDS[0]).sum() == 75
+    assert (samples[samples["container_cnt"] == 2]["latency"] <= BUCKET_BOUNDS[0]).all()
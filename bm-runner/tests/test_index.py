@@ -0,0 +1,50 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import json
+import os
+import pytest
+from bm_index import ResultIndex, find_campaigns
+
+
+def make_campaign(results_dir, name: str, hostname: str, throughputs: list[float]):
+    output_dir = os.path.join(results_dir, name)
+    os.makedirs(os.path.join(output_dir, "sys-config"))
+    with open(os.path.join(output_dir, "sys-config", "uname.txt"), "w") as f:
+        f.write(f"Linux {hostname} 6.6.0 #1 SMP x86_64 GNU/Linux\n")
+    with open(f"{output_dir}.json", "w") as f:
+        json.dump({"containers": {"image": "csb:latest", "core_count": 1}}, f)
+    with open(f"{output_dir}.csv", "w") as f:
+        f.write("hostname;execution_type;container_cnt;app;throughput;op0_histogram\n")
+        for i, throughput in enumerate(throughputs):
+            f.write(f"{hostname};native;{2 ** i};bm_skip;{throughput};1,2\n")
+    return output_dir
+
+
+def test_index(tmp_path):
+    results_dir = os.path.join(tmp_path, "results")
+    make_campaign(results_dir, "a", "host1", [10.0, 20.0])
+    make_campaign(os.path.join(results_dir, "group"), "b", "host2", [30.0, 40.0])
+    assert [os.path.basename(p) for p in find_campaigns(results_dir)] == ["a", "b"]
+    index = ResultIndex(os.path.join(tmp_path, "index.db"))
+    assert index.ingest(results_dir) == 2
+    # nothing changed
+    assert index.ingest(results_dir) == 0
+    assert index.metrics() == ["throughput"]
+
+    df = index.query("throughput", where={"container_cnt": "2"})
+    assert sorted(df["value"]) == [20.0, 40.0]
+    assert set(df["kernel"]) == {"6.6.0"} and set(df["image"]) == {"csb:latest"}
+    df = index.query("throughput", by=["hostname"], agg="avg")
+    assert df.to_dict("records") == [
+        {"hostname": "host1", "avg": 15.0, "samples": 2},
+        {"hostname": "host2", "avg": 35.0, "samples": 2},
+    ]
+    assert index.query("throughput", since="2999-01-01").empty
+
+    make_campaign(tmp_path, "c", "host3", [50.0])
+    assert index.ingest_campaign(os.path.join(tmp_path, "c"))
+    assert len(index.query("throughput")) == 5
+    with pytest.raises(SystemExit):
+        index.query("throughput", where={"1=1 OR name": "x"})
+    index.close()
@@ -0,0 +1,192 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import random
+import time
+from bm_histogram import PERCENTILES
+from bm_parser import (
+    OutputParser,
+    flatten_records,
+    parse_output_line,
+    read_result_line,
+    tag_result_line,
+)
+
+
+def make_output(n_units: int, n_cpus: int = 64, seed: int = 0) -> list[str]:
+    """
+    Returns the output of a run of builtin benchmarks, with the mpstat
+    columns of every cpu prefixed to every unit.
+    """
+    rnd = random.Random(seed)
+    prefix = "".join(
+        f"cpu{c}_{m}={rnd.uniform(0, 100):.2f};"
+        for c in range(n_cpus)
+        for m in ["usr", "sys", "idle", "iowait"]
+    )
+    lines = []
+    for i in range(n_units):
+        histogram = ",".join(str(rnd.randint(0, 1000)) for _ in range(60))
+        lines.append(
+            f"{prefix}execution_unit=C{i:03d}_bm_skip;app=bm_skip;cpus={i};"
+            f"num_threads=1;algo_name=skiplist;op0_insert_count={rnd.randint(0, 10**6)};"
+            f"op0_insert_avg={rnd.uniform(0, 1000):.2f};op0_insert_histogram={histogram};"
+            f"throughput_min={rnd.uniform(0, 10**4):.8f};"
+        )
+    return lines
+
+
+def test_parse_types():
+    lines = [
+        "execution_unit=N000_a;cpus=0;count=10;avg=1.50;name=x;op_histogram=1,2,3;",
+        "",
+        "execution_unit=N001_a;cpus=1;count=12;avg=2;name=y;op_histogram=4,5,6;",
+        "execution_unit=N002_b;other=1;",
+    ]
+    tables = OutputParser().parse(lines)
+    assert [t.rows for t in tables] == [[0, 2], [3]]
+    table = tables[0]
+    assert table.columns["count"].tolist() == [10, 12]
+    assert table.columns["avg"].tolist() == [1.5, 2.0]
+    assert table.columns["cpus"].tolist() == ["0", "1"]
+    assert table.histograms["op_histogram"].tolist() == [[1, 2, 3], [4, 5, 6]]
+    records = OutputParser(schema={"count": float}).parse_records(lines)
+    assert [r["execution_unit"] for r in records] == ["N000_a", "N001_a", "N002_b"]
+    assert records[0]["count"] == 10.0 and isinstance(records[0]["count"], float)
+    assert records[1]["op_histogram"] == "4,5,6"
+
+
+def test_parse_structured():
+    lines = [
+        "execution_unit=N000_a;count=10;",
+        {"execution_unit": "N001_b", "cpus": 3, "count": 12, "avg": 2.5, "op_histogram": "1,2"},
+        {"execution_unit": "N002_b", "cpus": 4, "count": 14, "avg": 3, "op_histogram": "3,4"},
+    ]
+    records = OutputParser().parse_records(lines)
+    assert records[0] == {"execution_unit": "N000_a", "count": 10}
+    assert records[1] == {
+        "execution_unit": "N001_b",
+        "cpus": "3",
+        "count": 12,
+        "avg": 2.5,
+        "op_histogram": "1,2",
+    }
+    assert isinstance(records[2]["avg"], float) and isinstance(records[2]["count"], int)
+
+
+def test_tag_result_line():
+    tags = {"shard_group": 1, "shard_id": 0, "ci": None}
+    line = tag_result_line("execution_unit=N000_a;count=10;", tags)
+    assert line == "shard_group=1;shard_id=0;ci=;execution_unit=N000_a;count=10;"
+    record = read_result_line(tag_result_line('{"execution_unit": "N000_a", "count": 10}', tags))
+    assert record == {
+        "shard_group": 1,
+        "shard_id": 0,
+        "ci": None,
+        "execution_unit": "N000_a",
+        "count": 10,
+    }
+
+
+def test_parse_1k_units():
+    lines = make_output(1000)
+    records = OutputParser().parse_records(lines)
+    assert len(records) == 1000
+    for line, record in zip(lines[::97], records[::97]):
+        assert {k: str(v) for k, v in record.items()} == {
+            k: (
+                v
+                if k in ["execution_unit", "app", "cpus", "algo_name"] or "histogram" in k
+                # numbers are written back without their trailing zeros
+                else str(type(record[k])(v))
+            )
+            for k, v in parse_output_line(line).items()
+        } | {f"op0_insert_{p}": str(record[f"op0_insert_{p}"]) for p in PERCENTILES}
+    table = OutputParser().parse(lines)[0]
+    assert table.histograms["op0_insert_histogram"].shape == (1000, 60)
+
+
+def test_flatten_records():
+    records = [
+        {"type": "interval", "time_ms": 100, "count": 3, "histogram": [1, 2]},
+        {"type": "params", "num_threads": 2, "duration": 1, "op_dist": [512, 512]},
+        {"type": "buckets", "op_time_ranges": [99, 209]},
+        {"type": "calibration", "ticks_to_ms": 2000},
+        {"type": "thread_op", "thread": 0, "op": 0, "name": "op0_insert", "count": 1},
+        {
+            "type": "op",
+            "op": 0,
+            "name": "op0_insert",
+            "max": 9,
+            "min": 1,
+            "sum": 12,
+            "count": 4,
+            "succ_count": 3,
+            "skipped_count": 0,
+            "histogram": [4, 0],
+        },
+        {"type": "summary", "algo_name": "skip", "sys_time": 5, "univ_count": 4, "univ_max": 9},
+    ]
+    results, intervals = flatten_records(records)
+    assert list(results) == [
+        "num_threads",
+        "duration",
+        "op0_dist",
+        "op1_dist",
+        "algo_name",
+        "op0_insert_max",
+        "op0_insert_min",
+        "op0_insert_sum",
+        "op0_insert_count",
+        "op0_insert_succ_count",
+        "op0_insert_skipped_count",
+        "op0_insert_avg",
+        "op0_insert_succ_percent",
+        "op0_insert_histogram",
+        "univ_count",
+        "univ_max",
+        "ticks_to_ms",
+        "sys_time",
+    ]
+    assert results["op0_insert_avg"] == 3.0
+    assert results["op0_insert_succ_percent"] == 75.0
+    assert results["op0_insert_histogram"] == "4,0"
+    assert intervals == [{"time_ms": 100, "count": 3, "histogram": "1,2"}]
+    # extra info of the target is split into fields
+    records[-1]["extra_info"] = "levels=4;"
+    results, _ = flatten_records(records)
+    assert results["levels"] == "4"
+    assert list(results).index("levels") == list(results).index("algo_name") + 1
+
+
+def bench_parser(n_units: int = 1000, repeat: int = 5):
+    lines = make_output(n_units)
+
+    def line_by_line():
+        # parse every line, then infer the type of every value
+        records = []
+        for line in lines:
+            record = {}
+            for k, v in parse_output_line(line).items():
+                for t in (int, float):
+                    try:
+                        v = t(v)
+                        break
+                    except ValueError:
+                        pass
+                record[k] = v
+            records.append(record)
+        return records
+
+    for name, fun in [
+        ("line by line", line_by_line),
+        ("OutputParser", lambda: OutputParser().parse_records(lines)),
+    ]:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fun()
+        print(f"{name}: {(time.perf_counter() - start) / repeat * 1000:.1f} ms for {n_units} units")
+
+
+if __name__ == "__main__":
+    bench_parser()
@@ -0,0 +1,73 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import os
+from bm_placement import CpuTopology, PlacementPlanner
+from config.container import CpuOrder, PlacementStrategy
+
+
+def write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+def fake_sysfs(root) -> str:
+    """
+    2 NUMA nodes with 2 physical cores each and 2 SMT threads per core.
+    cpus 0-3 are the first threads, cpus 4-7 their siblings, and every node
+    has its own last level cache.
+    """
+    write(f"{root}/cpu/online", "0-7\n")
+    write(f"{root}/node/node0/cpulist", "0-1,4-5\n")
+    write(f"{root}/node/node1/cpulist", "2-3,6-7\n")
+    for cpu in range(8):
+        core = cpu % 4
+        node = core // 2
+        write(f"{root}/cpu/cpu{cpu}/topology/physical_package_id", f"{node}\n")
+        write(f"{root}/cpu/cpu{cpu}/topology/thread_siblings_list", f"{core},{core + 4}\n")
+        write(f"{root}/cpu/cpu{cpu}/cache/index0/level", "1\n")
+        write(f"{root}/cpu/cpu{cpu}/cache/index0/shared_cpu_list", f"{core},{core + 4}\n")
+        llc = "0-1,4-5" if node == 0 else "2-3,6-7"
+        write(f"{root}/cpu/cpu{cpu}/cache/index3/level", "3\n")
+        write(f"{root}/cpu/cpu{cpu}/cache/index3/shared_cpu_list", f"{llc}\n")
+    return str(root)
+
+
+def plan(tmp_path, strategy, count, core_count, order=CpuOrder.ASC) -> list[str]:
+    planner = PlacementPlanner(CpuTopology(fake_sysfs(tmp_path)), order=order)
+    return [p.get_cpu_set() for p in planner.plan(strategy, count, core_count)]
+
+
+def test_placement_linear(tmp_path):
+    assert plan(tmp_path, PlacementStrategy.LINEAR, 3, 2) == ["0,1", "2,3", "4,5"]
+    assert plan(tmp_path, PlacementStrategy.LINEAR, 2, 2, CpuOrder.DESC) == ["7,6", "5,4"]
+
+
+def test_placement_compact(tmp_path):
+    assert plan(tmp_path, PlacementStrategy.COMPACT, 2, 2) == ["0,4", "1,5"]
+
+
+def test_placement_spread(tmp_path):
+    assert plan(tmp_path, PlacementStrategy.SPREAD, 2, 2) == ["0,4", "2,6"]
+
+
+def test_placement_no_smt(tmp_path):
+    assert plan(tmp_path, PlacementStrategy.NO_SMT, 2, 2) == ["0,1", "2,3"]
+
+
+def test_placement_llc(tmp_path):
+    assert plan(tmp_path, PlacementStrategy.LLC, 3, 2) == ["0,4", "1,5", "2,6"]
+    assert plan(tmp_path, PlacementStrategy.LLC, 2, 3) == ["0,4,1", "2,6,3"]
+    # a unit larger than a LLC domain spans two of them
+    assert plan(tmp_path, PlacementStrategy.LLC, 1, 5) == ["0,4,1,5,2"]
+
+
+def test_partition(tmp_path):
+    topology = CpuTopology(fake_sysfs(tmp_path))
+    parts = topology.partition([4, 2])
+    # the first part fills node 0, the second one starts on node 1
+    assert [cpu.id for cpu in parts[0].cpus] == [0, 1, 4, 5]
+    assert [cpu.id for cpu in parts[1].cpus] == [2, 6]
+    planner = PlacementPlanner(parts[1])
+    assert [p.get_cpu_set() for p in planner.plan(PlacementStrategy.LINEAR, 2, 1)] == ["2", "6"]
@@ -0,0 +1,118 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import json
+import os
+import time
+import pytest
+from pathlib import Path
+from bm_barrier import StartBarrier
+from bm_process import Process, split_command
+from config.application import Application
+
+
+def test_split_command_plain():
+    cmd = "strace -o /tmp/res/test.log ../build/bench/benchmark -t=1 'a b'"
+    expected = ["strace", "-o", "/tmp/res/test.log", "../build/bench/benchmark", "-t=1", "a b"]
+    assert split_command(cmd) == expected
+
+
+def test_split_command_needs_shell():
+    for cmd in ["ls | wc -l", "ls > out", "cd /tmp && ls", "echo $HOME", "ls *.c"]:
+        assert split_command(cmd) == ["bash", "-c", cmd]
+
+
+def test_split_command_assignment():
+    for cmd in ["FOO=1 ../build/bench/benchmark -t=1", "A=1 B_2= ls"]:
+        assert split_command(cmd) == ["bash", "-c", cmd]
+    # arguments that look like assignments do not need a shell
+    assert split_command("ls -t=1 a=b") == ["ls", "-t=1", "a=b"]
+
+
+def test_timeseries_output(tmp_path):
+    eu = Process(
+        app=Application("ls"),
+        idx=0,
+        record_data_dir=str(tmp_path),
+        home_dir=Path("/home"),
+        core_set="0",
+    )
+    eu.output_file = os.path.join(tmp_path, eu.name)
+    with open(eu.output_file, "w") as f:
+        f.write("ts;time_ms=100;count=10;throughput=0.1;\n")
+        f.write("ts;time_ms=200;count=20;throughput=0.2;\n")
+        f.write("num_threads=1;count=30;\n")
+    output = eu.get_output()
+    assert "ts;" not in output
+    assert output.endswith("num_threads=1;count=30;\n")
+    assert eu.timeseries == [
+        {"time_ms": "100", "count": "10", "throughput": "0.1"},
+        {"time_ms": "200", "count": "20", "throughput": "0.2"},
+    ]
+
+
+def test_structured_output(tmp_path):
+    records = [
+        {"type": "params", "num_threads": 1, "op_dist": [1024]},
+        {"type": "summary", "algo_name": "x", "throughput": 1.5},
+    ]
+    for app, structured in [
+        (Application("ls", path=Path("/bin")), False),
+        (Application("bm"), True),
+    ]:
+        eu = Process(
+            app=app, idx=0, record_data_dir=str(tmp_path), home_dir=Path("/home"), core_set="0"
+        )
+        eu.output_file = os.path.join(tmp_path, eu.name)
+        with open(eu.output_file, "w") as f:
+            f.writelines(json.dumps(r) + "\n" for r in records)
+        output = eu.get_output(structured=True)
+        if structured:
+            assert output == {
+                "execution_unit": eu.name,
+                "app": "bm",
+                "launch_latency_s": "0.000000",
+                "num_threads": 1,
+                "op0_dist": 1024,
+                "algo_name": "x",
+                "throughput": 1.5,
+            }
+        else:
+            # external applications are never parsed as records
+            assert isinstance(output, str) and output.endswith(json.dumps(records[-1]) + "\n")
+
+
+def launch(tmp_path, command: str) -> Process:
+    eu = Process(
+        app=Application("ls"), idx=0, record_data_dir=str(tmp_path), home_dir=tmp_path, core_set="0"
+    )
+    eu.output_file = os.path.join(tmp_path, eu.name)
+    eu.release_file = f"{eu.output_file}.release"
+    eu.barrier = StartBarrier(f"{tmp_path}/start.fifo")
+    eu.barrier.create()
+    assert eu.exec(command)
+    assert eu.barrier.wait_ready(1, timeout=10) == 1
+    eu.barrier.release(1, time.time())
+    return eu
+
+
+def test_exec_waits_on_barrier(tmp_path):
+    eu = launch(tmp_path, "echo started")
+    try:
+        eu.wait()
+    finally:
+        eu.barrier.destroy()
+    assert eu.exit_code == 0
+    assert eu.get_release_time() is not None
+    assert open(eu.output_file).read() == "started\n"
+
+
+def test_exec_not_found_fails(tmp_path):
+    eu = launch(tmp_path, "./no-such-benchmark -t=1")
+    try:
+        with pytest.raises(SystemExit):
+            eu.wait()
+    finally:
+        eu.barrier.destroy()
+    assert eu.exit_code == 127
+    assert "no-such-benchmark" in eu.get_errors()
@@ -0,0 +1,96 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import os
+from bm_scheduler import CampaignScheduler, CostModel, count_switches, ENV_VARIABLES
+from config.benchmark import ExecutionType, SchedulePolicy
+
+VARIABLES = {
+    "nb_threads": [[1], [2]],
+    "noise": [0],
+    "initial_size": [0],
+    "container_cnt": [1, 4],
+    "execution_type": [ExecutionType.NATIVE, ExecutionType.CONTAINER],
+}
+
+
+def make_scheduler(policy, cost_model=None):
+    return CampaignScheduler(
+        variables=VARIABLES,
+        policy=policy,
+        cost_model=cost_model or CostModel(),
+        duration=10,
+    )
+
+
+def test_schedule_orders():
+    nested = make_scheduler(SchedulePolicy.NESTED).get_points()
+    grouped = make_scheduler(SchedulePolicy.MIN_SWITCHES).get_points()
+    interleaved = make_scheduler(SchedulePolicy.INTERLEAVED).get_points()
+    assert len(nested) == len(grouped) == len(interleaved) == 8
+    # same points, in a different order
+    assert sorted(map(str, nested)) == sorted(map(str, grouped)) == sorted(map(str, interleaved))
+    assert count_switches(grouped, ENV_VARIABLES) == 3
+    assert count_switches(grouped, ENV_VARIABLES) < count_switches(nested, ENV_VARIABLES)
+    assert [p["execution_type"] for p in grouped[:4]] == [ExecutionType.NATIVE] * 4
+    assert [p["container_cnt"] for p in grouped[:4]] == [1, 1, 4, 4]
+    # the execution types of a point follow each other
+    for a, b in zip(interleaved[::2], interleaved[1::2]):
+        assert a["execution_type"] == ExecutionType.NATIVE
+        assert b["execution_type"] == ExecutionType.CONTAINER
+        assert {k: v for k, v in a.items() if k != "execution_type"} == {
+            k: v for k, v in b.items() if k != "execution_type"
+        }
+
+
+def test_cost_model(tmp_path):
+    path = os.path.join(tmp_path, "cost_model.json")
+    model = CostModel(path)
+    point = {"container_cnt": 1, "execution_type": ExecutionType.CONTAINER}
+    # nothing observed yet, duration plus the default overhead
+    assert model.predict(point, 10) == 15.5
+    model.observe(point, 10, 12.0)
+    model.observe({"container_cnt": 4, "execution_type": ExecutionType.CONTAINER}, 10, 18.0)
+    model.save()
+
+    model = CostModel(path)
+    assert model.predict(point, 10) == 12.0
+    # overhead fitted on the number of units: 2s + 2s per unit
+    assert abs(model.predict({**point, "container_cnt": 8}, 10) - 26.0) < 1e-9
+    model.observe(point, 10, 14.0)
+    assert model.predict(point, 10) == 13.0
+
+
+def test_cost_model_per_config(tmp_path):
+    path = os.path.join(tmp_path, "cost_model.json")
+    point = {"container_cnt": 1, "execution_type": ExecutionType.CONTAINER}
+    model = CostModel(path, config="a")
+    model.observe(point, 10, 40.0)
+    model.save()
+    assert CostModel(path, config="a").predict(point, 10) == 40.0
+    # the same point of another benchmark is not estimated from it
+    assert CostModel(path, config="b").predict(point, 10) == 15.5
+
+
+def test_eta():
+    scheduler = make_scheduler(SchedulePolicy.MIN_SWITCHES)
+    predicted = scheduler.get_eta()
+    assert predicted > 0
+    points = scheduler.get_points()
+    # the runs take twice as long as predicted
+    for point in points[:4]:
+        scheduler.on_run_done(
+            {**point, "benchmark_duration_seconds": 10},
+            2 * scheduler.cost_model.predict(point, 10),
+        )
+    remaining = sum(scheduler.cost_model.predict(p, 10) for p in points[4:])
+    assert scheduler.get_eta() > remaining
+
+
+def test_shards():
+    scheduler = make_scheduler(SchedulePolicy.MIN_SWITCHES)
+    shards = scheduler.get_shards(3, capacity=8, cpus_of=lambda p: p["container_cnt"] * 2)
+    # consecutive points of 1 unit are packed together, points of 4 units fill all cpus
+    assert [len(shard) for shard in shards] == [2, 1, 1, 2, 1, 1]
+    assert [p for shard in shards for p in shard] == scheduler.get_points()
+    assert all(sum(p["container_cnt"] * 2 for p in shard) <= 8 for shard in shards)
@@ -0,0 +1,52 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import os
+import numpy as np
+from pandas import DataFrame
+from bm_store import ResultStore, get_store_path, load_results, load_store
+
+
+def write_csv(path: str):
+    with open(path, "w") as f:
+        f.write("# a comment\n")
+        f.write("hostname;nb_threads;throughput;extra;op0_histogram\n")
+        f.write("host;1;10.5;a;1,2,3\n")
+        f.write("host;2;;;4,5,6\n")
+
+
+def test_store_round_trip(tmp_path):
+    df = DataFrame(
+        {
+            "app": ["a", None],
+            "nb_threads": [1, 2],
+            "throughput": [1.5, np.nan],
+            "op_histogram": ["1,2", "3,4"],
+        }
+    )
+    path = os.path.join(tmp_path, "results.npz")
+    ResultStore.from_frame(df).save(path)
+    store = ResultStore.load(path)
+    assert len(store) == 2
+    assert store.histograms["op_histogram"].tolist() == [[1, 2], [3, 4]]
+    assert store.columns["nb_threads"].dtype == np.int64
+    loaded = store.to_frame()
+    assert list(loaded.columns) == list(df.columns)
+    assert loaded["app"].tolist() == ["a", None]
+    assert loaded["nb_threads"].tolist() == [1, 2]
+    assert np.isnan(loaded["throughput"][1])
+    assert loaded["op_histogram"].tolist() == ["1,2", "3,4"]
+    assert store.to_frame(histograms_as_text=False)["op_histogram"][1].tolist() == [3, 4]
+
+
+def test_load_results(tmp_path):
+    output_dir = os.path.join(tmp_path, "campaign")
+    write_csv(f"{output_dir}.csv")
+    df = load_results(output_dir)
+    assert os.path.exists(get_store_path(output_dir))
+    assert df["nb_threads"].tolist() == [1, 2]
+    assert df["extra"].tolist() == ["a", None]
+    assert df["op0_histogram"].tolist() == ["1,2,3", "4,5,6"]
+    # the store is used as long as it is not older than the csv
+    os.remove(f"{output_dir}.csv")
+    assert load_store(output_dir).columns["hostname"].tolist() == ["host", "host"]
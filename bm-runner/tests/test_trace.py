@@ -0,0 +1,27 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import json
+from utils.trace import Tracer
+
+
+def test_trace_tracks(tmp_path):
+    tracer = Tracer()
+    with tracer.span("launch all"):
+        with tracer.span("launch", track="C000_app"):
+            pass
+    tracer.add_span("benchmark", 10.0, 12.5, track="C000_app", exit_code=0)
+    path = f"{tmp_path}/trace.json"
+    tracer.save(path)
+
+    with open(path) as f:
+        events = json.load(f)["traceEvents"]
+    names = {e["args"]["name"]: e["tid"] for e in events if e["name"] == "thread_name"}
+    spans = {e["name"]: e for e in events if e["ph"] == "X"}
+    assert set(names) == {"runner", "C000_app"}
+    assert spans["launch all"]["tid"] == names["runner"]
+    assert spans["launch"]["tid"] == names["C000_app"]
+    assert spans["benchmark"]["ts"] == 10.0 * 1e6
+    assert spans["benchmark"]["dur"] == 2.5 * 1e6
+    # saving starts a new trace
+    assert tracer.events == [] and tracer.tracks == {}
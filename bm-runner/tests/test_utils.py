@@ -3,7 +3,14 @@
 
 import os
 from pathlib import Path
-from bm_utils import resolve_path, ensure_exists
+from bm_utils import (
+    resolve_path,
+    ensure_exists,
+    parse_cpu_set,
+    get_used_ports,
+    find_free_port_range,
+    append_csv,
+)
 
 
 def csb_dir() -> Path:
@@ -84,3 +91,41 @@ def test_ensure_exists_env_var():
     expected = os.path.join(real_dir, input_name)
     actual = ensure_exists(name=input_name, dir=input_path, env_var_dir=input_env_var)
     assert actual == expected
+
+
+#################################
+# parse_cpu_set tests
+#################################
+def test_parse_cpu_set():
+    assert parse_cpu_set("3") == {3}
+    assert parse_cpu_set("0,2,4-6") == {0, 2, 4, 5, 6}
+
+
+#################################
+# port range tests
+#################################
+def test_get_used_ports(tmp_path):
+    table = tmp_path / "tcp"
+    table.write_text(
+        "  sl  local_address rem_address   st tx_queue rx_queue\n"
+        "   0: 00000000:1F90 00000000:0000 0A 00000000:00000000\n"  # 8080 listen
+        "   1: 0100007F:1F91 0100007F:A000 01 00000000:00000000\n"  # 8081 established
+        "   2: 0100007F:1F92 0100007F:A001 06 00000000:00000000\n"  # 8082 time wait
+    )
+    assert get_used_ports([str(table), str(tmp_path / "missing")]) == {8080, 8081}
+
+
+def test_find_free_port_range():
+    used = {8081, 8083}
+    assert find_free_port_range(8090, 4, auto_shift=False, used_ports=used) == 8090
+    assert find_free_port_range(8080, 4, auto_shift=False, used_ports=used) is None
+    assert find_free_port_range(8080, 4, auto_shift=True, used_ports=used) == 8084
+
+
+def test_append_csv(tmp_path):
+    path = os.path.join(tmp_path, "timeseries.csv")
+    append_csv(path, [{"time_ms": 100, "count": 5}])
+    append_csv(path, [{"time_ms": 200, "count": 7}, {"time_ms": 300, "count": 6}])
+    append_csv(path, [])
+    with open(path) as f:
+        assert f.read().splitlines() == ["time_ms;count", "100;5", "200;7", "300;6"]
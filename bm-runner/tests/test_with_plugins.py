@@ -126,3 +126,22 @@ def test_results_dir_with_script_container():
     expected_out = "scripts/plugins/collect_strace.sh ls subdir/ myfile"
 
     assert expected_out == out
+
+
+def test_warmup_placeholders():
+    app = Application("ls", args="--time={total_duration} --skip={warmup}")
+    out = app.get_cmd(
+        plugins_cmds="",
+        threads=1,
+        duration=10,
+        noise=0,
+        initial_size=0,
+        index=0,
+        n_units=1,
+        work_dir=work_dir,
+        homedir=str(work_dir),
+        res_dir="results",
+        warmup=3,
+        cooldown=2,
+    )
+    assert out == "ls --time=15 --skip=3"
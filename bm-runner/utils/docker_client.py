@@ -0,0 +1,61 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import threading
+from typing import Optional
+import docker
+from docker.constants import DEFAULT_MAX_POOL_SIZE
+
+g_lock = threading.Lock()
+g_client: Optional[docker.DockerClient] = None
+g_pool_size = DEFAULT_MAX_POOL_SIZE
+
+
+def set_docker_pool_size(pool_size: int):
+    """
+    Makes sure the connection pool of the shared client can serve `pool_size`
+    concurrent requests. The client is created again on the next call to
+    `get_docker_client` if its pool is too small.
+    """
+    global g_client, g_pool_size
+    with g_lock:
+        if pool_size <= g_pool_size:
+            return
+        g_pool_size = pool_size
+        if g_client is not None:
+            g_client.close()
+            g_client = None
+
+
+def get_docker_client() -> docker.DockerClient:
+    """
+    Returns the Docker client shared by the whole runner. It is created on the
+    first use, so that nothing connects to the daemon unless it is needed.
+    """
+    global g_client
+    with g_lock:
+        if g_client is None:
+            g_client = docker.from_env(max_pool_size=g_pool_size)
+        return g_client
+
+
+def get_container_states(names: list[str]) -> dict[str, str]:
+    """
+    Looks up the given containers with a single request to the daemon.
+    Returns the state (e.g. running, exited) of every container that exists.
+    """
+    if not names:
+        return {}
+    # sparse listing does not inspect each container, the name filter is a
+    # regex so the exact names are checked below
+    containers = get_docker_client().containers.list(
+        all=True, sparse=True, filters={"name": [f"^/?{name}$" for name in names]}
+    )
+    wanted = set(names)
+    states = {}
+    for container in containers:
+        for name in container.attrs.get("Names", []):
+            name = name.lstrip("/")
+            if name in wanted:
+                states[name] = container.attrs.get("State", "")
+    return states
@@ -0,0 +1,112 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import math
+import statistics
+from typing import Optional
+import numpy as np
+
+# two-sided critical values of the Student's t-distribution, per confidence
+# level and degrees of freedom, the last entry is the normal distribution
+# fmt: off
+T_DOFS = list(range(1, 31)) + [40, 60, 120, math.inf]
+T_TABLE: dict[float, list[float]] = {
+    0.90: [
+        6.314, 2.920, 2.353, 2.132, 2.015, 1.943, 1.895, 1.860, 1.833, 1.812,
+        1.796, 1.782, 1.771, 1.761, 1.753, 1.746, 1.740, 1.734, 1.729, 1.725,
+        1.721, 1.717, 1.714, 1.711, 1.708, 1.706, 1.703, 1.701, 1.699, 1.697,
+        1.684, 1.671, 1.658, 1.645,
+    ],
+    0.95: [
+        12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+        2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+        2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+        2.021, 2.000, 1.980, 1.960,
+    ],
+    0.99: [
+        63.657, 9.925, 5.841, 4.604, 4.032, 3.707, 3.499, 3.355, 3.250, 3.169,
+        3.106, 3.055, 3.012, 2.977, 2.947, 2.921, 2.898, 2.878, 2.861, 2.845,
+        2.831, 2.819, 2.807, 2.797, 2.787, 2.779, 2.771, 2.763, 2.756, 2.750,
+        2.704, 2.660, 2.617, 2.576,
+    ],
+}
+# fmt: on
+SUPPORTED_CONFIDENCES = sorted(T_TABLE)
+# ratio of the MAD to the standard deviation of a normal distribution
+MAD_SCALE = 0.6745
+
+
+def t_critical(confidence: float, dof: int) -> float:
+    """
+    Returns the critical value for a two-sided confidence interval. Degrees
+    of freedom in between two entries use the lower one, which is conservative.
+    """
+    assert confidence in T_TABLE, f"confidence must be one of {SUPPORTED_CONFIDENCES}"
+    assert dof >= 1
+    values = T_TABLE[confidence]
+    idx = max(i for i, d in enumerate(T_DOFS) if d <= dof)
+    return values[idx]
+
+
+def mean_ci(values: list[float], confidence: float) -> tuple[float, Optional[float]]:
+    """
+    Returns the mean of the samples and the half width of its confidence
+    interval, which is None with less than 2 samples.
+    """
+    mean = statistics.fmean(values)
+    if len(values) < 2:
+        return mean, None
+    sem = statistics.stdev(values) / math.sqrt(len(values))
+    return mean, t_critical(confidence, len(values) - 1) * sem
+
+
+def relative_ci(values: list[float], confidence: float) -> Optional[float]:
+    """
+    Returns the half width of the confidence interval of the mean relative
+    to the mean, e.g. 0.05 for a mean of 100 +/- 5.
+    """
+    mean, half_width = mean_ci(values, confidence)
+    if half_width is None:
+        return None
+    if mean == 0:
+        return 0.0 if half_width == 0 else math.inf
+    return half_width / abs(mean)
+
+
+def bootstrap_ci(
+    samples: np.ndarray, confidence: float, resamples: int = 1000, seed: int = 0
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the bounds of the percentile bootstrap confidence interval of the
+    mean, for groups of the same number of samples at once.
+
+    Args:
+        samples: of shape (groups, samples, metrics).
+        confidence: e.g. 0.95.
+        resamples: number of bootstrap resamples.
+        seed: of the resampling, so that the intervals are reproducible.
+
+    Returns:
+        the lower and upper bounds, of shape (groups, metrics).
+    """
+    groups, n, metrics = samples.shape
+    rng = np.random.default_rng(seed)
+    # how often every sample is drawn in every resample
+    weights = rng.multinomial(n, np.full(n, 1.0 / n), size=resamples) / n
+    # (resamples, n) @ (groups, n, metrics) -> (groups, resamples, metrics)
+    means = np.matmul(weights, samples)
+    alpha = (1.0 - confidence) / 2
+    low, high = np.quantile(means, [alpha, 1.0 - alpha], axis=1)
+    return low, high
+
+
+def mad_scores(deviations: np.ndarray, mads: np.ndarray) -> np.ndarray:
+    """
+    Returns the modified z-scores of samples, given their absolute deviation
+    from the median and the median of those deviations. Scores above 3.5 are
+    usually considered outliers.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = MAD_SCALE * deviations / mads
+    # no deviation from a constant sample
+    return np.where(deviations == 0, 0.0, scores)
@@ -0,0 +1,94 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+from utils.logger import bm_log, LogType
+
+RUNNER_TRACK = "runner"
+
+
+class Tracer:
+    """
+    Records the lifecycle of a run as spans in the Chrome trace event format,
+    which can be opened with chrome://tracing or https://ui.perfetto.dev.
+    Every span belongs to a track (e.g. the runner or an execution unit),
+    tracks are shown as threads of a single process. Timestamps are taken
+    from the wall clock so that spans measured elsewhere (e.g. by a container)
+    can be added afterwards.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.events: list[dict] = []
+        self.tracks: dict[str, int] = {}
+
+    def __get_tid(self, track: str) -> int:
+        # must be called with the lock held
+        tid = self.tracks.get(track)
+        if tid is None:
+            tid = len(self.tracks) + 1
+            self.tracks[track] = tid
+            self.events.append(
+                {"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": track}}
+            )
+            self.events.append(
+                {
+                    "name": "thread_sort_index",
+                    "ph": "M",
+                    "pid": 1,
+                    "tid": tid,
+                    "args": {"sort_index": tid},
+                }
+            )
+        return tid
+
+    def add_span(self, name: str, start: float, end: float, track: str = RUNNER_TRACK, **args):
+        """
+        Adds a span from `start` to `end`, both in seconds since epoch.
+        """
+        with self.lock:
+            event = {
+                "name": name,
+                "ph": "X",
+                "ts": start * 1e6,
+                "dur": max(end - start, 0) * 1e6,
+                "pid": 1,
+                "tid": self.__get_tid(track),
+            }
+            if args:
+                event["args"] = args
+            self.events.append(event)
+
+    @contextmanager
+    def span(self, name: str, track: str = RUNNER_TRACK, **args):
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.add_span(name, start, time.time(), track, **args)
+
+    def save(self, path: Optional[str]):
+        """
+        Writes the recorded spans to `path` and starts a new trace.
+        """
+        with self.lock:
+            events = self.events
+            self.events = []
+            self.tracks = {}
+        if path is None or not events:
+            return
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+            bm_log(f"Trace saved in {path}")
+        except OSError as e:
+            bm_log(f"Could not save trace in {path}: {e}", LogType.WARNING)
+
+
+g_tracer = Tracer()
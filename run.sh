@@ -22,6 +22,9 @@ fi
 if [ $# -eq 0 ]; then
     info "Running benchmarks"
     CONTINUE_BM=""
+elif [ "$1" = "--resume" ]; then
+    info "Resuming benchmarks, runs with stored results are skipped"
+    CONTINUE_BM="--resume"
 else
     info "Reproduce the graphs, without rerun"
     CONTINUE_BM="--replot $*"
@@ -49,5 +52,6 @@ info "running $TITLE on $CONFIG"
 # How to call:
 # $ ./run.sh path-to-directory   # to regenerate the plots.
 # $ ./run.sh                     # to run the benchmark.
+# $ ./run.sh --resume            # to run the benchmark, skipping stored runs.
 echo scripts/fg-diff/run-single.sh "$CONFIG" $CONTINUE_BM
 scripts/fg-diff/run-single.sh "$CONFIG" $CONTINUE_BM
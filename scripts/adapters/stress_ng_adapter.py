@@ -0,0 +1,24 @@
+# Copyright (C) Huawei Technologies Co., Ltd. 2026. All rights reserved.
+# SPDX-License-Identifier: MIT
+
+# Same as stress-ng-adapter.sh, run within the runner.
+# Keeps the metrics of the third `stress-ng: metrc:` line, i.e. the first stressor.
+
+KEYS = [
+    "stressor",
+    "ops",
+    "real_time",
+    "usr_time",
+    "sys_time",
+    "throughput_real",
+    "throughput_cpus",
+    "cpu_percent",
+    "rss_max",
+]
+
+
+def adapt(output: str) -> dict[str, str]:
+    metrics = [line.split() for line in output.splitlines() if "stress-ng: metrc:" in line]
+    if len(metrics) < 3:
+        return {}
+    return dict(zip(KEYS, metrics[2][3:]))